@@ -0,0 +1,227 @@
+"""
+Benchmarks of the MEB solvers, of the complex builders and of the in_sphere predicates
+
+Every configuration is timed (best of several runs), then run once more under tracemalloc to get its peak memory,
+while the circumsphere solves are counted : the calls to sphere_from_points and the solves of SupportSet.sphere, which
+the LP-type and move-to-front solvers use instead. The results are written as JSON, together with the exponent
+of the running time in n fitted for every solver, so that two versions can be compared with --compare
+
+Usage, from the project root :
+    python benchmarks/benchmark.py --output results.json
+    python benchmarks/benchmark.py --quick --output new.json --compare results.json
+"""
+
+#%% Importing modules
+
+import argparse
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# The project is a package named after its folder, imported from the parent folder like the tests do
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT.parent))
+project = importlib.import_module(ROOT.name + ".src.project")
+instrumentation = importlib.import_module(ROOT.name + ".src.instrumentation")
+predicates = importlib.import_module(ROOT.name + ".src.predicates")
+helper = importlib.import_module(ROOT.name + ".tests.helper")
+
+#%% Configurations
+
+MEB_SOLVERS = {
+    "naive_meb": project.naive_meb,
+    "welzl_meb": project.welzl_meb,
+    "lp_type_meb": project.lp_type_meb,
+    "move_to_front_meb": project.move_to_front_meb,
+}
+
+COMPLEX_BUILDERS = {
+    "cech_complex": project.cech_complex,
+    "alpha_complex": project.alpha_complex,
+}
+
+# Every call to the predicates on a new support computes its error bounds, so both cases are timed
+PREDICATES = {
+    "in_sphere_point": lambda supports, points: [predicates.in_sphere_point(support, point) for support in supports for point in points],
+    "in_sphere": lambda supports, points: [predicates.in_sphere(support, points) for support in supports],
+}
+
+DISTRIBUTIONS = {
+    "ball": lambda dim: helper.random_point_in_ball(np.zeros(dim), 1, dim),
+    "sphere": lambda dim: helper.random_point_on_sphere(np.zeros(dim), 1, dim),
+    "cube": lambda dim: helper.random_point_in_cube(np.zeros(dim), 1, dim),
+}
+
+# naive_meb tries every subset of d+2 points and welzl_meb recurses once per point (within the default recursion limit),
+# so they only get the smallest inputs
+MAX_POINTS = {"naive_meb": 12, "welzl_meb": 500}
+
+SWEEPS = {
+    "full": {
+        "meb_n": [10, 100, 1000, 10000],
+        "meb_dim": [2, 3, 5],
+        "complex_n": [20, 50, 100],
+        "complex_dim": [2, 3],
+        "max_simplex_dim": [2, 3, 4],
+        "filtration_limit": [0.2, 0.5],
+        "predicate_n": [10, 100],
+        "predicate_dim": [2, 3, 5],
+        "repeat": 3,
+    },
+    "quick": {
+        "meb_n": [10, 100, 1000],
+        "meb_dim": [2, 3],
+        "complex_n": [20, 40],
+        "complex_dim": [2],
+        "max_simplex_dim": [2, 3],
+        "filtration_limit": [0.5],
+        "predicate_n": [10],
+        "predicate_dim": [2, 3],
+        "repeat": 1,
+    },
+}
+
+#%% Measurements
+
+def measure(function, repeat):
+    """
+    Runs function repeat times, then once more under tracemalloc
+
+    Output : dictionary with the best wall time in seconds, the peak memory in bytes, the number of circumsphere
+             solves of one run (sphere_from_points calls and SupportSet.sphere solves) and the result of the last run
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+
+    with instrumentation.Instrumentation() as counters:
+        tracemalloc.start()
+        try:
+            result = function()
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    solves = counters.counters["sphere_from_points"]["calls"] + counters.counters["SupportSet.sphere"]["solves"]
+    return {"time": min(times), "peak_memory": peak_memory, "sphere_solves": solves, "result": result}
+
+def random_points(distribution, n, dim, seed):
+    np.random.seed(seed)
+    return [DISTRIBUTIONS[distribution](dim) for _ in range(n)]
+
+def benchmark_meb(sweep, seed):
+    for name, solver in MEB_SOLVERS.items():
+        for distribution in DISTRIBUTIONS:
+            for dim in sweep["meb_dim"]:
+                for n in sweep["meb_n"]:
+                    if n > MAX_POINTS.get(name, np.inf):
+                        continue
+                    points = random_points(distribution, n, dim, seed)
+                    measures = measure(lambda: solver(points, dim), sweep["repeat"])
+                    del measures["result"]
+                    yield {"benchmark": "meb", "function": name, "distribution": distribution, "n": n, "dim": dim, **measures}
+
+def benchmark_complexes(sweep, seed):
+    for name, builder in COMPLEX_BUILDERS.items():
+        for distribution in DISTRIBUTIONS:
+            for dim in sweep["complex_dim"]:
+                for n in sweep["complex_n"]:
+                    points = random_points(distribution, n, dim, seed)
+                    for max_simplex_dim in sweep["max_simplex_dim"]:
+                        for filtration_limit in sweep["filtration_limit"]:
+                            measures = measure(lambda: builder(points, dim, max_simplex_dim, filtration_limit), sweep["repeat"])
+                            measures["size"] = len(measures.pop("result"))
+                            yield {"benchmark": "complex", "function": name, "distribution": distribution, "n": n, "dim": dim,
+                                   "max_simplex_dim": max_simplex_dim, "filtration_limit": filtration_limit, **measures}
+
+def benchmark_predicates(sweep, seed, number_of_supports=200):
+    for name, predicate in PREDICATES.items():
+        for dim in sweep["predicate_dim"]:
+            for support_size in range(2, dim + 2):
+                for n in sweep["predicate_n"]:
+                    supports = [np.array(random_points("ball", support_size, dim, seed + i)) for i in range(number_of_supports)]
+                    points = np.array(random_points("cube", n, dim, seed))
+                    measures = measure(lambda: predicate(supports, points), sweep["repeat"])
+                    del measures["result"]
+                    yield {"benchmark": "predicate", "function": name, "distribution": "cube", "n": n, "dim": dim,
+                           "support_size": support_size, **measures}
+
+#%% Reports
+
+def configuration_key(result):
+    return tuple((key, result[key]) for key in ["benchmark", "function", "distribution", "n", "dim", "max_simplex_dim", "filtration_limit", "support_size"]
+                 if key in result)
+
+def scaling_exponents(results):
+    """
+    Fits time = c * n^exponent by least squares in log scale for every configuration but n
+
+    Output : list of dictionaries with the configuration and the fitted exponent, for the configurations with at least two values of n
+    """
+    groups = {}
+    for result in results:
+        key = tuple(couple for couple in configuration_key(result) if couple[0] != "n")
+        groups.setdefault(key, []).append((result["n"], result["time"]))
+    res = []
+    for key, measures in groups.items():
+        if len(measures) < 2:
+            continue
+        n, times = np.array(measures, dtype=float).T
+        exponent, _ = np.polyfit(np.log(n), np.log(np.maximum(times, 1e-9)), 1)
+        res.append({**dict(key), "exponent": float(exponent)})
+    return res
+
+def compare(results, reference_results):
+    """
+    Prints the ratio of the times of results to those of reference_results for the configurations present in both
+    """
+    reference = {configuration_key(result): result for result in reference_results}
+    for result in results:
+        key = configuration_key(result)
+        if key in reference:
+            ratio = result["time"] / max(reference[key]["time"], 1e-9)
+            print(f"{ratio:6.2f}x  " + ", ".join(f"{name}={value}" for name, value in key))
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks of the MEB solvers, of the complex builders and of the in_sphere predicates")
+    parser.add_argument("--output", default="benchmark_results.json", help="file the JSON results are written to")
+    parser.add_argument("--quick", action="store_true", help="run a smaller sweep")
+    parser.add_argument("--only", choices=["meb", "complex", "predicate"], help="only run one of the benchmarks")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random points")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare the times with")
+    arguments = parser.parse_args()
+
+    sweep = SWEEPS["quick" if arguments.quick else "full"]
+    results = []
+    if arguments.only in (None, "meb"):
+        results.extend(benchmark_meb(sweep, arguments.seed))
+    if arguments.only in (None, "complex"):
+        results.extend(benchmark_complexes(sweep, arguments.seed))
+    if arguments.only in (None, "predicate"):
+        results.extend(benchmark_predicates(sweep, arguments.seed))
+    with open(arguments.output, "w") as file:
+        json.dump({"metadata": metadata(), "results": results, "scaling": scaling_exponents(results)}, file, indent=1)
+    print(f"{len(results)} configurations written to {arguments.output}")
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file)["results"])
+
+if __name__ == "__main__":
+    main()
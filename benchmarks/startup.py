@@ -0,0 +1,107 @@
+"""
+Benchmark of the startup cost of the package : the time of `python -c "import ..."` and the latency of the first call
+to cech_complex and alpha_complex in a new interpreter, which includes the modules they import on first use
+
+Every case runs in a new interpreter, several times, and the best times are kept. The results are written as JSON,
+and --compare prints the time ratios with a previous run
+
+Usage, from the project root :
+    python benchmarks/startup.py --output startup.json
+    python benchmarks/startup.py --output new.json --compare startup.json
+"""
+
+#%% Importing modules
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# The project is a package named after its folder, imported from the parent folder like the tests do
+ROOT = Path(__file__).resolve().parents[1]
+PACKAGE = ROOT.name + ".src"
+
+#%% Cases
+
+# Each case is run with python -c and prints a JSON dictionary of the times it measured itself
+TIMED_CALL = """
+import time, json
+start = time.perf_counter()
+import {package} as src
+imported = time.perf_counter()
+import numpy as np
+np.random.seed(0)
+points = np.random.uniform(-1, 1, (30, 2))
+called = time.perf_counter()
+src.{builder}(points, 2, 3, 0.3)
+first = time.perf_counter()
+src.{builder}(points, 2, 3, 0.3)
+second = time.perf_counter()
+print(json.dumps({{"import": imported - start, "first_call": first - called, "second_call": second - first}}))
+"""
+
+CASES = {
+    "python": "print('{{}}')",
+    "import_package": "import {package}; print('{{}}')",
+    "import_project": "import {package}.project; print('{{}}')",
+    "import_numpy": "import numpy; print('{{}}')",
+    "cech_complex": TIMED_CALL.replace("{builder}", "cech_complex"),
+    "alpha_complex": TIMED_CALL.replace("{builder}", "alpha_complex"),
+}
+
+#%% Measurements
+
+def run_case(code, repeat):
+    """
+    Runs code in a new interpreter repeat times
+
+    Output : dictionary with the best wall time of the interpreter in seconds, and the best of every time printed by code
+    """
+    res = {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT.parent, capture_output=True, text=True, check=True).stdout
+        times = {"wall": time.perf_counter() - start, **json.loads(output)}
+        for key, value in times.items():
+            res[key] = min(res.get(key, value), value)
+    return res
+
+def compare(results, reference_results):
+    """
+    Prints the ratio of the times of results to those of reference_results for the cases present in both
+    """
+    for case, times in results.items():
+        for key, value in times.items():
+            if key in reference_results.get(case, {}):
+                print(f"{value / max(reference_results[case][key], 1e-9):6.2f}x  {case} {key}")
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ""
+    return {"commit": commit, "python": platform.python_version(), "machine": platform.machine(), "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark of the import time and of the first call latency of the package")
+    parser.add_argument("--output", default="startup_results.json", help="file the JSON results are written to")
+    parser.add_argument("--repeat", type=int, default=10, help="number of runs of every case")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare the times with")
+    arguments = parser.parse_args()
+
+    results = {}
+    for case, code in CASES.items():
+        results[case] = run_case(code.format(package=PACKAGE), arguments.repeat)
+        print(f"{case}: " + ", ".join(f"{key} {value * 1000:.1f}ms" for key, value in results[case].items()))
+    with open(arguments.output, "w") as file:
+        json.dump({"metadata": metadata(), "results": results}, file, indent=1)
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            compare(results, json.load(file)["results"])
+
+if __name__ == "__main__":
+    main()
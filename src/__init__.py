@@ -0,0 +1,45 @@
+"""
+Public API of the package, loaded lazily : importing the package only defines the table below, and the module
+defining a name (with numpy and the solvers it needs) is imported when the name is first used, so that
+`from <package>.src import cech_complex` loads project.py and its dependencies, but not persistence.py or batch.py
+"""
+
+#%% Importing modules
+
+import importlib
+
+#%% Lazy loading
+
+# _exports maps every public name to the module defining it
+_exports = {
+    **dict.fromkeys(["complex", "iter_complex", "cech_complex", "iter_cech_complex", "rips_complex", "iter_rips_complex",
+                     "sparse_cech_complex", "alpha_complex", "iter_alpha_complex", "delaunay_alpha_complex",
+                     "naive_meb", "lp_type_meb", "welzl_meb", "move_to_front_meb", "backend_meb",
+                     "lp_type_alpha_complex_filtration_value", "backend_alpha_complex_filtration_value",
+                     "ComplexSession", "DynamicComplex"], "project"),
+    **dict.fromkeys(["Backend", "register_backend", "discover_backends", "load_backend", "available_backends",
+                     "get_backend", "set_backend"], "backends"),
+    **dict.fromkeys(["GridIndex", "KDTree", "DynamicGridIndex", "build_spatial_index"], "spatial_index"),
+    **dict.fromkeys(["in_sphere", "orientation", "affinely_independent"], "predicates"),
+    **dict.fromkeys(["persistence_pairs"], "persistence"),
+    **dict.fromkeys(["Instrumentation"], "instrumentation"),
+    **dict.fromkeys(["ColumnarComplex", "ColumnarBatch"], "columnar"),
+    **dict.fromkeys(["batch_complex"], "batch"),
+}
+
+_submodules = ["project", "backends", "spatial_index", "predicates", "persistence", "instrumentation", "kernels", "columnar", "batch"]
+
+__all__ = sorted(_exports)
+
+def __getattr__(name):
+    if name in _exports:
+        value = getattr(importlib.import_module("." + _exports[name], __name__), name)
+        # Kept in the namespace of the package, so that the next uses don't go through __getattr__
+        globals()[name] = value
+        return value
+    if name in _submodules:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports) | set(_submodules))
@@ -0,0 +1,134 @@
+#%% Importing modules
+
+import os
+
+#%% Backend registry
+
+# Setting this environment variable to the name of a backend selects it instead of the best available one
+ENVIRONMENT_VARIABLE = "SIMPLICIAL_COMPLEX_BACKEND"
+
+# Installed packages declare their backends as entry points of this group, named after the backend and pointing to its loader
+ENTRY_POINT_GROUP = "simplicial_complex.backends"
+# Priority of the discovered backends : above the numpy one, below the numba one
+DISCOVERED_PRIORITY = 5
+
+class Backend:
+    """
+    Implementations of the hot paths of project.py : an MEB solver, with the signature of lp_type_meb, and an alpha complex
+    filtration value calculator, with the signature of lp_type_alpha_complex_filtration_value
+    """
+
+    def __init__(self, name, meb, alpha_complex_filtration_value):
+        self.name = name
+        self.meb = meb
+        self.alpha_complex_filtration_value = alpha_complex_filtration_value
+
+# _loaders maps the name of every backend to (priority, loader), the loaders being only called when a backend is needed
+_loaders = {}
+_backends = {}
+_selected = None
+_discovered = False
+
+def register_backend(name, loader, priority=0):
+    """
+    Adds a backend to the registry
+
+    Input : the name of the backend, a function without arguments returning the Backend (which raises ImportError when
+            its dependencies are missing) and its priority when the best available backend is selected
+    """
+    global _selected
+    _loaders[name] = (priority, loader)
+    _backends.pop(name, None)
+    _selected = None
+
+def _entry_points():
+    from importlib.metadata import entry_points
+    try:
+        return list(entry_points(group=ENTRY_POINT_GROUP))
+    except TypeError:
+        # Before python 3.10, entry_points returns a dictionary of groups
+        return list(entry_points().get(ENTRY_POINT_GROUP, []))
+
+def discover_backends():
+    """
+    Registers the backends declared as entry points of the ENTRY_POINT_GROUP group by the installed packages, with
+    DISCOVERED_PRIORITY, unless a backend of the same name is already registered
+
+    This is done once, when a backend is needed for the first time : reading the metadata of the installed packages
+    is slow, and the module of a discovered backend is only imported when its loader is called
+    """
+    global _discovered
+    if _discovered:
+        return
+    _discovered = True
+    for entry_point in _entry_points():
+        if entry_point.name not in _loaders:
+            register_backend(entry_point.name, lambda entry_point=entry_point: entry_point.load()(), DISCOVERED_PRIORITY)
+
+def load_backend(name):
+    """
+    Output : the Backend registered as name, or None if its dependencies are missing
+    """
+    discover_backends()
+    if name not in _backends:
+        _, loader = _loaders[name]
+        try:
+            _backends[name] = loader()
+        except ImportError:
+            _backends[name] = None
+    return _backends[name]
+
+def _names_by_priority():
+    discover_backends()
+    return sorted(_loaders, key=lambda name: -_loaders[name][0])
+
+def available_backends():
+    """
+    Output : names of the backends whose dependencies are installed, from the highest priority to the lowest
+
+    Complexity : every backend is loaded, see get_backend to only load the best one
+    """
+    return [name for name in _names_by_priority() if load_backend(name) is not None]
+
+def get_backend():
+    """
+    Output : the backend named by the SIMPLICIAL_COMPLEX_BACKEND environment variable, or the available backend with the
+             highest priority, unless another one was chosen with set_backend
+
+    The backends are loaded from the highest priority down and the first one which loads is kept, so the backends of
+    lower priority are never imported
+    """
+    global _selected
+    if _selected is None:
+        name = os.environ.get(ENVIRONMENT_VARIABLE)
+        if name:
+            _selected = load_backend(name)
+        else:
+            _selected = next((backend for backend in map(load_backend, _names_by_priority()) if backend is not None), None)
+        assert(_selected is not None)
+    return _selected
+
+def set_backend(name):
+    """
+    Selects the backend used by backend_meb and backend_alpha_complex_filtration_value of project.py
+
+    Input : the name of an available backend, or None to go back to the automatic choice
+    """
+    global _selected
+    _selected = None if name is None else load_backend(name)
+    assert(name is None or _selected is not None)
+
+#%% Built-in backends
+
+def _numpy_backend():
+    from .project import lp_type_meb, lp_type_alpha_complex_filtration_value
+    return Backend("numpy", lp_type_meb, lp_type_alpha_complex_filtration_value)
+
+def _numba_backend():
+    from . import kernels
+    if not kernels.NUMBA_AVAILABLE:
+        raise ImportError("numba is not installed")
+    return Backend("numba", kernels.kernel_meb, kernels.kernel_alpha_complex_filtration_value)
+
+register_backend("numpy", _numpy_backend, priority=0)
+register_backend("numba", _numba_backend, priority=10)
@@ -0,0 +1,59 @@
+#%% Importing modules
+
+import numpy as np
+from .project import cech_complex
+from .columnar import ColumnarComplex, ColumnarBatch
+
+#%% Batches of point clouds
+
+def vectorized_cech_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf):
+    """
+    cech_complex with every level evaluated as a single batch : for small clouds, most of the time of cech_complex goes to
+    the calls to the MEB solver of every simplex, which the batch mode replaces with one vectorized circumsphere computation per level
+    """
+    return cech_complex(points, space_dim, max_simplex_dim, filtration_limit, batch=True)
+
+def _complex_chunk(points, offsets, space_dim, max_simplex_dim, filtration_limit, builder):
+    """
+    Builds the complexes of consecutive clouds as ColumnarComplex, which are cheaper to send back from a worker than lists of tuples
+    """
+    return [ColumnarComplex.from_iter(builder(points[start:end], space_dim, max_simplex_dim, filtration_limit))
+            for start, end in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+def batch_complex(points, offsets, space_dim, max_simplex_dim, filtration_limit=np.inf, builder=vectorized_cech_complex, workers=None, clouds_per_task=64):
+    """
+    Builds the complexes of many point clouds stacked in a single array
+
+    The clouds are split into tasks of consecutive clouds, run in a pool of processes when workers is given : the
+    points of a task are sent at once and its complexes come back as arrays, so the cost of the communication with
+    the workers is paid per task instead of per cloud, and the complexes are never held as lists in the current process
+
+    Input :
+        - (n, d) array of the points of all the clouds
+        - the m+1 offsets of the clouds, cloud i being points[offsets[i]:offsets[i+1]]
+        - the dimension d
+        - the maximum dimension for simplexes (k in the problem statement)
+        - an optional limit on filtration values (infinity by default)
+        - the builder of the complex of a cloud, called as builder(cloud, d, k, filtration_limit) (vectorized_cech_complex
+          by default, cech_complex, alpha_complex or rips_complex work too), which must be picklable with workers
+        - an optional number of worker processes (the clouds are built in the current process by default)
+        - the number of clouds per task
+
+    Output : ColumnarBatch whose cloud i is the complex builder returns for cloud i
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, space_dim)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    assert(len(offsets) > 0 and offsets[0] == 0 and offsets[-1] == len(points) and np.all(np.diff(offsets) >= 0))
+    assert(clouds_per_task > 0)
+    bounds = list(range(0, len(offsets) - 1, clouds_per_task)) + [len(offsets) - 1]
+    tasks = [(points[offsets[start]:offsets[end]], offsets[start:end+1] - offsets[start]) for start, end in zip(bounds[:-1], bounds[1:])]
+    chunk_points = [task_points for task_points, _ in tasks]
+    chunk_offsets = [task_offsets for _, task_offsets in tasks]
+    constants = [[argument] * len(tasks) for argument in (space_dim, max_simplex_dim, filtration_limit, builder)]
+    if workers is not None and workers > 1 and len(tasks) > 0:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(_complex_chunk, chunk_points, chunk_offsets, *constants))
+    else:
+        results = list(map(_complex_chunk, chunk_points, chunk_offsets, *constants))
+    return ColumnarBatch.from_complexes([columnar for result in results for columnar in result])
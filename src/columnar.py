@@ -0,0 +1,194 @@
+#%% Importing modules
+
+import numpy as np
+
+#%% Columnar complexes
+
+# Header of the binary format : magic number, version, number of simplex sizes, number of simplexes, number of vertex indices
+MAGIC = b"SCPXCOL1"
+HEADER = np.dtype([("magic", "S8"), ("version", "<u4"), ("number_of_sizes", "<u4"), ("number_of_simplexes", "<u8"), ("number_of_indices", "<u8")])
+VERSION = 1
+
+class ColumnarComplex:
+    """
+    Simplexes and filtration values of a complex stored in flat arrays instead of a list of couples
+
+    The simplexes are grouped by size, in the order of the list they come from :
+        - offsets[k] is the number of simplexes of size at most k, so the simplexes of size k are the rows
+          offsets[k-1]:offsets[k] (offsets[0] is 0)
+        - vertices holds the int32 indices of the simplexes of size 1, then those of size 2, etc, without padding
+        - values[i] is the float64 filtration value of the i-th simplex
+
+    This takes 4 * k + 8 bytes for a simplex of size k, and the arrays can be memory-mapped from a file written by save
+    """
+
+    def __init__(self, vertices, values, offsets):
+        self.vertices = vertices
+        self.values = values
+        self.offsets = offsets
+        sizes = np.arange(len(offsets))
+        # vertex_offsets[k] is the position in vertices of the first simplex of size k+1
+        self.vertex_offsets = np.concatenate([[0], np.cumsum(np.diff(offsets) * sizes[1:])])
+
+    @classmethod
+    def from_iter(cls, simplex_list, chunk_size=1 << 16):
+        """
+        Builds the columnar form of a complex without keeping its list form
+
+        Input : iterable of (simplex, filtration_value) couples sorted by size (as returned by complex or iter_complex)
+                and the number of simplexes converted at once
+
+        Output : ColumnarComplex
+        """
+        vertex_chunks = {}
+        value_chunks = []
+        pending = []
+        def flush():
+            size = len(pending[0][0])
+            vertex_chunks.setdefault(size, []).append(np.array([simplex for simplex, _ in pending], dtype=np.int64).reshape(-1))
+            value_chunks.append(np.array([value for _, value in pending], dtype=np.float64))
+            pending.clear()
+
+        counts = {}
+        for simplex, value in simplex_list:
+            if pending and (len(simplex) != len(pending[0][0]) or len(pending) >= chunk_size):
+                flush()
+            assert(len(simplex) >= max(counts, default=0))
+            counts[len(simplex)] = counts.get(len(simplex), 0) + 1
+            pending.append((simplex, value))
+        if pending:
+            flush()
+
+        vertices = np.concatenate([chunk for size in sorted(vertex_chunks) for chunk in vertex_chunks[size]]) if vertex_chunks else np.zeros(0, dtype=np.int64)
+        assert(len(vertices) == 0 or vertices.max() < 2**31)
+        offsets = np.zeros(max(counts, default=0) + 1, dtype=np.int64)
+        for size, count in counts.items():
+            offsets[size] = count
+        offsets = np.cumsum(offsets)
+        values = np.concatenate(value_chunks) if value_chunks else np.zeros(0, dtype=np.float64)
+        return cls(vertices.astype(np.int32), values, offsets)
+
+    def __len__(self):
+        return len(self.values)
+
+    def max_size(self):
+        return len(self.offsets) - 1
+
+    def simplices_of_size(self, size):
+        """
+        Output : (m, size) int32 array of the simplexes of that size, as a view of vertices
+        """
+        if size < 1 or size > self.max_size():
+            return np.zeros((0, max(size, 0)), dtype=np.int32)
+        return self.vertices[self.vertex_offsets[size-1]:self.vertex_offsets[size]].reshape(-1, size)
+
+    def values_of_size(self, size):
+        """
+        Output : filtration values of the simplexes of that size, as a view of values
+        """
+        if size < 1 or size > self.max_size():
+            return np.zeros(0)
+        return self.values[self.offsets[size-1]:self.offsets[size]]
+
+    def __iter__(self):
+        for size in range(1, self.max_size() + 1):
+            for simplex, value in zip(self.simplices_of_size(size).tolist(), self.values_of_size(size).tolist()):
+                yield tuple(simplex), value
+
+    def to_list(self):
+        """
+        Output : list of (simplex, filtration_value) couples, as returned by complex
+        """
+        return list(self)
+
+    def save(self, path):
+        """
+        Writes the complex in a binary file : a header, then the offsets (int64), the values (float64) and the vertices (int32),
+        all little-endian, so that load can memory-map them
+        """
+        header = np.zeros(1, dtype=HEADER)
+        header[0] = (MAGIC, VERSION, len(self.offsets), len(self.values), len(self.vertices))
+        with open(path, "wb") as file:
+            file.write(header.tobytes())
+            file.write(np.asarray(self.offsets, dtype="<i8").tobytes())
+            file.write(np.asarray(self.values, dtype="<f8").tobytes())
+            file.write(np.asarray(self.vertices, dtype="<i4").tobytes())
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Reads a complex written by save
+
+        Input : path of the file and whether to memory-map the values and vertices (True by default) instead of reading them
+
+        Output : ColumnarComplex
+        """
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        assert(len(header) == 1 and header[0]["magic"] == MAGIC and header[0]["version"] == VERSION)
+        number_of_sizes, number_of_simplexes, number_of_indices = (int(header[0][field]) for field in ["number_of_sizes", "number_of_simplexes", "number_of_indices"])
+        offsets = np.fromfile(path, dtype="<i8", count=number_of_sizes, offset=HEADER.itemsize)
+        position = HEADER.itemsize + 8 * number_of_sizes
+        def read(dtype, count, position):
+            if count == 0:
+                return np.zeros(0, dtype=dtype)
+            if mmap:
+                return np.memmap(path, dtype=dtype, mode="r", offset=position, shape=(count,))
+            return np.fromfile(path, dtype=dtype, count=count, offset=position)
+        values = read("<f8", number_of_simplexes, position)
+        vertices = read("<i4", number_of_indices, position + 8 * number_of_simplexes)
+        return cls(vertices, values, offsets)
+
+#%% Columnar batches of complexes
+
+class ColumnarBatch:
+    """
+    Complexes of several point clouds stored in flat arrays, every simplex being tagged with the index of its cloud
+
+    The simplexes are grouped by cloud, then by size within a cloud, in the order of the complexes they come from :
+        - cloud_ids[i], sizes[i] and values[i] are the int32 cloud, the int32 size and the float64 filtration value
+          of the i-th simplex
+        - vertices holds the int32 indices of the simplexes, local to their cloud, without padding
+        - simplex_offsets[c]:simplex_offsets[c+1] are the rows of the simplexes of cloud c, and
+          vertex_offsets[c]:vertex_offsets[c+1] the positions of their vertices in vertices
+    """
+
+    def __init__(self, vertices, values, sizes, cloud_ids, simplex_offsets, vertex_offsets):
+        self.vertices = vertices
+        self.values = values
+        self.sizes = sizes
+        self.cloud_ids = cloud_ids
+        self.simplex_offsets = simplex_offsets
+        self.vertex_offsets = vertex_offsets
+
+    @classmethod
+    def from_complexes(cls, complexes):
+        """
+        Input : list of ColumnarComplex, the i-th one being the complex of cloud i
+
+        Output : ColumnarBatch
+        """
+        counts = [len(columnar) for columnar in complexes]
+        def concatenate(arrays, dtype):
+            return np.concatenate(arrays).astype(dtype) if arrays else np.zeros(0, dtype=dtype)
+        sizes = concatenate([np.repeat(np.arange(1, len(columnar.offsets)), np.diff(columnar.offsets)) for columnar in complexes], np.int32)
+        cloud_ids = np.repeat(np.arange(len(complexes)), counts).astype(np.int32)
+        simplex_offsets = np.concatenate([[0], np.cumsum(counts, dtype=np.int64)])
+        vertex_offsets = np.concatenate([[0], np.cumsum([len(columnar.vertices) for columnar in complexes], dtype=np.int64)])
+        vertices = concatenate([columnar.vertices for columnar in complexes], np.int32)
+        values = concatenate([columnar.values for columnar in complexes], np.float64)
+        return cls(vertices, values, sizes, cloud_ids, simplex_offsets, vertex_offsets)
+
+    def __len__(self):
+        return len(self.values)
+
+    def number_of_clouds(self):
+        return len(self.simplex_offsets) - 1
+
+    def cloud(self, cloud_id):
+        """
+        Output : ColumnarComplex of the cloud, whose vertices and values are views of the arrays of the batch
+        """
+        start, end = self.simplex_offsets[cloud_id], self.simplex_offsets[cloud_id+1]
+        offsets = np.cumsum(np.bincount(self.sizes[start:end], minlength=1))
+        vertices = self.vertices[self.vertex_offsets[cloud_id]:self.vertex_offsets[cloud_id+1]]
+        return ColumnarComplex(vertices, self.values[start:end], offsets)
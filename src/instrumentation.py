@@ -0,0 +1,173 @@
+#%% Importing modules
+
+import os
+import sys
+import atexit
+import functools
+from time import perf_counter
+from . import project
+
+#%% Instrumentation
+
+# Setting this environment variable to a non-empty value instruments the whole run and prints a report on exit
+ENVIRONMENT_VARIABLE = "SIMPLICIAL_COMPLEX_INSTRUMENTATION"
+
+class Instrumentation:
+    """
+    Context manager counting and timing the hot paths of project.py while it is active
+
+    The functions of project.py are replaced by instrumented wrappers when entering the context and restored when
+    leaving it, so nothing is paid when it isn't used. Only the current process is instrumented : the worker
+    processes of complex(workers=...) aren't counted
+
+    The counters are :
+        - calls and time of sphere_from_points, in_ball and first_point_in_ball (the emptiness scan of the alpha complex)
+        - calls and time of SupportSet.push (the Cholesky updates of lp_type_meb and move_to_front_meb), and calls,
+          solves and time of SupportSet.sphere, a solve being a call which computed the circumsphere instead of
+          returning the one of the unchanged support
+        - hits (the constraint violates the basis) and misses of the violation tests given to lp_type_solver
+        - calls, maximum recursion depth and time of lp_type_solver and welzl_aux
+        - filtration evaluations and their time for every simplex size in complex()
+
+    Input : an optional progress callback, called with the Instrumentation every progress_interval filtration evaluations
+    """
+
+    def __init__(self, progress=None, progress_interval=1000):
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.counters = {}
+        self.filtration_evaluations = {}
+        self.filtration_time = {}
+        self._originals = {}
+
+    def __enter__(self):
+        wrappers = {
+            (project, "sphere_from_points"): self._timed("sphere_from_points", project.sphere_from_points),
+            (project, "in_ball"): self._timed("in_ball", project.in_ball),
+            (project, "first_point_in_ball"): self._timed("first_point_in_ball", project.first_point_in_ball),
+            (project, "lp_type_solver"): self._recursive("lp_type_solver", project.lp_type_solver, self._lp_type_arguments),
+            (project, "welzl_aux"): self._recursive("welzl_aux", project.welzl_aux),
+            (project, "_evaluate_level"): self._evaluate_level(project._evaluate_level),
+            (project.SupportSet, "push"): self._timed("SupportSet.push", project.SupportSet.push),
+            (project.SupportSet, "sphere"): self._support_sphere(project.SupportSet.sphere),
+        }
+        self.counters.setdefault("violation_test", {"hits": 0, "misses": 0})
+        for (owner, name), wrapper in wrappers.items():
+            self._originals[owner, name] = getattr(owner, name)
+            setattr(owner, name, wrapper)
+        return self
+
+    def __exit__(self, *exception):
+        for (owner, name), original in self._originals.items():
+            setattr(owner, name, original)
+        self._originals.clear()
+        return False
+
+    def _timed(self, name, function):
+        counter = self.counters.setdefault(name, {"calls": 0, "time": 0.0})
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                counter["calls"] += 1
+                counter["time"] += perf_counter() - start
+        return wrapper
+
+    def _recursive(self, name, function, arguments=None):
+        # The recursive calls go through the wrapper too, the time is only added up for the outermost calls
+        counter = self.counters.setdefault(name, {"calls": 0, "max_depth": 0, "time": 0.0})
+        depth = [0]
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if arguments is not None:
+                args = arguments(args)
+            depth[0] += 1
+            counter["calls"] += 1
+            counter["max_depth"] = max(counter["max_depth"], depth[0])
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                depth[0] -= 1
+                if depth[0] == 0:
+                    counter["time"] += perf_counter() - start
+        return wrapper
+
+    def _support_sphere(self, function):
+        counter = self.counters.setdefault("SupportSet.sphere", {"calls": 0, "solves": 0, "time": 0.0})
+        @functools.wraps(function)
+        def wrapper(support_set, *args, **kwargs):
+            # The cached ball is returned as is when the support didn't change
+            cached = support_set.ball
+            start = perf_counter()
+            try:
+                ball = function(support_set, *args, **kwargs)
+                counter["solves"] += ball is not cached
+                return ball
+            finally:
+                counter["calls"] += 1
+                counter["time"] += perf_counter() - start
+        return wrapper
+
+    def _lp_type_arguments(self, args):
+        constraint_set, violation_test, *others = args
+        if getattr(violation_test, "instrumented", False):
+            return args
+        counter = self.counters["violation_test"]
+        def counting_violation_test(basis, constraint):
+            violated = violation_test(basis, constraint)
+            counter["hits" if violated else "misses"] += 1
+            return violated
+        counting_violation_test.instrumented = True
+        return (constraint_set, counting_violation_test, *others)
+
+    def _evaluate_level(self, function):
+        @functools.wraps(function)
+        def wrapper(points, space_dim, filtration_limit, complex_filtration_value, candidates, batch, simplex_list):
+            def counting_filtration_value(points, simplex, space_dim):
+                start = perf_counter()
+                value = complex_filtration_value(points, simplex, space_dim)
+                # In batch mode simplex is an (m, k) array of m simplexes of size k
+                size, count = (simplex.shape[1], simplex.shape[0]) if batch else (len(simplex), 1)
+                self.filtration_time[size] = self.filtration_time.get(size, 0.0) + perf_counter() - start
+                before = sum(self.filtration_evaluations.values())
+                self.filtration_evaluations[size] = self.filtration_evaluations.get(size, 0) + count
+                if self.progress is not None and (before + count) // self.progress_interval > before // self.progress_interval:
+                    self.progress(self)
+                return value
+            return function(points, space_dim, filtration_limit, counting_filtration_value, candidates, batch, simplex_list)
+        return wrapper
+
+    def as_dict(self):
+        """
+        Output : dictionary of the counters, with the filtration evaluations and their time by simplex size
+        """
+        return {**{name: dict(counter) for name, counter in self.counters.items()},
+                "filtration_evaluations": dict(sorted(self.filtration_evaluations.items())),
+                "filtration_time": dict(sorted(self.filtration_time.items()))}
+
+    def report(self):
+        """
+        Output : human readable summary of the counters
+        """
+        lines = []
+        for name, counter in self.counters.items():
+            lines.append(f"{name}: " + ", ".join(f"{key} {value:.4g}" if isinstance(value, float) else f"{key} {value}" for key, value in counter.items()))
+        for size in sorted(self.filtration_evaluations):
+            lines.append(f"filtration evaluations of size {size}: {self.filtration_evaluations[size]} in {self.filtration_time[size]:.4g}s")
+        return "\n".join(lines)
+
+def enable_from_environment():
+    """
+    Instruments the rest of the run when the SIMPLICIAL_COMPLEX_INSTRUMENTATION environment variable is set,
+    and prints the report on the standard error when the interpreter exits
+
+    Output : the active Instrumentation, or None if the variable isn't set
+    """
+    if not os.environ.get(ENVIRONMENT_VARIABLE):
+        return None
+    instrumentation = Instrumentation().__enter__()
+    atexit.register(lambda: print(instrumentation.report(), file=sys.stderr))
+    return instrumentation
@@ -0,0 +1,241 @@
+#%% Importing modules
+
+import numpy as np
+from .project import first_point_in_ball, lp_type_meb, lp_type_alpha_complex_filtration_value, _alpha_outside_points, _alpha_support
+from .predicates import circumsphere
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+def jit(function):
+    """
+    Compiles function with numba when it is installed, and leaves it as plain python otherwise
+
+    The kernels below only use loops over float64 and int64 arrays so that they compile in nopython mode
+    """
+    if NUMBA_AVAILABLE:
+        return njit(cache=True)(function)
+    return function
+
+#%% Kernels
+
+@jit
+def circumsphere_kernel(support, size, center):
+    """
+    Finds the smallest circumsphere of the points support[:size], written in center
+
+    Input : (d+1, d) float64 array, the number of points in it (at least 1) and a (d,) float64 array
+
+    Output : (radius, success) where success is False if the points are affinely dependent
+    """
+    dim = support.shape[1]
+    m = size - 1
+    # With vi = support[i+1] - support[0], the center is support[0] + sum(l_i * v_i) where 2 * Gram(v) * l = (|v_i|^2)_i
+    system = np.zeros((m, m + 1))
+    scale = 0.0
+    for i in range(m):
+        for j in range(i + 1):
+            dot = 0.0
+            for k in range(dim):
+                dot += (support[i+1, k] - support[0, k]) * (support[j+1, k] - support[0, k])
+            system[i, j] = 2 * dot
+            system[j, i] = 2 * dot
+        system[i, m] = system[i, i] / 2
+        scale = max(scale, system[i, i])
+    # Gaussian elimination with partial pivoting
+    for column in range(m):
+        pivot = column
+        for row in range(column + 1, m):
+            if abs(system[row, column]) > abs(system[pivot, column]):
+                pivot = row
+        if abs(system[pivot, column]) <= 1e-12 * scale:
+            return 0.0, False
+        for k in range(m + 1):
+            system[column, k], system[pivot, k] = system[pivot, k], system[column, k]
+        for row in range(column + 1, m):
+            factor = system[row, column] / system[column, column]
+            for k in range(column, m + 1):
+                system[row, k] -= factor * system[column, k]
+    coefficients = np.zeros(m)
+    for row in range(m - 1, -1, -1):
+        value = system[row, m]
+        for k in range(row + 1, m):
+            value -= system[row, k] * coefficients[k]
+        coefficients[row] = value / system[row, row]
+    radius2 = 0.0
+    for k in range(dim):
+        offset = 0.0
+        for i in range(m):
+            offset += coefficients[i] * (support[i+1, k] - support[0, k])
+        center[k] = support[0, k] + offset
+        radius2 += offset * offset
+    return np.sqrt(radius2), True
+
+@jit
+def move_to_front_kernel(points, order, support, support_size, emptiness, tolerance):
+    """
+    Welzl's algorithm with the move-to-front heuristic, without recursion
+
+    With emptiness False, finds the smallest ball containing the points and having the initial support points on its
+    boundary (the MEB problem). With emptiness True, finds the smallest ball having the initial support points on its
+    boundary and none of the points strictly inside (the LP solved by the alpha complex filtration value)
+
+    The kernel only takes the decisions floating point can take : a point at distance at most tolerance * (r + m) from
+    a sphere of radius r (other than a support point), where m is the largest absolute coordinate, can't be placed, and the kernel gives up like for affinely dependent points,
+    so that the caller solves the problem with the exact predicates instead
+
+    Input :
+        - (n, d) float64 array of points
+        - int64 permutation of range(n), reordered in place
+        - (d+1, d) float64 array whose first support_size rows are the initial support points, overwritten
+        - the number of initial support points
+        - which of the two problems is solved
+        - the relative tolerance of the ball tests (see above)
+
+    Output : (center, radius, size, success) where the first size rows of support are the support of the ball and success
+             is False if a circumsphere couldn't be computed or a point was too close to a sphere
+             (radius is -1 for an empty ball, when there are no points at all)
+    """
+    n, dim = points.shape
+    # Level l of the stack handles the points order[:ends[l]] with l more support points than the initial ones
+    levels = dim + 2
+    ends = np.zeros(levels, dtype=np.int64)
+    positions = np.zeros(levels, dtype=np.int64)
+    centers = np.zeros((levels, dim))
+    radii = np.zeros(levels)
+    # Support of the ball of every level, which is the support of the level or one of its descendants
+    ball_supports = np.zeros((levels, dim + 1, dim))
+    ball_sizes = np.zeros(levels, dtype=np.int64)
+
+    size = support_size
+    ends[0] = n
+    # The rounding errors of the distances grow with the coordinates, not only with the radius
+    magnitude = 0.0
+    for i in range(n):
+        for k in range(dim):
+            magnitude = max(magnitude, abs(points[i, k]))
+    for i in range(size):
+        for k in range(dim):
+            magnitude = max(magnitude, abs(support[i, k]))
+    ball_supports[0, :size] = support[:size]
+    ball_sizes[0] = size
+    if size == 0:
+        radii[0] = -1.0
+    else:
+        radius, success = circumsphere_kernel(support, size, centers[0])
+        radii[0] = radius
+        if not success:
+            return centers[0], radius, size, False
+    top = 0
+    while True:
+        if positions[top] >= ends[top] or size == dim + 1:
+            if top == 0:
+                support[:ball_sizes[0]] = ball_supports[0, :ball_sizes[0]]
+                return centers[0], radii[0], ball_sizes[0], True
+            # The ball of the level is the new ball of its parent, whose current point is moved to the front
+            centers[top-1] = centers[top]
+            radii[top-1] = radii[top]
+            ball_supports[top-1] = ball_supports[top]
+            ball_sizes[top-1] = ball_sizes[top]
+            size -= 1
+            top -= 1
+            position = positions[top]
+            index = order[position]
+            for k in range(position, 0, -1):
+                order[k] = order[k-1]
+            order[0] = index
+            positions[top] = position + 1
+            continue
+        index = order[positions[top]]
+        distance2 = 0.0
+        for k in range(dim):
+            distance2 += (points[index, k] - centers[top, k])**2
+        distance = np.sqrt(distance2)
+        if radii[top] >= 0 and abs(distance - radii[top]) <= tolerance * (radii[top] + magnitude):
+            # Points equal to a support point are on the sphere, any other point this close can't be placed
+            on_support = False
+            for i in range(ball_sizes[top]):
+                equal = True
+                for k in range(dim):
+                    equal = equal and points[index, k] == ball_supports[top, i, k]
+                on_support = on_support or equal
+            if not on_support:
+                return centers[top], radii[top], size, False
+            violated = False
+        elif emptiness:
+            violated = radii[top] >= 0 and distance < radii[top]
+        else:
+            violated = radii[top] < 0 or distance > radii[top]
+        if not violated:
+            positions[top] += 1
+            continue
+        support[size] = points[index]
+        size += 1
+        top += 1
+        ends[top] = positions[top-1]
+        positions[top] = 0
+        radius, success = circumsphere_kernel(support, size, centers[top])
+        radii[top] = radius
+        ball_supports[top, :size] = support[:size]
+        ball_sizes[top] = size
+        if not success:
+            return centers[top], radius, size, False
+
+#%% Filtration values and MEB with the kernels
+
+def kernel_meb(points, dim=3, boundary_points=()):
+    """
+    Finds the minimal enclosing ball (MEB) of a non-empty set of points with move_to_front_kernel
+
+    Input : non-empty set of points of length n and dimension d, and an optional list of points known to be on the boundary of the MEB
+
+    Output : center and radius of the MEB (computed by lp_type_meb, with the exact predicates, when the kernel gives up)
+
+    Complexity : O(d! * n) expected, without interpreter overhead when numba is installed
+    """
+    assert(len(points) + len(boundary_points) > 0)
+    points_as_array = np.ascontiguousarray(np.reshape(points, (-1, dim)), dtype=float)
+    support = np.zeros((dim + 1, dim))
+    support[:len(boundary_points)] = np.reshape(boundary_points, (-1, dim))
+    order = np.random.permutation(len(points_as_array)).astype(np.int64)
+    center, radius, size, success = move_to_front_kernel(points_as_array, order, support, len(boundary_points), False, 1e-10)
+    if not success:
+        return lp_type_meb(points, dim, boundary_points)
+    return circumsphere(support[:size], (center.copy(), radius)) if size > 0 else (center.copy(), radius)
+
+kernel_meb.supports_boundary_points = True
+
+def kernel_alpha_complex_filtration_value(points, simplex, dim=3, spatial_index=None, filtration_limit=np.inf):
+    """
+    Finds filtration value of simplex in the alpha complex with move_to_front_kernel
+
+    Input : same as lp_type_alpha_complex_filtration_value
+
+    Output : infinity if the simplex isn't in the alpha complex, its filtration value otherwise (computed by
+             lp_type_alpha_complex_filtration_value, with the exact predicates, when the kernel gives up,
+             and infinity when the vertices of simplex have no common sphere)
+    """
+    points = np.asarray(points, dtype=float)
+    # The kernel needs at most d+1 affinely independent vertices, chosen like in lp_type_alpha_complex_filtration_value
+    vertices = _alpha_support(points, simplex, dim)
+    if vertices is None:
+        return np.inf
+    if len(vertices) == 1:
+        return 0.0
+    outside_points, restricted = _alpha_outside_points(points, simplex, spatial_index, filtration_limit)
+    support = np.zeros((dim + 1, dim))
+    support[:len(vertices)] = vertices
+    order = np.random.permutation(len(outside_points)).astype(np.int64)
+    center, radius, size, success = move_to_front_kernel(np.ascontiguousarray(outside_points), order, support, len(vertices), True, 1e-10)
+    if not success:
+        return lp_type_alpha_complex_filtration_value(points, simplex, dim, spatial_index, filtration_limit)
+    center, radius = circumsphere(support[:size], (center, radius))
+    if restricted and radius >= filtration_limit:
+        return np.inf
+    # The emptiness of the ball is checked again with the exact predicates
+    if first_point_in_ball(outside_points, center, radius, epsilon=-1e-10, support=support[:size]) >= 0:
+        return np.inf
+    return radius
@@ -0,0 +1,199 @@
+#%% Importing modules
+
+import numpy as np
+
+#%% Boundary matrix
+
+def _row_keys(simplices):
+    # Big-endian rows compare bytewise like tuples of non-negative integers, so each row can be searched as a single key
+    rows = np.ascontiguousarray(simplices, dtype=">i8")
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).ravel()
+
+def _facets(simplices, sizes):
+    """
+    Finds the facets of every simplex of a complex closed under taking faces
+
+    Output : dictionary mapping every size bigger than 1 to (positions, facets) where positions are the indices in simplices
+             of the simplexes of that size and facets[i] the indices of the facets of simplices[positions[i]]
+    """
+    keys = {}
+    for size in np.unique(sizes).tolist():
+        positions = np.flatnonzero(sizes == size)
+        size_keys = _row_keys([simplices[position] for position in positions.tolist()])
+        order = np.argsort(size_keys, kind="stable")
+        keys[size] = (size_keys[order], positions[order])
+
+    res = {}
+    for size in keys:
+        if size == 1:
+            continue
+        assert(size - 1 in keys)
+        face_keys, face_positions = keys[size - 1]
+        _, positions = keys[size]
+        size_simplices = np.array([simplices[position] for position in positions.tolist()], dtype=int)
+        facets = np.empty((len(positions), size), dtype=int)
+        for j in range(size):
+            facet_keys = _row_keys(np.delete(size_simplices, j, axis=1))
+            found = np.minimum(np.searchsorted(face_keys, facet_keys), len(face_keys) - 1)
+            assert(np.all(face_keys[found] == facet_keys))
+            facets[:, j] = face_positions[found]
+        res[size] = (positions, facets)
+    return res
+
+def _filtration_permutation(values, sizes, facets):
+    # A simplex gets at least the values of its facets, which only corrects rounding errors for the complexes of project.py
+    for size in sorted(facets):
+        positions, size_facets = facets[size]
+        values[positions] = np.maximum(values[positions], np.max(values[size_facets], axis=1))
+    return np.lexsort((sizes, values))
+
+def _compressed_columns(permutation, sizes, facets):
+    m = len(permutation)
+    rank = np.empty(m, dtype=int)
+    rank[permutation] = np.arange(m)
+    column_sizes = np.where(sizes > 1, sizes, 0)[permutation]
+    indptr = np.zeros(m + 1, dtype=int)
+    np.cumsum(column_sizes, out=indptr[1:])
+    indices = np.zeros(indptr[-1], dtype=int)
+    for size, (positions, size_facets) in facets.items():
+        rows = np.sort(rank[size_facets], axis=1)
+        indices[indptr[rank[positions]][:, np.newaxis] + np.arange(size)] = rows
+    return indptr, indices
+
+def filtration_order(simplex_list):
+    """
+    Sorts the simplexes of a complex into a filtration
+
+    The filtration value of a simplex is first raised to the values of its facets when they are bigger,
+    so that rounding errors in the filtration values never put a simplex before one of its faces
+
+    Input : list of (simplex, filtration_value) couples closed under taking faces, as returned by cech_complex or alpha_complex
+
+    Output : the same couples sorted by filtration value, then by dimension (the order of simplexes with the same value
+             and dimension is kept)
+
+    Complexity : O(m * k * log(m)) where m is the number of simplexes and k the size of the biggest one
+    """
+    simplices = [simplex for simplex, _ in simplex_list]
+    values = np.array([value for _, value in simplex_list], dtype=float)
+    sizes = np.array([len(simplex) for simplex in simplices], dtype=int)
+    permutation = _filtration_permutation(values, sizes, _facets(simplices, sizes))
+    return [(simplices[i], values[i]) for i in permutation.tolist()]
+
+def boundary_matrix(filtration):
+    """
+    Builds the boundary matrix of a filtration over Z/2Z in compressed sparse column storage
+
+    Input : list of (simplex, filtration_value) couples in filtration order (see filtration_order)
+
+    Output : (indptr, indices) arrays such that the rows of the nonzero entries of column j, which are the positions
+             in the filtration of the facets of its j-th simplex, are indices[indptr[j]:indptr[j+1]] in increasing order
+
+    Complexity : O(m * k * log(m)) where m is the number of simplexes and k the size of the biggest one
+    """
+    simplices = [simplex for simplex, _ in filtration]
+    sizes = np.array([len(simplex) for simplex in simplices], dtype=int)
+    indptr, indices = _compressed_columns(np.arange(len(simplices)), sizes, _facets(simplices, sizes))
+    # Every facet comes before its simplex in a filtration
+    assert(np.all(indices < np.repeat(np.arange(len(simplices)), np.diff(indptr))))
+    return indptr, indices
+
+def coboundary_matrix(indptr, indices):
+    """
+    Builds the anti-transpose of a boundary matrix, whose column m-1-i holds the coboundary of the i-th simplex
+    with rows m-1-j for its cofacets j
+
+    Input : a boundary matrix in compressed sparse column storage (see boundary_matrix)
+
+    Output : (indptr, indices) arrays of the anti-transposed matrix in the same storage
+
+    Complexity : O(nnz log(nnz)) where nnz is the number of nonzero entries
+    """
+    m = len(indptr) - 1
+    columns = np.repeat(np.arange(m), np.diff(indptr))
+    # Sorting by decreasing row, then decreasing column, gives the anti-transposed columns with increasing rows
+    order = np.lexsort((-columns, -indices))
+    counts = np.bincount(m - 1 - indices, minlength=m)
+    co_indptr = np.zeros(m + 1, dtype=int)
+    np.cumsum(counts, out=co_indptr[1:])
+    return co_indptr, m - 1 - columns[order]
+
+#%% Reduction
+
+def _reduce(indptr, indices, column_order):
+    """
+    Reduces the columns of a matrix over Z/2Z in the given order, skipping the columns which are known to reduce to zero
+    because their index is already the pivot of another column (clearing)
+
+    Output : dictionary mapping the pivot (lowest nonzero row) of every nonzero reduced column to that column
+    """
+    pivots = {}
+    reduced = {}
+    for j in column_order:
+        if j in pivots:
+            continue
+        column = indices[indptr[j]:indptr[j+1]]
+        while len(column) > 0:
+            other = pivots.get(int(column[-1]))
+            if other is None:
+                break
+            column = np.setxor1d(column, reduced[other], assume_unique=True)
+        if len(column) > 0:
+            pivots[int(column[-1])] = j
+            reduced[j] = column
+    return pivots
+
+def persistence_pairs(simplex_list, cohomology=False, min_persistence=0):
+    """
+    Computes the persistence diagram of a filtered complex over Z/2Z
+
+    The boundary matrix is reduced one dimension at a time, starting with the biggest simplexes so that the columns of the
+    simplexes creating a class that dies later are never reduced (clearing, or twist). With cohomology, the coboundary
+    matrix is reduced instead, starting with the smallest simplexes, which is usually faster for Rips-like complexes
+
+    Input :
+        - list of (simplex, filtration_value) couples closed under taking faces, in any order (as returned by cech_complex or alpha_complex)
+        - whether to reduce the coboundary matrix instead of the boundary matrix (False by default), which gives the same pairs
+        - the persistence (death - birth) that a pair must exceed to be kept (0 by default, so that only the pairs born
+          and killed at the same value are left out, a negative value keeps them all)
+
+    Output : list whose p-th element is the list of the (birth, death) couples of the classes of dimension p, sorted,
+             where death is infinity for the classes which never die. The classes of the dimension of the biggest simplexes
+             are only meaningful if the complex was built with simplexes of one more dimension (max_simplex_dim one bigger)
+
+    Complexity : O(m^3) in the worst case where m is the number of simplexes, close to linear in practice
+    """
+    m = len(simplex_list)
+    if m == 0:
+        return []
+    simplices = [simplex for simplex, _ in simplex_list]
+    values = np.array([value for _, value in simplex_list], dtype=float)
+    sizes = np.array([len(simplex) for simplex in simplices], dtype=int)
+    facets = _facets(simplices, sizes)
+    permutation = _filtration_permutation(values, sizes, facets)
+    indptr, indices = _compressed_columns(permutation, sizes, facets)
+    dimensions = sizes[permutation] - 1
+    max_dimension = int(np.max(dimensions))
+
+    if cohomology:
+        indptr, indices = coboundary_matrix(indptr, indices)
+        # Column m-1-i is the coboundary of the i-th simplex, columns are taken by increasing dimension then index
+        column_order = [m - 1 - i for dimension in range(max_dimension + 1) for i in np.flatnonzero(dimensions == dimension)[::-1].tolist()]
+        pairs = [(m - 1 - column, m - 1 - row) for row, column in _reduce(indptr, indices, column_order).items()]
+    else:
+        column_order = [j for dimension in range(max_dimension, 0, -1) for j in np.flatnonzero(dimensions == dimension).tolist()]
+        pairs = list(_reduce(indptr, indices, column_order).items())
+
+    values = values[permutation].tolist()
+    dimensions = dimensions.tolist()
+    res = [[] for _ in range(max_dimension + 1)]
+    paired = np.zeros(m, dtype=bool)
+    for birth, death in pairs:
+        paired[birth] = paired[death] = True
+        if values[death] - values[birth] > min_persistence:
+            res[dimensions[birth]].append((values[birth], values[death]))
+    for birth in np.flatnonzero(~paired).tolist():
+        res[dimensions[birth]].append((values[birth], np.inf))
+    for diagram in res:
+        diagram.sort()
+    return res
@@ -0,0 +1,468 @@
+#%% Importing modules
+
+import fractions
+import functools
+import math
+import operator
+import numpy as np
+
+#%% Filtered geometric predicates
+
+# Unit roundoff of float64 arithmetic
+UNIT_ROUNDOFF = 2.0**-53
+
+# Relative accuracy of the centers given by circumsphere
+CIRCUMSPHERE_TOLERANCE = 1e-8
+
+def _sign(value):
+    return (value > 0) - (value < 0)
+
+def _to_integers(arrays):
+    """
+    Scales float arrays by a common power of two so that all their coordinates become python integers, exactly
+
+    Output : the scale, then the flattened coordinates of every array as lists of integers
+    """
+    ratios = [[x.as_integer_ratio() for x in np.asarray(array, dtype=float).reshape(-1).tolist()] for array in arrays]
+    scale = max((denominator for array in ratios for _, denominator in array), default=1)
+    return (scale, *[[numerator * (scale // denominator) for numerator, denominator in array] for array in ratios])
+
+def _determinant_sign(matrix):
+    """
+    Sign of the determinant of a square matrix of integers, by fraction-free (Bareiss) Gaussian elimination
+    """
+    matrix = [list(row) for row in matrix]
+    size = len(matrix)
+    sign = 1
+    previous_pivot = 1
+    for column in range(size):
+        pivot = next((row for row in range(column, size) if matrix[row][column] != 0), None)
+        if pivot is None:
+            return 0
+        if pivot != column:
+            matrix[column], matrix[pivot] = matrix[pivot], matrix[column]
+            sign = -sign
+        for row in range(column + 1, size):
+            for j in range(column + 1, size):
+                matrix[row][j] = (matrix[row][j] * matrix[column][column] - matrix[row][column] * matrix[column][j]) // previous_pivot
+        previous_pivot = matrix[column][column]
+    return sign * _sign(matrix[size-1][size-1]) if size > 0 else 1
+
+def _integer_solve(matrix, rhs):
+    """
+    Solves a square linear system of integers by fraction-free (Bareiss) Gaussian elimination
+
+    Output : (determinant, y) such that the solution is y / determinant, with y a list of integers (Cramer's rule),
+             raises numpy.linalg.LinAlgError if the matrix is singular
+    """
+    size = len(matrix)
+    system = [list(row) + [value] for row, value in zip(matrix, rhs)]
+    sign = 1
+    previous_pivot = 1
+    for column in range(size):
+        pivot = next((row for row in range(column, size) if system[row][column] != 0), None)
+        if pivot is None:
+            raise np.linalg.LinAlgError("affinely dependent points")
+        if pivot != column:
+            system[column], system[pivot] = system[pivot], system[column]
+            sign = -sign
+        for row in range(column + 1, size):
+            for j in range(column + 1, size + 1):
+                system[row][j] = (system[row][j] * system[column][column] - system[row][column] * system[column][j]) // previous_pivot
+            system[row][column] = 0
+        previous_pivot = system[column][column]
+    determinant = previous_pivot
+    # determinant * x_i is an integer, so the divisions of the back substitution are exact
+    solution = [0] * size
+    for row in reversed(range(size)):
+        value = determinant * system[row][size] - sum(system[row][j] * solution[j] for j in range(row + 1, size))
+        solution[row] = value // system[row][row]
+    return sign * determinant, [sign * y for y in solution]
+
+def _dot(u, v):
+    return sum(map(operator.mul, u, v))
+
+@functools.lru_cache(maxsize=256)
+def _exact_sphere(support_bytes, dim):
+    """
+    Integer form of the support of exact_in_sphere, cached like _sphere_filter : with v_i the differences between the
+    other support points and the first one p0, scaled to integers, G = Gram(v) and b = (|v_i|^2)_i, the solution of
+    G x = b is y / denominator, and it doesn't change when all the coordinates are multiplied by the same factor
+    """
+    support = np.frombuffer(support_bytes).reshape(-1, dim)
+    scale, coordinates = _to_integers([support])
+    rows = [coordinates[i*dim:(i+1)*dim] for i in range(len(support))]
+    differences = [[x - y for x, y in zip(row, rows[0])] for row in rows[1:]]
+    denominator, solution = _integer_solve([[_dot(u, v) for v in differences] for u in differences], [_dot(v, v) for v in differences])
+    if denominator < 0:
+        denominator, solution = -denominator, [-y for y in solution]
+    return scale, rows[0], differences, denominator, solution
+
+def exact_in_sphere(support, point):
+    """
+    Exact version of in_sphere for a single point, with integer arithmetic
+
+    With w the difference between point and the first support point and a = (<v_i, w>)_i, the power of point is
+    |w|^2 - a^T G^-1 b (see _exact_sphere), whose sign is the one of |w|^2 * denominator - a^T y
+
+    Output : -1 if point is strictly inside the smallest circumsphere of support, 0 if it is on it, 1 if it is outside,
+             raises numpy.linalg.LinAlgError if the support points are affinely dependent
+
+    Complexity : O(k^3 + k^2 * d) operations on integers per new support, then O(k * d) per point
+    """
+    support = np.ascontiguousarray(support, dtype=float)
+    scale, origin, differences, denominator, solution = _exact_sphere(support.tobytes(), support.shape[1])
+    point_scale, point = _to_integers([point])
+    # Both are powers of two, the coordinates of the support are multiplied by factor when the point needs a finer scale
+    factor = max(point_scale // scale, 1)
+    point = [x * (scale * factor // point_scale) for x in point]
+    offset = [x - y * factor for x, y in zip(point, origin)]
+    products = [_dot(v, offset) * factor for v in differences]
+    return _sign(_dot(offset, offset) * denominator - _dot(products, solution))
+
+def _cholesky(matrix):
+    """
+    Cholesky factor of a small symmetric matrix given as a list of rows, computed on python floats
+
+    Output : lower triangular factor as a list of rows, None if a pivot isn't positive
+    """
+    size = len(matrix)
+    factor = [[0.0] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(i + 1):
+            value = matrix[i][j] - _dot(factor[i][:j], factor[j][:j])
+            if i == j:
+                if not value > 0:
+                    return None
+                factor[i][i] = value**0.5
+            else:
+                factor[i][j] = value / factor[j][j]
+    return factor
+
+def _cholesky_solve(factor, rhs):
+    size = len(factor)
+    solution = list(rhs)
+    for i in range(size):
+        solution[i] = (solution[i] - _dot(factor[i][:i], solution[:i])) / factor[i][i]
+    for i in reversed(range(size)):
+        solution[i] = (solution[i] - sum(factor[l][i] * solution[l] for l in range(i + 1, size))) / factor[i][i]
+    return solution
+
+def _smallest_eigenvalue_bound(gram, factor, gamma):
+    """
+    Lower bound of the smallest eigenvalue of the exact Gram matrix of k vectors, from the Gram matrix computed in
+    floating point and its Cholesky factor : it is at least det / trace^(k-1), with a relative error of gamma
+
+    Output : the bound and the trace
+    """
+    trace = sum(gram[i][i] for i in range(len(gram)))
+    determinant = 1.0
+    for i in range(len(gram)):
+        determinant *= factor[i][i]**2
+    return (1 - gamma) * determinant / trace**(len(gram) - 1) - gamma * trace, trace
+
+@functools.lru_cache(maxsize=256)
+def _sphere_bound(support_bytes, center_bytes, dim):
+    """
+    Quantities of the first filter of in_sphere, cheap enough to be computed for every new support
+
+    With o = c - p0 for the first support point p0, the power |q - c|^2 - |o|^2 of a point q differs from its exact power
+    by 2 * <q - p0, c - c*>, where c* is the exact center. The part of c - c* in the span of the differences v_i between
+    the other support points and p0 is bounded with the residuals t_i = |p0 + v_i - c|^2 - |o|^2 (since <v_i, c - c*> = -t_i / 2)
+    and a lower bound of the smallest singular value of the v_i, the other part by the distance from c to the affine hull
+    of the support. The error on the power of q is then at most gamma * (|q - c|^2 + |o|^2) + (|q - c| + |o|) * linear_bound
+
+    The smallest eigenvalue of the Gram matrix G of the v_i is bounded with _smallest_eigenvalue_bound, or with the singular values
+    of the v_i for more than 5 points. Everything else is computed on python floats, since numpy has too much overhead for such small matrices
+
+    Output : (center as a list, |o|^2, |o|, gamma, linear_bound), or None if the v_i are too close to be dependent for a bound
+    """
+    rows = np.frombuffer(support_bytes).reshape(-1, dim).tolist()
+    k = len(rows)
+    origin = rows[0]
+    differences = [list(map(operator.sub, row, origin)) for row in rows[1:]]
+    gram = [[_dot(u, v) for v in differences] for u in differences]
+    factor = _cholesky(gram)
+    if factor is None:
+        return None
+    gamma = 2 * (dim + k + 8) * UNIT_ROUNDOFF
+    # Lower bounds of the smallest eigenvalue of the exact Gram matrix and of the smallest singular value of the exact v_i
+    if k <= 5:
+        smallest, trace = _smallest_eigenvalue_bound(gram, factor, gamma)
+    else:
+        # The bound of the determinant is too pessimistic for many points, the singular values are used like in affinely_independent
+        singular_values = np.linalg.svd(np.array(differences), compute_uv=False)
+        trace = sum(gram[i][i] for i in range(k - 1))
+        smallest = max(singular_values[-1] - 8 * k**2 * UNIT_ROUNDOFF * singular_values[0], 0.0)**2
+    if smallest <= 0:
+        return None
+    singular_value = smallest**0.5 - UNIT_ROUNDOFF * trace**0.5
+    if singular_value <= 0:
+        return None
+    if center_bytes is None:
+        coefficients = _cholesky_solve(factor, [gram[i][i] / 2 for i in range(k - 1)])
+        center = [x + _dot(coefficients, column) for x, column in zip(origin, zip(*differences))]
+    else:
+        center = np.frombuffer(center_bytes).tolist()
+    offset = list(map(operator.sub, center, origin))
+    squared_offset = _dot(offset, offset)
+    residuals = 0.0
+    for row in rows[1:]:
+        squared_distance = math.dist(row, center)**2
+        residuals += (abs(squared_distance - squared_offset) + gamma * (squared_distance + squared_offset))**2
+    parallel = residuals**0.5 / (2 * singular_value)
+    orthogonal = 0.0
+    if k <= dim:
+        # Distance from c to the affine hull of the support, and the error of its computation with G
+        coefficients = _cholesky_solve(factor, [_dot(v, offset) for v in differences])
+        orthogonal = math.dist(offset, [_dot(coefficients, column) for column in zip(*differences)]) \
+                     + 4 * gamma * trace / smallest * squared_offset**0.5
+    return center, squared_offset, squared_offset**0.5, gamma, 2 * (parallel + orthogonal)
+
+@functools.lru_cache(maxsize=256)
+def _sphere_filter(support_bytes, center_bytes, dim):
+    """
+    Quantities of the second filter of in_sphere, which only depend on the support and the center, cached since the
+    MEB and alpha solvers test many points against the same sphere
+
+    Output : None if the Gram matrix of the support is singular in floating point, the support being nearly dependent
+    """
+    support = np.frombuffer(support_bytes).reshape(-1, dim)
+    k = len(support)
+    origin = support[0]
+    differences = support[1:] - origin
+    gram = differences @ differences.T
+    squared_norms = np.sum(differences**2, axis=1)
+    try:
+        inverse = np.linalg.inv(gram)
+    except np.linalg.LinAlgError:
+        return None
+    condition = np.linalg.norm(gram, 1) * np.linalg.norm(inverse, 1)
+    center = origin + (inverse @ (squared_norms / 2)) @ differences if center_bytes is None else np.frombuffer(center_bytes)
+    offset = center - origin
+    offset_norm = np.sqrt(offset @ offset)
+    norms = np.sqrt(squared_norms)
+    gamma = 2 * (dim + k + 8) * UNIT_ROUNDOFF
+
+    residuals = differences @ offset - squared_norms / 2
+    # sum(mu_i * r_i) = <q - p0, correction> = <q - c, correction> + <o, correction>, and |mu| <= mu_factor * |q - p0|
+    correction = differences.T @ (inverse @ residuals)
+    mu_factor = np.linalg.norm(inverse @ differences)
+    # Distance from o to the span of the v_i, bounded by its distance to one of their combinations
+    nu = inverse @ (differences @ offset)
+    orthogonal = np.sqrt(np.sum((offset - nu @ differences)**2)) + gamma * (offset_norm + np.abs(nu) @ norms)
+    # The bound on the error of the power of q is gamma * (|q - c|^2 + |p0 - c|^2) + |q - p0| * linear_bound,
+    # with |q - p0| <= |q - c| + |o|
+    linear_bound = 2 * gamma * mu_factor * np.linalg.norm(norms * offset_norm + squared_norms) + 2 * orthogonal \
+                   + 2 * condition * gamma * mu_factor * np.linalg.norm(residuals) + 2 * gamma * np.linalg.norm(correction)
+    # Without a meaningful bound on mu, every point is evaluated exactly
+    reliable = bool(condition * gamma < 1e-3)
+    return center, float(offset @ offset), correction, float(2 * offset @ correction), float(offset_norm), gamma, float(linear_bound), reliable
+
+def _refined_in_sphere(support, support_bytes, center_bytes, points):
+    """
+    Second filter of in_sphere, for the points the first one couldn't decide, then exact_in_sphere
+    """
+    # The support points themselves are on the sphere, where no filter can decide
+    on_support = np.any(np.all(points[:, np.newaxis, :] == support[np.newaxis, :, :], axis=2), axis=1)
+    if on_support.all():
+        return np.zeros(len(points), dtype=int)
+    quantities = _sphere_filter(support_bytes, center_bytes, support.shape[1])
+    if quantities is None:
+        # Nothing can be bounded in floating point, every point is evaluated exactly
+        signs = np.zeros(len(points), dtype=int)
+        for i in np.flatnonzero(~on_support):
+            signs[i] = exact_in_sphere(support, points[i])
+        return signs
+    center, squared_offset, correction, offset_correction, offset_norm, gamma, linear_bound, reliable = quantities
+    to_center = points - center
+    squared_distances = np.einsum("ij,ij->i", to_center, to_center)
+    power = squared_distances - squared_offset + 2 * (to_center @ correction) + offset_correction
+    bound = gamma * (squared_distances + squared_offset) + (np.sqrt(squared_distances) + offset_norm) * linear_bound
+
+    signs = np.sign(power).astype(int)
+    signs[on_support] = 0
+    uncertain = (np.abs(power) <= bound if reliable else np.ones(len(points), dtype=bool)) & ~on_support
+    for i in np.flatnonzero(uncertain):
+        signs[i] = exact_in_sphere(support, points[i])
+    return signs
+
+def in_sphere(support, points, ball=None):
+    """
+    Finds on which side of the smallest circumsphere of support each point is, exactly
+
+    The power |q - c|^2 - r^2 of every point q is first evaluated in floating point, with the center c of ball
+    (or of the circumsphere computed here), and kept when it is bigger than a bound on the error coming from the
+    rounding errors and from the distance between c and the exact center (see _sphere_bound), which only needs a
+    Cholesky factorization of the Gram matrix of the support.
+
+    The other points go through a second filter : with o = c - p0 for the first support point p0 and the residuals
+    r_i = <v_i, o> - |v_i|^2 / 2 of the other support points p0 + v_i, the exact power is
+    |q - c|^2 - |o|^2 + 2 * sum(mu_i * r_i) up to the part of o orthogonal to the v_i, where mu are the coordinates
+    of the projection of q - p0 on the v_i. The rounding errors of every term are bounded (to first order in the unit
+    roundoff, the error on mu being bounded with the condition number of the Gram matrix of the v_i), and only the
+    points whose power is within the bound are evaluated again with exact_in_sphere
+
+    Input : (k, d) array of k <= d+1 affinely independent points, (m, d) array of points and an optional ball (center, radius)
+            approximating the circumsphere
+
+    Output : array of m signs, -1 for the points strictly inside the sphere, 0 for the points on it and 1 for the others
+
+    Complexity : O(k^3 + k^2 * d) per new sphere, then O(d) per point, plus the second filter and exact_in_sphere for
+                 the points near the sphere
+    """
+    support = np.ascontiguousarray(support, dtype=float)
+    dim = support.shape[1]
+    points = np.asarray(points, dtype=float).reshape(-1, dim)
+    if len(support) == 1:
+        return np.where(np.all(points == support[0], axis=1), 0, 1)
+    support_bytes = support.tobytes()
+    center_bytes = None if ball is None else np.ascontiguousarray(ball[0], dtype=float).tobytes()
+    bound = _sphere_bound(support_bytes, center_bytes, dim)
+    if bound is None:
+        return _refined_in_sphere(support, support_bytes, center_bytes, points)
+    center, squared_offset, offset_norm, gamma, linear_bound = bound
+    to_center = points - np.array(center)
+    squared_distances = np.einsum("ij,ij->i", to_center, to_center)
+    power = squared_distances - squared_offset
+    uncertain = np.abs(power) <= gamma * (squared_distances + squared_offset) + (np.sqrt(squared_distances) + offset_norm) * linear_bound
+    signs = np.sign(power).astype(int)
+    if uncertain.any():
+        signs[uncertain] = _refined_in_sphere(support, support_bytes, center_bytes, points[uncertain])
+    return signs
+
+def in_sphere_point(support, point, ball=None):
+    """
+    Same as in_sphere for a single point, without the overhead of arrays of points
+
+    Output : -1 if point is strictly inside the smallest circumsphere of support, 0 if it is on it, 1 if it is outside
+    """
+    support = np.asarray(support, dtype=float)
+    point = np.asarray(point, dtype=float)
+    if len(support) == 1:
+        return 0 if np.array_equal(point, support[0]) else 1
+    support_bytes = support.tobytes()
+    center_bytes = None if ball is None else np.asarray(ball[0], dtype=float).tobytes()
+    bound = _sphere_bound(support_bytes, center_bytes, support.shape[1])
+    if bound is not None:
+        center, squared_offset, offset_norm, gamma, linear_bound = bound
+        squared_distance = math.dist(point.tolist(), center)**2
+        power = squared_distance - squared_offset
+        if abs(power) > gamma * (squared_distance + squared_offset) + (squared_distance**0.5 + offset_norm) * linear_bound:
+            return 1 if power > 0 else -1
+    return int(_refined_in_sphere(support, support_bytes, center_bytes, point.reshape(1, -1))[0])
+
+def circumsphere(support, ball=None):
+    """
+    Finds the smallest circumsphere of affinely independent points, accurately even when they are nearly dependent
+
+    The approximation ball, or else the center computed by _sphere_bound, is kept when the bound of _sphere_bound
+    shows that its center is at relative distance less than CIRCUMSPHERE_TOLERANCE from the exact one. Otherwise the
+    exact center of _exact_sphere is rounded to floats, since solving the system in floating point can give any sphere
+    for nearly dependent points
+
+    Input : (k, d) array of k <= d+1 affinely independent points and an optional ball (center, radius) approximating their circumsphere
+
+    Output : center, radius
+
+    Complexity : O(k^3 + k^2 * d) in floating point, plus O(k^3 + k^2 * d) operations on integers for nearly dependent points
+    """
+    support = np.ascontiguousarray(support, dtype=float)
+    dim = support.shape[1]
+    if len(support) == 1:
+        return support[0].copy(), 0.0
+    support_bytes = support.tobytes()
+    if ball is not None:
+        bound = _sphere_bound(support_bytes, np.ascontiguousarray(ball[0], dtype=float).tobytes(), dim)
+        # linear_bound is twice a bound on the distance between the center and the exact one
+        if bound is not None and bound[4] <= 2 * CIRCUMSPHERE_TOLERANCE * bound[2]:
+            return ball
+    bound = _sphere_bound(support_bytes, None, dim)
+    if bound is not None and bound[4] <= 2 * CIRCUMSPHERE_TOLERANCE * bound[2]:
+        return np.array(bound[0]), bound[2]
+    scale, origin, differences, denominator, solution = _exact_sphere(support.tobytes(), dim)
+    # The exact center is origin + sum(solution_i * v_i) / (2 * denominator), in coordinates multiplied by scale
+    offset = [sum(y * v[j] for y, v in zip(solution, differences)) for j in range(dim)]
+    divisor = 2 * denominator * scale
+    center = np.array([float(fractions.Fraction(2 * denominator * x + y, divisor)) for x, y in zip(origin, offset)])
+    return center, math.sqrt(fractions.Fraction(_dot(offset, offset), divisor**2))
+
+def exact_orientation(points):
+    """
+    Exact version of orientation, with integer arithmetic
+    """
+    points = np.asarray(points, dtype=float)
+    dim = points.shape[1]
+    _, coordinates = _to_integers([points])
+    rows = [coordinates[i*dim:(i+1)*dim] for i in range(len(points))]
+    return _determinant_sign([[x - y for x, y in zip(row, rows[0])] for row in rows[1:]])
+
+def orientation(points):
+    """
+    Finds the orientation of d+1 points in dimension d, exactly : the sign of det(p1 - p0, ..., pd - p0)
+
+    The determinant is computed in floating point by Gaussian elimination, which gives the exact determinant of a
+    matrix at relative distance O(d * unit_roundoff) of the true one. Its sign is kept when the condition number
+    shows that no such perturbation can make the matrix singular, and exact_orientation is used otherwise
+
+    Input : (d+1, d) array of points
+
+    Output : 1, -1, or 0 if the points are affinely dependent
+
+    Complexity : O(d^3) in floating point, plus exact_orientation for nearly degenerate points
+    """
+    points = np.asarray(points, dtype=float)
+    matrix = points[1:] - points[0]
+    sign, _ = np.linalg.slogdet(matrix)
+    if sign != 0 and np.linalg.cond(matrix) * 8 * (len(matrix) + 1)**2 * UNIT_ROUNDOFF < 1:
+        return int(sign)
+    return exact_orientation(points)
+
+def exact_affinely_independent(points):
+    """
+    Exact version of affinely_independent, with integer arithmetic
+    """
+    points = np.asarray(points, dtype=float)
+    dim = points.shape[1]
+    if len(points) > dim + 1:
+        return False
+    _, coordinates = _to_integers([points])
+    rows = [coordinates[i*dim:(i+1)*dim] for i in range(len(points))]
+    differences = [[x - y for x, y in zip(row, rows[0])] for row in rows[1:]]
+    # The Gram matrix of the differences is singular exactly when they are linearly dependent
+    return _determinant_sign([[_dot(u, v) for v in differences] for u in differences]) != 0
+
+def affinely_independent(points):
+    """
+    Tells whether points are affinely independent, exactly
+
+    For a few points, the Gram matrix G of the differences between the other points and the first one is computed and
+    factorized on python floats, and the points are independent when the lower bound of the smallest eigenvalue of the
+    exact G (see _smallest_eigenvalue_bound) is positive. This bound gets too pessimistic for many points, which are
+    independent when the condition number of the differences is small enough, like in orientation.
+    exact_affinely_independent decides the other cases
+
+    Input : (k, d) array of points
+
+    Output : True if the points are affinely independent (a single point is), False otherwise (always for k > d+1)
+
+    Complexity : O(k^2 * d) in floating point, plus exact_affinely_independent for nearly dependent points
+    """
+    points = np.asarray(points, dtype=float)
+    k, dim = points.shape
+    if k > dim + 1:
+        return False
+    if k == 1:
+        return True
+    if k <= 5:
+        rows = points.tolist()
+        differences = [list(map(operator.sub, row, rows[0])) for row in rows[1:]]
+        gram = [[_dot(u, v) for v in differences] for u in differences]
+        factor = _cholesky(gram)
+        if factor is not None and _smallest_eigenvalue_bound(gram, factor, 2 * (dim + k + 8) * UNIT_ROUNDOFF)[0] > 0:
+            return True
+    else:
+        singular_values = np.linalg.svd(points[1:] - points[0], compute_uv=False)
+        if singular_values[-1] > 0 and singular_values[0] / singular_values[-1] * 8 * k**2 * UNIT_ROUNDOFF < 1:
+            return True
+    return exact_affinely_independent(points)
@@ -1,276 +1,1735 @@
-#%% Importing modules
-
-import numpy as np
-from random import shuffle
-import itertools
-
-#%% Geometry helper functions
-def norm2(x):
-    return np.sum(x**2)
-
-def distance(x,y):
-    return np.sqrt(norm2(x-y))
-
-def in_ball(point, ball, epsilon = 1e-10):
-    # epsilon needs to be bigger than 1e-15 in magnitude to avoid floating point errors
-    center,radius = ball
-    return distance(center,point) < radius + epsilon
-
-
-#%% Sphere construction
-
-def sphere_from_points(points, dim=3):
-    """
-    Finds the circumcenter of a set of points
-
-    Input : points is a non-empty list of at most dim+1 ndarrays each of which encodes a point in dim 
-    
-    Output : circumcenter, radius
-
-    Complexity : O(dim^3)
-    """
-    assert(type(dim) == int)
-    assert(dim > 0)
-    assert(len(points) > 0)
-    if len(points) > dim + 1:
-        points = points[:dim+1]
-    points_as_array = np.array(points)
-
-    # See report to find a derivation of A and B
-
-    A = np.block([[2 * points_as_array @ points_as_array.T, np.ones((len(points),1))],[np.ones((1,len(points))),0]])
-
-    #      _________________________
-    #     |                     |   |
-    #     | 2 Gram(p1, ..., pn) | 1 |
-    # A = |_____________________|___|
-    #     |__________1__________|_0_|
-    #
-    # where p1, ..., pn are the elements of the list points
-
-    B = np.sum(points_as_array**2,axis=1)
-    B = np.append(B,1)
-
-    # B = [ ||p1||² , ..., ||pn||² , 1]
-
-    solution = np.linalg.solve(A,B)
-
-    # solution = [c1, ..., cn, u]
-    # circumcenter = c1 * p1 + ... + cn * pn and u = radius² - ||circumcenter||²
-
-    circumcenter = np.dot(solution[:-1], points_as_array)
-
-    # We use an absolute value here to avoid having an exception when the radius is 0
-    # (in which case the value could be around -1e-12 due to floating point arithmetic)
-
-    radius = np.sqrt(np.abs(solution[-1] + norm2(circumcenter)))
-    
-    return circumcenter, radius
-
-
-sphere_from_points.number_of_points = 0
-
-#%% MEB naive approach
-
-def naive_meb(points,dim=3):
-    """
-    Finds the minimal enclosing ball (MEB) of a non-empty set of points by iterating over all subsets of at most dim+1 elements
-
-    Input : non-empty set of points of length n and dimension d
-
-    Output : center and radius of the MEB
-
-    Complexity : O(d^3 * n^{d+1})
-    """
-    assert(len(points) > 0)
-    center = np.zeros(dim)
-    radius = np.inf
-    for size in range(1,dim + 2):
-        for subset in itertools.combinations(points,size):
-            new_sphere = sphere_from_points(list(subset), dim)
-            new_center, new_radius = new_sphere
-            if new_radius < radius and all([in_ball(point, new_sphere) for point in points]):
-                radius = new_radius
-                center = new_center
-    return center, radius
-
-#%% MEB with LP-type solver
-
-def lp_type_solver(constraint_set, violation_test, current_basis, combinatorial_dimension):
-    """
-    Implementation of Seidel's algorithm to solve LP-type problems
-
-    Input :
-            - a list of length n representing constraints
-
-            - violation_test allowing to test if basis changes after addition of a constraint
-
-            - initially empty list representing a basis of the already done constraints
-
-            - combinatorial_dimension d of the LP-type problem
-
-    Output : an arbitrary basis of the constraint set
-
-    Complexity : O(d! * n) expected calls to violation_test
-    """
-    if len(current_basis) >= combinatorial_dimension:
-        return current_basis
-    done_constraints = []
-    updated_basis = current_basis
-    for constraint in np.random.permutation(constraint_set):
-        if violation_test(updated_basis, constraint):
-            updated_basis = lp_type_solver(done_constraints, violation_test, [*current_basis, constraint], combinatorial_dimension)
-        done_constraints.append(constraint)
-    return updated_basis
-
-def lp_type_meb(points, dim=3):
-    """
-    Finds the minimal enclosing ball (MEB) of a non-empty set of points using an LP-type solver
-
-    Input : non-empty set of points of length n and dimension d
-
-    Output : center and radius of the MEB
-
-    Complexity : O(d^4 * d! * n)
-    """
-    def violation_test(boundary_points, new_point):
-            return len(boundary_points) == 0 or not in_ball(new_point, sphere_from_points(boundary_points, dim))
-    return sphere_from_points(lp_type_solver(points,violation_test,[], dim+1),dim)
-
-#%%  MEB with Welzl's algorithm
-
-def sphere_from_points_noerror(points, dim=3):
-    """
-    Variant of the previous circumcenter function which doesn't throw an error on empty pointsets for use with Welzl's recursive algorithm
-    """
-    if len(points) == 0:
-        return np.inf*np.ones(dim), 0
-    else:
-        return sphere_from_points(points, dim)
-
-def welzl_aux(points,boundary_points,dim=3):
-    """
-    Auxiliary function used for Welzl's algorithm with accumulator for known boundary points
-    """
-    if len(points)==0 or len(boundary_points)==dim+1:
-        return sphere_from_points_noerror(boundary_points,dim)
-    point = points.pop()
-    solution_candidate = welzl_aux(points[:],boundary_points[:],dim)
-    if in_ball(point,solution_candidate):
-        return solution_candidate
-    boundary_points.append(point)
-    return welzl_aux(points[:],boundary_points[:],dim)
-
-def welzl_meb(points,dim=3):
-    """
-    Finds the minimal enclosing ball (MEB) of a non-empty set of points using recursion
-
-    Input : non-empty set of points of length n and dimension d
-
-    Output : center and radius of the MEB
-
-    Complexity : O(d! * n)
-    """
-    assert(len(points) > 0)
-    shuffle(points)
-    return welzl_aux(points[:],[],dim)
-
-#%% Cech and alpha complexes
-
-def complex(points, space_dim, max_simplex_dim, filtration_limit, complex_filtration_value):
-    """
-    Finds all simplexes in a simplicial complex that have dimension less than
-     or equal to max_simplex_dim and filtration value less than filtration_limit
-
-    Input :
-        - non-empty list of points of length n
-        - the dimension d
-        - the maximum dimension for simplexes (k in the problem statement)
-        - the limit on filtration values
-        - a filtration_value calculator
-
-    Output : list of (simplex, filtration_value) couples
-
-    Complexity : O(number_of_simplexes_in_the_complex * n) calls to complex_filtration_value
-    """
-    if len(points) == 0:
-        return []
-    points_as_tuples = [tuple(point) for point in points]
-    res = []
-    current_simplex_set = {frozenset()}
-    for i in range(1, max_simplex_dim+1):
-        new_simplex_set = set()
-        for simplex in current_simplex_set:
-            for point in points_as_tuples:
-                if point not in simplex :
-                    new_simplex = set(simplex)
-                    new_simplex.add(point)
-                    new_simplex = frozenset(new_simplex)
-                    if new_simplex in new_simplex_set:
-                        continue
-                    filtration_value = complex_filtration_value(points, new_simplex, space_dim)
-                    if filtration_value < filtration_limit:
-                        new_simplex_set.add(new_simplex)
-                        res.append((new_simplex,filtration_value))
-        current_simplex_set = new_simplex_set
-    return res
-
-def cech_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, meb=lp_type_meb):
-    """
-    Finds all simplexes in the cech complex
-
-    Input :
-
-            - non-empty list of points of length n
-            - the dimension d
-            - the maximum dimension for simplexes (k in the problem statement)
-            - an optional limit on filtration values (infinity by default)
-            - an MEB problem solver (lp_type_meb by default)
-
-    Output : list of (simplex, filtration_value) couples
-
-    Complexity : O(n^{k+2}) calls to meb, so O(d^4 * d! * n^{k+3}) by default
-    """
-    def cech_filtration_value(points, simplex, space_dim):
-        _,value=meb(list([np.array(point) for point in simplex]), space_dim)
-        return value
-    return complex(points, space_dim, max_simplex_dim, filtration_limit, cech_filtration_value)
-
-def lp_type_alpha_complex_filtration_value(points, simplex, dim=3):
-    """
-    Finds filtration value of simplex in the alpha complex using an LP-type solver
-
-    Input : non-empty list of points of length n, a simplex, and the dimension d
-
-    Output : infinity if the simplex isn't in the alpha complex, its filtration value otherwise
-
-    Complexity : O(d^4 * d! * n)
-    """
-
-    def violation_test(boundary_points, new_point):
-        return len(boundary_points) == 0 or in_ball(new_point, sphere_from_points(boundary_points, dim), epsilon = -1e-10)
-    
-    outside_points = [x for x in points if tuple(x) not in simplex]
-    ball = sphere_from_points(lp_type_solver(outside_points, violation_test, [np.array(point) for point in simplex], dim+1), dim)
-    _, filtration_value = ball
-    for point in outside_points:
-        if in_ball(point, ball, epsilon=-1e-10):
-            filtration_value = np.inf
-    return filtration_value
-
-def alpha_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, alpha_complex_filtration_value=lp_type_alpha_complex_filtration_value):
-    """
-    Finds all simplexes in the alpha complex
-
-    Input :
-        - non-empty list of points of length n
-        - the dimension d
-        - the maximum dimension for simplexes (k in the problem statement)
-        - an optional limit on filtration values (infinity by default)
-        - a filtration_value calculator (lp_type_alpha_complex_filtration_value by default)
-
-    Output : list of (simplex, filtration_value) couples
-
-    Complexity : O(size_of_alpha_complex * n) calls to alpha_complex_filtration_value, so O(size_of_alpha_complex * d^4 * d! * n^2) by default
-    """
-    return complex(points, space_dim, max_simplex_dim, filtration_limit, alpha_complex_filtration_value)
\ No newline at end of file
+#%% Importing modules
+
+import os
+import numpy as np
+import itertools
+import heapq
+from collections import OrderedDict
+from .spatial_index import build_spatial_index, DynamicGridIndex
+from .predicates import in_sphere, in_sphere_point, affinely_independent, exact_affinely_independent, orientation, circumsphere, CIRCUMSPHERE_TOLERANCE
+from .backends import get_backend
+
+#%% Geometry helper functions
+def norm2(x):
+    return np.sum(x**2)
+
+def distance(x,y):
+    return np.sqrt(norm2(x-y))
+
+def in_ball(point, ball, epsilon = 1e-10, support = None):
+    # epsilon needs to be bigger than 1e-15 in magnitude to avoid floating point errors
+    # When the ball is the smallest circumsphere of the points of support, the exact predicate in_sphere decides instead,
+    # and only the sign of epsilon is used : the boundary is in the ball for epsilon >= 0 and out of it otherwise
+    if support is not None and len(support) > 0:
+        return in_sphere_point(support, point, ball) < (1 if epsilon >= 0 else 0)
+    center,radius = ball
+    return distance(center,point) < radius + epsilon
+
+def points_in_ball(points_array, center, radius, epsilon = 1e-10, support = None):
+    """
+    Vectorized version of in_ball, with the same meaning for epsilon (negative values give strict containment) and support
+
+    Input : (n, d) array of points, the center and radius of a ball, a tolerance epsilon and the optional support points of the ball
+
+    Output : boolean mask of the points in the ball
+    """
+    points_array = np.asarray(points_array, dtype=float)
+    if support is not None and len(support) > 0:
+        return in_sphere(support, points_array, (center, radius)) < (1 if epsilon >= 0 else 0)
+    return np.sqrt(np.sum((points_array - center)**2, axis=1)) < radius + epsilon
+
+def first_point_in_ball(points_array, center, radius, epsilon = 1e-10, chunk_size = 64, support = None):
+    """
+    Finds the first point in a ball, testing the points by chunks of doubling size so that it stops early on a hit
+
+    Input : (n, d) array of points, the center and radius of a ball, a tolerance epsilon (see in_ball), the size of the first chunk
+            and the optional support points of the ball (see in_ball)
+
+    Output : index of the first point in the ball, -1 if there is none
+    """
+    start = 0
+    while start < len(points_array):
+        end = min(start + chunk_size, len(points_array))
+        hits = np.flatnonzero(points_in_ball(points_array[start:end], center, radius, epsilon, support))
+        if len(hits) > 0:
+            return start + hits[0]
+        start = end
+        chunk_size *= 2
+    return -1
+
+
+#%% Sphere construction
+
+def sphere_from_points(points, dim=3):
+    """
+    Finds the circumcenter of a set of points
+
+    Input : points is a non-empty list of at most dim+1 ndarrays each of which encodes a point in dim 
+    
+    Output : circumcenter, radius
+
+    Complexity : O(dim^3)
+    """
+    assert(type(dim) == int)
+    assert(dim > 0)
+    assert(len(points) > 0)
+    if len(points) > dim + 1:
+        points = points[:dim+1]
+    points_as_array = np.array(points)
+
+    # See report to find a derivation of A and B
+
+    A = np.block([[2 * points_as_array @ points_as_array.T, np.ones((len(points),1))],[np.ones((1,len(points))),0]])
+
+    #      _________________________
+    #     |                     |   |
+    #     | 2 Gram(p1, ..., pn) | 1 |
+    # A = |_____________________|___|
+    #     |__________1__________|_0_|
+    #
+    # where p1, ..., pn are the elements of the list points
+
+    B = np.sum(points_as_array**2,axis=1)
+    B = np.append(B,1)
+
+    # B = [ ||p1||² , ..., ||pn||² , 1]
+
+    solution = np.linalg.solve(A,B)
+
+    # solution = [c1, ..., cn, u]
+    # circumcenter = c1 * p1 + ... + cn * pn and u = radius² - ||circumcenter||²
+
+    circumcenter = np.dot(solution[:-1], points_as_array)
+
+    # The radius² can be slightly negative when the radius is 0 (around -1e-12 due to floating point arithmetic),
+    # it is clamped to 0 : the decisions are taken by the exact predicates of predicates.py, not with this radius
+
+    radius = np.sqrt(max(solution[-1] + norm2(circumcenter), 0))
+    
+    return circumcenter, radius
+
+
+sphere_from_points.number_of_points = 0
+
+def circumsphere_systems_batch(points_array, simplices_idx):
+    """
+    Solves the linear systems of sphere_from_points for many simplexes of the same size at once
+
+    Input : (n, d) array of points and (m, k) array of indices into it, each row encoding a simplex of k points
+
+    Output : (m, k+1) array of solutions [c1, ..., ck, u] (rows of nan for singular systems), (m, d) array of circumcenters and array of m radii
+
+    Complexity : O(m * k^3 + m * k^2 * d), in a single call to np.linalg.solve
+    """
+    simplices_idx = np.asarray(simplices_idx, dtype=int)
+    m, k = simplices_idx.shape
+    simplices_points = np.asarray(points_array, dtype=float)[simplices_idx]
+
+    # Same block systems as in sphere_from_points, stacked in an (m, k+1, k+1) tensor
+    A = np.zeros((m, k+1, k+1))
+    A[:, :k, :k] = 2 * simplices_points @ simplices_points.transpose(0, 2, 1)
+    A[:, :k, k] = 1
+    A[:, k, :k] = 1
+    B = np.ones((m, k+1))
+    B[:, :k] = np.sum(simplices_points**2, axis=2)
+
+    try:
+        solutions = np.linalg.solve(A, B[..., np.newaxis])[..., 0]
+    except np.linalg.LinAlgError:
+        # At least one system is singular, they are solved one by one to find which ones
+        solutions = np.full((m, k+1), np.nan)
+        for i in range(m):
+            try:
+                solutions[i] = np.linalg.solve(A[i], B[i])
+            except np.linalg.LinAlgError:
+                pass
+
+    circumcenters = np.einsum("mk,mkd->md", solutions[:, :-1], simplices_points)
+    radii = np.sqrt(np.maximum(solutions[:, -1] + np.sum(circumcenters**2, axis=1), 0))
+    return solutions, circumcenters, radii
+
+def sphere_from_points_batch(points_array, simplices_idx):
+    """
+    Finds the circumcenters of many simplexes of the same size at once
+
+    Input : (n, d) array of points and (m, k) array of indices into it, each row encoding a simplex of at most d+1 points
+
+    Output : (m, d) array of circumcenters and array of m radii (nan for degenerate simplexes)
+
+    Complexity : O(m * k^3 + m * k^2 * d), in a single call to np.linalg.solve
+    """
+    _, circumcenters, radii = circumsphere_systems_batch(points_array, simplices_idx)
+    return circumcenters, radii
+
+class SupportSet:
+    """
+    Stack of at most dim+1 affinely independent points together with their circumsphere, updated incrementally
+
+    With p0 the first point and q1, ..., qk the differences between the other points and p0, the circumcenter is
+    p0 + l1 * q1 + ... + lk * qk where Gram(q1, ..., qk) l = [||q1||²/2, ..., ||qk||²/2]. The Cholesky factor of
+    the Gram matrix only gains a row when a point is pushed and loses it when the point is popped.
+    When a point is exactly independent of the others but its pivot isn't positive in floating point, the support
+    switches to exact computations (see predicates.circumsphere) until that point is popped
+    """
+
+    def __init__(self, dim=3):
+        self.dim = dim
+        self.size = 0
+        self.points = np.empty((dim+1, dim))
+        self.differences = np.empty((dim, dim))
+        self.cholesky = np.zeros((dim, dim))
+        # Solution of cholesky @ half_norms = [||q1||²/2, ..., ||qk||²/2]
+        self.half_norms = np.empty(dim)
+        # Objects pushed on the stack, used by sphere to find the common prefix with a new list of points
+        self.pushed = []
+        self.ball = None
+        # Size of the support when it switched to exact computations, None while the Cholesky factor is used
+        self.exact_size = None
+
+    def push(self, point):
+        """
+        Adds a point to the support, raises numpy.linalg.LinAlgError if it is affinely dependent on the others
+
+        Complexity : O(dim^2), plus exact_affinely_independent for nearly dependent points
+        """
+        assert(self.size <= self.dim)
+        if self.exact_size is not None:
+            if not exact_affinely_independent(np.vstack([self.points[:self.size], point])):
+                raise np.linalg.LinAlgError("affinely dependent points")
+        elif self.size > 0:
+            k = self.size - 1
+            difference = np.asarray(point, dtype=float) - self.points[0]
+            # Forward substitution giving the new row of the Cholesky factor
+            products = self.differences[:k] @ difference
+            row = np.empty(k)
+            for i in range(k):
+                row[i] = (products[i] - self.cholesky[i, :i] @ row[:i]) / self.cholesky[i, i]
+            squared_norm = difference @ difference
+            pivot = squared_norm - row @ row
+            if pivot > 0:
+                self.cholesky[k, :k] = row
+                self.cholesky[k, k] = np.sqrt(pivot)
+                self.half_norms[k] = (squared_norm / 2 - row @ self.half_norms[:k]) / self.cholesky[k, k]
+                self.differences[k] = difference
+            elif exact_affinely_independent(np.vstack([self.points[:self.size], point])):
+                self.exact_size = self.size + 1
+            else:
+                raise np.linalg.LinAlgError("affinely dependent points")
+        self.points[self.size] = point
+        self.size += 1
+        self.pushed.append(point)
+        self.ball = None
+
+    def pop(self):
+        """
+        Removes the last pushed point from the support
+
+        Complexity : O(1)
+        """
+        assert(self.size > 0)
+        self.size -= 1
+        self.pushed.pop()
+        self.ball = None
+        if self.exact_size is not None and self.size < self.exact_size:
+            self.exact_size = None
+
+    def sphere(self, points=None):
+        """
+        Circumsphere of the support, after replacing its points by the given list of points if there is one.
+        Only the points after the longest common prefix of the stack and the list are popped and pushed
+
+        Output : circumcenter, radius (a ball containing no point if the support is empty)
+
+        Complexity : O(dim^2) per point pushed, plus O(dim^2) to solve for the circumcenter
+        """
+        if points is not None:
+            points = points[:self.dim+1]
+            common = 0
+            while common < min(len(points), self.size) and (self.pushed[common] is points[common] or np.array_equal(self.pushed[common], points[common])):
+                common += 1
+            while self.size > common:
+                self.pop()
+            for point in points[common:]:
+                self.push(point)
+        if self.ball is None:
+            if self.size == 0:
+                self.ball = np.inf*np.ones(self.dim), 0
+            elif self.exact_size is not None:
+                self.ball = circumsphere(self.points[:self.size])
+            else:
+                k = self.size - 1
+                # Back substitution with the transposed Cholesky factor
+                coefficients = np.empty(k)
+                for i in reversed(range(k)):
+                    coefficients[i] = (self.half_norms[i] - self.cholesky[i+1:k, i] @ coefficients[i+1:]) / self.cholesky[i, i]
+                offset = coefficients @ self.differences[:k]
+                self.ball = self.points[0] + offset, np.sqrt(offset @ offset)
+        return self.ball
+
+#%% MEB naive approach
+
+def naive_meb(points,dim=3):
+    """
+    Finds the minimal enclosing ball (MEB) of a non-empty set of points by iterating over all subsets of at most dim+1 elements
+
+    Input : non-empty set of points of length n and dimension d
+
+    Output : center and radius of the MEB
+
+    Complexity : O(d^3 * n^{d+1})
+    """
+    assert(len(points) > 0)
+    points_as_array = np.asarray(points, dtype=float)
+    center = np.zeros(dim)
+    radius = np.inf
+    for size in range(1,dim + 2):
+        for subset in itertools.combinations(points,size):
+            new_sphere = sphere_from_points(list(subset), dim)
+            new_center, new_radius = new_sphere
+            if new_radius < radius and np.all(points_in_ball(points_as_array, new_center, new_radius)):
+                radius = new_radius
+                center = new_center
+    return center, radius
+
+#%% MEB with LP-type solver
+
+def lp_type_solver(constraint_set, violation_test, current_basis, combinatorial_dimension):
+    """
+    Implementation of Seidel's algorithm to solve LP-type problems
+
+    Input :
+            - a list of length n representing constraints
+
+            - violation_test allowing to test if basis changes after addition of a constraint
+
+            - initially empty list representing a basis of the already done constraints
+
+            - combinatorial_dimension d of the LP-type problem
+
+    Output : an arbitrary basis of the constraint set
+
+    Complexity : O(d! * n) expected calls to violation_test
+    """
+    if len(current_basis) >= combinatorial_dimension:
+        return current_basis
+    done_constraints = []
+    updated_basis = current_basis
+    for constraint in np.random.permutation(constraint_set):
+        if violation_test(updated_basis, constraint):
+            updated_basis = lp_type_solver(done_constraints, violation_test, [*current_basis, constraint], combinatorial_dimension)
+        done_constraints.append(constraint)
+    return updated_basis
+
+def lp_type_meb(points, dim=3, boundary_points=()):
+    """
+    Finds the minimal enclosing ball (MEB) of a non-empty set of points using an LP-type solver
+
+    Input : non-empty set of points of length n and dimension d, and an optional list of points known to be on the boundary of the MEB
+
+    Output : center and radius of the MEB
+
+    Complexity : O(d^3 * d! * n)
+    """
+    assert(len(points) + len(boundary_points) > 0)
+    # The bases given to violation_test mostly share a prefix with the previous one, so their circumspheres are updated incrementally
+    support_set = SupportSet(dim)
+    def violation_test(boundary_points, new_point):
+            if len(boundary_points) == 0:
+                return True
+            ball = support_set.sphere(boundary_points)
+            return not in_ball(new_point, ball, support=support_set.points[:support_set.size])
+    return sphere_from_points(lp_type_solver(points,violation_test,list(boundary_points), dim+1),dim)
+
+lp_type_meb.supports_boundary_points = True
+
+def _basis_sphere(basis, dim):
+    """
+    Circumsphere of affinely independent points found by an LP-type solver, computed exactly when sphere_from_points
+    is inaccurate or fails because they are nearly dependent (see predicates.circumsphere)
+    """
+    try:
+        ball = sphere_from_points(basis, dim)
+    except np.linalg.LinAlgError:
+        ball = None
+    return circumsphere(np.asarray(basis[:dim+1], dtype=float), ball)
+
+#%%  MEB with Welzl's algorithm
+
+def sphere_from_points_noerror(points, dim=3):
+    """
+    Variant of the previous circumcenter function which doesn't throw an error on empty pointsets for use with Welzl's recursive algorithm
+    """
+    if len(points) == 0:
+        return np.inf*np.ones(dim), 0
+    else:
+        return sphere_from_points(points, dim)
+
+def welzl_aux(points,boundary_points,dim=3):
+    """
+    Auxiliary function used for Welzl's algorithm with accumulator for known boundary points
+
+    Output : the ball and the boundary points it is the smallest circumsphere of
+    """
+    if len(points)==0 or len(boundary_points)==dim+1:
+        return sphere_from_points_noerror(boundary_points,dim), boundary_points
+    point = points.pop()
+    solution_candidate = welzl_aux(points[:],boundary_points[:],dim)
+    ball, support = solution_candidate
+    if in_ball(point,ball,support=support):
+        return solution_candidate
+    boundary_points.append(point)
+    return welzl_aux(points[:],boundary_points[:],dim)
+
+def welzl_meb(points,dim=3,boundary_points=()):
+    """
+    Finds the minimal enclosing ball (MEB) of a non-empty set of points using recursion
+
+    Input : non-empty set of points of length n and dimension d, and an optional list of points known to be on the boundary of the MEB
+
+    Output : center and radius of the MEB
+
+    Complexity : O(d! * n)
+    """
+    from random import shuffle
+    assert(len(points) + len(boundary_points) > 0)
+    shuffle(points)
+    ball, _ = welzl_aux(points[:],list(boundary_points),dim)
+    return ball
+
+welzl_meb.supports_boundary_points = True
+
+#%% MEB with the move-to-front heuristic
+
+def move_to_front_meb(points, dim=3, boundary_points=()):
+    """
+    Finds the minimal enclosing ball (MEB) of a non-empty set of points using Welzl's algorithm with the move-to-front heuristic
+
+    The points are copied once in an (n, d) array and only a permutation of their indices is reordered, so the input
+    is never modified. The support points are stored in a SupportSet and the only recursion is on the size of the
+    support, so its depth is at most d+1 whatever the number of points
+
+    Input : non-empty set of points of length n and dimension d, and an optional list of points known to be on the boundary of the MEB
+
+    Output : center and radius of the MEB
+
+    Complexity : O(d! * n) expected
+    """
+    assert(len(points) + len(boundary_points) > 0)
+    if len(points) == 0:
+        return sphere_from_points(list(boundary_points), dim)
+    points_as_array = np.array(points, dtype=float)
+    order = np.random.permutation(len(points_as_array))
+    support = SupportSet(dim)
+    for point in boundary_points:
+        support.push(point)
+
+    def move_to_front(end):
+        # MEB of the points order[:end] with the points of the support on its boundary, and the points it is the
+        # smallest circumsphere of, for the exact ball tests
+        ball = support.sphere()
+        ball_support = support.points[:support.size].copy()
+        if support.size == dim + 1:
+            return ball, ball_support
+        start = 0
+        chunk_size = 64
+        while start < end:
+            # Points are tested by chunks of doubling size to find the first one outside of the current ball
+            chunk = order[start:min(end, start + chunk_size)]
+            outside = np.flatnonzero(~points_in_ball(points_as_array[chunk], *ball, support=ball_support))
+            if len(outside) == 0:
+                start += len(chunk)
+                chunk_size *= 2
+                continue
+            start += outside[0]
+            index = order[start]
+            support.push(points_as_array[index])
+            ball, ball_support = move_to_front(start)
+            support.pop()
+            order[1:start+1] = order[:start]
+            order[0] = index
+            start += 1
+            chunk_size = 64
+        return ball, ball_support
+
+    ball, _ = move_to_front(len(points_as_array))
+    return ball
+
+move_to_front_meb.supports_boundary_points = True
+
+#%% MEB with the selected backend
+
+def backend_meb(points, dim=3, boundary_points=()):
+    """
+    Finds the minimal enclosing ball (MEB) of a non-empty set of points with the MEB solver of the selected backend
+    (see backends.get_backend) : the compiled kernels when numba is installed, lp_type_meb otherwise
+
+    Input : non-empty set of points of length n and dimension d, and an optional list of points known to be on the boundary of the MEB
+
+    Output : center and radius of the MEB
+    """
+    return get_backend().meb(points, dim, boundary_points)
+
+backend_meb.supports_boundary_points = True
+
+#%% Cech and alpha complexes
+
+def _evaluate_level(points, space_dim, filtration_limit, complex_filtration_value, candidates, batch, simplex_list):
+    """
+    Evaluates the candidate simplexes of one level, appends the ones in the complex to simplex_list and generates them with their value
+    """
+    if batch:
+        candidates = list(candidates)
+        if len(candidates) == 0:
+            return
+        values = complex_filtration_value(points, np.array(candidates, dtype=int), space_dim).tolist()
+        evaluated = zip(candidates, values)
+    else:
+        evaluated = ((simplex, complex_filtration_value(points, simplex, space_dim)) for simplex in candidates)
+    for simplex, filtration_value in evaluated:
+        if filtration_value < filtration_limit:
+            simplex_list.append(simplex)
+            yield simplex, filtration_value
+
+def _edge_candidates(points, vertices, is_vertex, neighbor_radius, spatial_index):
+    """
+    Generates the edges (i, j) with i in vertices, j > i a vertex of the complex and |pi - pj| <= neighbor_radius
+    (or neighbor_radius[i] when it is an array)
+    """
+    radii = np.broadcast_to(neighbor_radius, len(points))
+    for vertex in vertices:
+        if radii[vertex] < np.inf:
+            candidates = spatial_index.query_radius(points[vertex], radii[vertex])
+            candidates = candidates[candidates > vertex]
+        else:
+            candidates = np.arange(vertex+1, len(points))
+        candidates = candidates[is_vertex[candidates]]
+        for other_vertex in candidates.tolist():
+            yield (vertex, other_vertex)
+
+def _coface_candidates(simplex_list, neighbors, neighbor_sets):
+    """
+    Generates the cofaces with one more vertex of the simplexes of simplex_list whose edges are all in the 1-skeleton
+    """
+    for simplex in simplex_list:
+        # A simplex is only extended with common neighbors of its vertices that are bigger than its last one,
+        # so that every simplex is generated exactly once, from the face obtained by removing its biggest vertex
+        candidates = neighbors[simplex[-1]]
+        for vertex in simplex[:-1]:
+            candidates = [candidate for candidate in candidates if candidate in neighbor_sets[vertex]]
+        for vertex in candidates:
+            yield (*simplex, vertex)
+
+def _neighbor_lists(n, edges):
+    # neighbors[i] is the sorted list of the vertices j > i such that (i, j) is in edges
+    neighbors = [[] for _ in range(n)]
+    for vertex, other_vertex in sorted(edges):
+        neighbors[vertex].append(other_vertex)
+    return neighbors, [set(vertex_neighbors) for vertex_neighbors in neighbors]
+
+def complex(points, space_dim, max_simplex_dim, filtration_limit, complex_filtration_value, neighbor_radius=np.inf, spatial_index=None, batch=False, workers=None):
+    """
+    Finds all simplexes in a simplicial complex that have dimension less than
+     or equal to max_simplex_dim and filtration value less than filtration_limit
+
+    The filtration values are assumed to be monotone (a face never has a bigger value than its cofaces),
+    so a simplex is only considered if all of its edges are in the complex
+
+    Input :
+        - non-empty list (or (n, d) array) of points of length n
+        - the dimension d
+        - the maximum dimension for simplexes (k in the problem statement)
+        - the limit on filtration values
+        - a filtration_value calculator, called with the (n, d) array of points, a simplex and the dimension d
+        - an optional bound on the length of the edges of the complex (infinity by default), or an array of n bounds
+          where the i-th one applies to the edges (i, j) with j > i
+        - an optional spatial index over the points, used to find the neighbors of each vertex (built when needed by default)
+        - whether complex_filtration_value evaluates a whole level at once (False by default) : it is then called
+          with an (m, k) array of simplexes of the same size instead of a single simplex, and returns an array of m values
+        - an optional number of worker processes (the complex is built in the current process by default), in which
+          case complex_filtration_value and spatial_index must be picklable and batch must be False. The filtration values
+          then match the ones built in a single process up to rounding errors (see _parallel_complex)
+
+    Output : list of (simplex, filtration_value) couples, where each simplex is a sorted tuple of indices into points,
+             sorted by size then lexicographically
+
+    Complexity : n radius queries and O(number_of_simplexes_in_the_complex * max_degree) calls to complex_filtration_value,
+                 where max_degree is the maximum number of neighbors of a vertex in the 1-skeleton
+    """
+    return list(iter_complex(points, space_dim, max_simplex_dim, filtration_limit, complex_filtration_value, neighbor_radius, spatial_index, batch, workers))
+
+def iter_complex(points, space_dim, max_simplex_dim, filtration_limit, complex_filtration_value, neighbor_radius=np.inf, spatial_index=None, batch=False, workers=None):
+    """
+    Generates the (simplex, filtration_value) couples of complex in the same order, as soon as they are evaluated
+
+    Only the simplexes of the level being extended and the 1-skeleton are kept : a simplex is only extended with
+    vertices bigger than its last one, so no set of the simplexes already generated is needed. With workers, the
+    levels are still computed in parallel and then generated
+
+    Input : same as complex
+
+    Output : generator of (simplex, filtration_value) couples
+
+    Complexity : same as complex, with a memory proportional to the number of simplexes of the biggest level
+                 instead of the size of the complex
+    """
+    if len(points) == 0 or max_simplex_dim < 1:
+        return
+    points_as_array = np.asarray(points, dtype=float)
+    if workers is not None and workers > 1:
+        assert(not batch)
+        yield from _parallel_complex(points_as_array, space_dim, max_simplex_dim, filtration_limit, complex_filtration_value, neighbor_radius, spatial_index, workers)
+        return
+    n = len(points_as_array)
+
+    vertices = []
+    for (vertex,), filtration_value in _evaluate_level(points_as_array, space_dim, filtration_limit, complex_filtration_value, ((vertex,) for vertex in range(n)), batch, []):
+        vertices.append(vertex)
+        yield (vertex,), filtration_value
+    if max_simplex_dim < 2:
+        return
+
+    is_vertex = np.zeros(n, dtype=bool)
+    is_vertex[vertices] = True
+    if np.min(neighbor_radius) < np.inf and spatial_index is None:
+        spatial_index = build_spatial_index(points_as_array)
+    candidates = _edge_candidates(points_as_array, vertices, is_vertex, neighbor_radius, spatial_index)
+    current_simplex_list = []
+    yield from _evaluate_level(points_as_array, space_dim, filtration_limit, complex_filtration_value, candidates, batch, current_simplex_list)
+    neighbors, neighbor_sets = _neighbor_lists(n, current_simplex_list)
+
+    for i in range(3, max_simplex_dim+1):
+        candidates = _coface_candidates(current_simplex_list, neighbors, neighbor_sets)
+        current_simplex_list = []
+        yield from _evaluate_level(points_as_array, space_dim, filtration_limit, complex_filtration_value, candidates, batch, current_simplex_list)
+        if len(current_simplex_list) == 0:
+            return
+
+#%% Parallel construction
+
+# State of a worker process, set once by _init_worker
+_worker_state = {}
+
+def _init_worker(shared_memory_name, shape, space_dim, filtration_limit, complex_filtration_value, neighbor_radius, spatial_index):
+    from multiprocessing import shared_memory
+    shared = shared_memory.SharedMemory(name=shared_memory_name)
+    _worker_state.update(shared_memory=shared, points=np.ndarray(shape, dtype=float, buffer=shared.buf), space_dim=space_dim,
+                         filtration_limit=filtration_limit, complex_filtration_value=complex_filtration_value,
+                         neighbor_radius=neighbor_radius, spatial_index=spatial_index, neighbors=None)
+
+def _worker_level(candidates, res):
+    state = _worker_state
+    simplex_list = []
+    res.extend(_evaluate_level(state["points"], state["space_dim"], state["filtration_limit"], state["complex_filtration_value"], candidates, False, simplex_list))
+    return simplex_list
+
+def _worker_vertices(vertices):
+    res = []
+    _worker_level(((vertex,) for vertex in vertices), res)
+    return res
+
+def _worker_edges(vertices, is_vertex):
+    state = _worker_state
+    if np.min(state["neighbor_radius"]) < np.inf and state["spatial_index"] is None:
+        state["spatial_index"] = build_spatial_index(state["points"])
+    res = []
+    _worker_level(_edge_candidates(state["points"], vertices, is_vertex, state["neighbor_radius"], state["spatial_index"]), res)
+    return res
+
+def _worker_neighbors(shared_memory_name, n, number_of_edges):
+    # The 1-skeleton is read from shared memory by the first shard of every worker, and kept for the next ones
+    state = _worker_state
+    if state["neighbors"] is None:
+        from multiprocessing import shared_memory
+        shared = shared_memory.SharedMemory(name=shared_memory_name)
+        csr = np.ndarray(n + 1 + number_of_edges, dtype=np.int64, buffer=shared.buf).tolist()
+        shared.close()
+        indptr, indices = csr[:n+1], csr[n+1:]
+        neighbors = [indices[indptr[vertex]:indptr[vertex+1]] for vertex in range(n)]
+        state["neighbors"] = neighbors, [set(vertex_neighbors) for vertex_neighbors in neighbors]
+    return state["neighbors"]
+
+def _worker_cofaces(edges, neighbors_shared_memory, max_simplex_dim):
+    neighbors, neighbor_sets = _worker_neighbors(*neighbors_shared_memory)
+    res = []
+    current_simplex_list = edges
+    for i in range(3, max_simplex_dim+1):
+        current_simplex_list = _worker_level(_coface_candidates(current_simplex_list, neighbors, neighbor_sets), res)
+    return res
+
+def _parallel_complex(points, space_dim, max_simplex_dim, filtration_limit, complex_filtration_value, neighbor_radius, spatial_index, workers):
+    """
+    Same as complex, with every simplex owned by its smallest vertex and the vertices split into shards evaluated by a pool of processes.
+    The points are shared with the workers through shared memory and the results of the shards are sorted as in complex.
+    The spatial index is sent to every worker when there is one, and built by the workers which need it otherwise
+
+    The simplexes are the same as in complex, but the filtration values only match up to rounding errors : every worker has
+    its own copy of complex_filtration_value, so the state it reuses from simplex to simplex (like the balls of the faces
+    of CechFiltrationValue) isn't the same as in a single process
+
+    Three rounds are needed : the vertices, then the edges (which need to know the vertices), then all the other simplexes
+    (which need the whole 1-skeleton, shared once with the workers as a CSR array of neighbors)
+    """
+    # Imported here since they are slow to import and only needed with workers
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    n = len(points)
+    number_of_shards = 4 * workers
+    def shards(vertices):
+        # Vertices are dealt round-robin, since the smallest vertices own more simplexes
+        return [vertices[i::number_of_shards] for i in range(min(number_of_shards, len(vertices)))]
+    def merge(results):
+        return sorted(itertools.chain.from_iterable(results), key=lambda couple: (len(couple[0]), couple[0]))
+
+    shared = shared_memory.SharedMemory(create=True, size=max(points.nbytes, 1))
+    shared_neighbors = None
+    try:
+        np.ndarray(points.shape, dtype=float, buffer=shared.buf)[:] = points
+        initargs = (shared.name, points.shape, space_dim, filtration_limit, complex_filtration_value, neighbor_radius, spatial_index)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+            vertex_res = merge(executor.map(_worker_vertices, shards(list(range(n)))))
+            if max_simplex_dim < 2:
+                return vertex_res
+            vertices = [vertex for (vertex,), _ in vertex_res]
+            is_vertex = np.zeros(n, dtype=bool)
+            is_vertex[vertices] = True
+            vertex_shards = shards(vertices)
+            edge_res = merge(executor.map(_worker_edges, vertex_shards, [is_vertex] * len(vertex_shards)))
+            if max_simplex_dim < 3:
+                return vertex_res + edge_res
+            # edge_res is sorted, so the second vertices of the edges are the neighbor lists one after the other
+            edges = np.array([edge for edge, _ in edge_res], dtype=np.int64).reshape(-1, 2)
+            csr = np.concatenate([[0], np.cumsum(np.bincount(edges[:, 0], minlength=n)), edges[:, 1]]).astype(np.int64)
+            shared_neighbors = shared_memory.SharedMemory(create=True, size=csr.nbytes)
+            np.ndarray(csr.shape, dtype=np.int64, buffer=shared_neighbors.buf)[:] = csr
+            neighbors_shared_memory = (shared_neighbors.name, n, len(edges))
+            shard_of_vertex = {vertex: i for i, shard in enumerate(vertex_shards) for vertex in shard}
+            edge_shards = [[] for _ in vertex_shards]
+            for edge, _ in edge_res:
+                edge_shards[shard_of_vertex[edge[0]]].append(edge)
+            coface_res = merge(executor.map(_worker_cofaces, edge_shards, [neighbors_shared_memory] * len(edge_shards), [max_simplex_dim] * len(edge_shards)))
+    finally:
+        for block in [shared, shared_neighbors]:
+            if block is not None:
+                block.close()
+                block.unlink()
+    return vertex_res + edge_res + coface_res
+
+#%% Filtration values
+
+# Relative tolerance of the tests of CechFiltrationValue against the balls of the faces
+FACE_BALL_TOLERANCE = 1e-10
+
+class CechFiltrationValue:
+    """
+    Filtration value calculator of the cech complex for complex
+
+    The MEB of every simplex is computed from the one of the face obtained by removing its biggest vertex :
+    if the new vertex is in the MEB of the face, it is also the MEB of the simplex, otherwise the new vertex is
+    on the boundary of the MEB of the simplex, and the MEB solver starts with it as boundary point when it
+    supports it (meb.supports_boundary_points). The support of the MEB of the face isn't known, so the exact predicates
+    can't place the new vertex : when it is too close to the sphere for floating point, at distance at most
+    FACE_BALL_TOLERANCE * (r + m) where m is the largest absolute coordinate, the MEB of the simplex is computed from
+    scratch by the solver, whose ball tests are exact
+    """
+
+    def __init__(self, meb, filtration_limit):
+        self.meb = meb
+        self.filtration_limit = filtration_limit
+        self.warm_start = getattr(meb, "supports_boundary_points", False)
+        # balls[size] maps the simplexes of that size which are in the complex to their MEB,
+        # only the sizes of the current and previous levels are kept
+        self.balls = {}
+
+    def __call__(self, points, simplex, space_dim):
+        face = simplex[:-1]
+        new_point = points[simplex[-1]]
+        face_ball = self.balls.get(len(face), {}).get(face)
+        if face_ball is not None:
+            center, radius = face_ball
+            margin = FACE_BALL_TOLERANCE * (radius + max(np.max(np.abs(center)), np.max(np.abs(new_point))))
+            if abs(distance(center, new_point) - radius) <= margin:
+                face_ball = None
+        if face_ball is not None and in_ball(new_point, face_ball, epsilon=0):
+            ball = face_ball
+        elif face_ball is not None and self.warm_start:
+            ball = self.meb(list(points[list(face)]), space_dim, boundary_points=[new_point])
+        else:
+            ball = self.meb(list(points[list(simplex)]), space_dim)
+        _,value = ball
+        if value < self.filtration_limit:
+            self.balls.setdefault(len(simplex), {})[simplex] = ball
+            self.balls.pop(len(simplex) - 2, None)
+        return value
+
+def cech_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, meb=backend_meb, batch=False, workers=None):
+    """
+    Finds all simplexes in the cech complex
+
+    Input :
+
+            - non-empty list of points of length n
+            - the dimension d
+            - the maximum dimension for simplexes (k in the problem statement)
+            - an optional limit on filtration values (infinity by default)
+            - an MEB problem solver (backend_meb by default, which is lp_type_meb without numba)
+            - whether to evaluate each level of the complex as a single batch (False by default)
+            - an optional number of worker processes (see complex), which requires meb to be picklable
+
+    The MEB of every simplex is computed from the one of its faces (see CechFiltrationValue).
+
+    In batch mode, the circumspheres of all the simplexes of a level are computed at once : when the circumcenter
+    of a simplex is in its convex hull, its circumsphere is its MEB, otherwise the support of its MEB is a proper
+    face, so its filtration value is the biggest value of its facets. The MEB solver is only used for the simplexes
+    whose circumsphere couldn't be computed reliably
+
+    Output : list of (simplex, filtration_value) couples, where each simplex is a sorted tuple of indices into points
+
+    Complexity : O(n^{k+2}) calls to meb, so O(d^3 * d! * n^{k+3}) by default
+    """
+    return list(iter_cech_complex(points, space_dim, max_simplex_dim, filtration_limit, meb, batch, workers))
+
+def iter_cech_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, meb=backend_meb, batch=False, workers=None):
+    """
+    Generates the simplexes of the cech complex with their filtration value as soon as they are found (see iter_complex)
+
+    Input : same as cech_complex
+
+    Output : generator of (simplex, filtration_value) couples, in the order of cech_complex
+    """
+    if len(points) == 0:
+        return
+    points = np.asarray(points, dtype=float)
+
+    # Filtration values of the simplexes of the previous level which are in the complex
+    face_values = {}
+    def cech_batch_filtration_value(points, simplices, space_dim):
+        m, size = simplices.shape
+        simplex_list = [tuple(simplex) for simplex in simplices.tolist()]
+        # The biggest value of the facets is a lower bound, and the value itself when the MEB is supported by a proper face
+        values = np.zeros(m)
+        if size > 1:
+            for i, simplex in enumerate(simplex_list):
+                values[i] = max(face_values.get(simplex[:j] + simplex[j+1:], np.inf) for j in range(size))
+        if 1 < size <= space_dim + 1:
+            solutions, circumcenters, radii = circumsphere_systems_batch(points, simplices)
+            # The circumsphere is only trusted if it really goes through the vertices of the simplex
+            distances = np.sqrt(np.sum((points[simplices] - circumcenters[:, np.newaxis, :])**2, axis=2))
+            reliable = np.all(np.abs(distances - radii[:, np.newaxis]) <= 1e-8 * (1 + radii[:, np.newaxis]), axis=1)
+            is_meb = reliable & np.all(solutions[:, :-1] >= 0, axis=1)
+            values[is_meb] = radii[is_meb]
+            for i in np.flatnonzero(~reliable & (values < np.inf)):
+                _,values[i] = meb(list(points[simplices[i]]), space_dim)
+        face_values.clear()
+        face_values.update((simplex, value) for simplex, value in zip(simplex_list, values.tolist()) if value < filtration_limit)
+        return values
+
+    # Two points only have a filtration value below the limit if they are less than twice the limit apart
+    filtration_value = cech_batch_filtration_value if batch else CechFiltrationValue(meb, filtration_limit)
+    yield from iter_complex(points, space_dim, max_simplex_dim, filtration_limit, filtration_value, 2 * filtration_limit, build_spatial_index(points), batch, workers)
+
+#%% Rips complex
+
+def _rips_neighbors(points, filtration_limit, spatial_index):
+    """
+    Finds the 1-skeleton of the Rips complex : for every vertex i, the sorted array of the vertices j > i such that
+    |pi - pj| / 2 < filtration_limit, and the array of these half distances
+    """
+    n = len(points)
+    neighbors, half_distances = [], []
+    for vertex in range(n):
+        if filtration_limit < np.inf:
+            candidates = spatial_index.query_radius(points[vertex], 2 * filtration_limit)
+            candidates = candidates[candidates > vertex]
+        else:
+            candidates = np.arange(vertex+1, n)
+        values = np.sqrt(np.sum((points[candidates] - points[vertex])**2, axis=1)) / 2
+        kept = values < filtration_limit
+        neighbors.append(candidates[kept])
+        half_distances.append(values[kept])
+    return neighbors, half_distances
+
+def _in_diametral_ball(points, simplex):
+    """
+    Checks whether the ball having the longest edge of simplex as diameter contains all of its vertices, in which case
+    it is the MEB of simplex
+    """
+    simplex_points = points[list(simplex)]
+    distances = np.sqrt(np.sum((simplex_points[:, np.newaxis] - simplex_points[np.newaxis])**2, axis=2))
+    i, j = np.unravel_index(np.argmax(distances), distances.shape)
+    return bool(np.all(points_in_ball(simplex_points, (simplex_points[i] + simplex_points[j]) / 2, distances[i, j] / 2)))
+
+def rips_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, exact_cech=False, meb=backend_meb):
+    """
+    Finds all simplexes in the Rips complex, where the filtration value of a simplex is half the length of its longest
+    edge, so that it is on the same scale as the cech complex
+
+    A set of points of diameter D has an MEB of radius between D/2 and D * sqrt(m / (2 * (m+1))) in dimension m
+    (Jung's theorem), so the cech value of a simplex of size k is between its Rips value r and r * sqrt(2 * m / (m+1))
+    with m = min(d, k-1) : the cech complex of radius r is contained in the Rips complex of radius r, which is contained
+    in the cech complex of radius sqrt(2) * r. The Rips complex is thus a cheap approximation of the cech complex,
+    computed without any geometric solve
+
+    With exact_cech, the cech complex is computed from the Rips one instead : vertices and edges have the same
+    value in both, a simplex whose Rips value or face value is already at least the limit is left out, and a simplex
+    whose longest edge is the diameter of a ball containing it has its Rips value as cech value. Only the remaining
+    simplexes, whose cech value is strictly between the two bounds, are solved with meb
+
+    Input :
+        - non-empty list of points of length n
+        - the dimension d
+        - the maximum dimension for simplexes (k in the problem statement)
+        - an optional limit on filtration values (infinity by default)
+        - whether to return the cech complex instead (False by default)
+        - the MEB problem solver used with exact_cech (backend_meb by default)
+
+    Output : list of (simplex, filtration_value) couples, where each simplex is a sorted tuple of indices into points,
+             sorted by size then lexicographically
+
+    Complexity : n radius queries, then O(max_degree) vectorized operations per simplex in the complex, where max_degree
+                 is the maximum number of neighbors of a vertex in the 1-skeleton
+    """
+    return list(iter_rips_complex(points, space_dim, max_simplex_dim, filtration_limit, exact_cech, meb))
+
+def iter_rips_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, exact_cech=False, meb=backend_meb):
+    """
+    Generates the simplexes of the Rips complex with their filtration value as soon as they are found (see iter_complex)
+
+    The cliques of the 1-skeleton are enumerated level by level as in Bron-Kerbosch : every simplex of the current
+    level is kept with its candidates, the common neighbors of its vertices bigger than its last one, and with the
+    Rips values of the cofaces they give. The candidates of a coface are the candidates of its face after its new
+    vertex which are neighbors of it, and the value of each of its cofaces is the biggest of its own value, the value
+    of the corresponding coface of the face and the distance from the new vertex to the candidate, halved
+
+    Input : same as rips_complex
+
+    Output : generator of (simplex, filtration_value) couples, in the order of rips_complex
+    """
+    if len(points) == 0 or max_simplex_dim < 1 or not filtration_limit > 0:
+        return
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    spatial_index = build_spatial_index(points) if filtration_limit < np.inf else None
+    neighbors, half_distances = _rips_neighbors(points, filtration_limit, spatial_index)
+
+    level = []
+    for vertex in range(n):
+        yield (vertex,), 0.0
+        level.append(((vertex,), 0.0, neighbors[vertex], half_distances[vertex]))
+    for size in range(2, max_simplex_dim+1):
+        next_level = []
+        for simplex, value, candidates, coface_values in level:
+            for k, (vertex, rips_value) in enumerate(zip(candidates.tolist(), coface_values.tolist())):
+                coface = (*simplex, vertex)
+                coface_value = rips_value
+                if exact_cech and size > 2:
+                    # The cech value of the coface is at least its Rips value and the cech value of the face
+                    if max(rips_value, value) >= filtration_limit:
+                        continue
+                    if not _in_diametral_ball(points, coface):
+                        _, coface_value = meb(list(points[list(coface)]), space_dim)
+                        if coface_value >= filtration_limit:
+                            continue
+                yield coface, coface_value
+                if size < max_simplex_dim:
+                    common, later_indices, neighbor_indices = np.intersect1d(candidates[k+1:], neighbors[vertex], assume_unique=True, return_indices=True)
+                    values = np.maximum(np.maximum(coface_values[k+1:][later_indices], half_distances[vertex][neighbor_indices]), rips_value)
+                    next_level.append((coface, coface_value, common, values))
+        level = next_level
+        if len(level) == 0:
+            return
+
+#%% Sparse cech complex
+
+def greedy_permutation(points, spatial_index=None):
+    """
+    Orders the points by farthest point sampling : every point is the farthest one from the points before it
+
+    The distance from every point to the points already chosen is only updated for the points returned by a radius
+    query around the new point, and the farthest point is kept in a heap
+
+    Input : non-empty list (or (n, d) array) of points of length n and an optional spatial index over them
+
+    Output : (order, insertion_radii) arrays, where order is the permutation of the indices of the points, starting with 0,
+             and insertion_radii[i] the distance from points[order[i]] to the points before it (infinity for the first one).
+             For any t, the points with insertion radius at least t are t-separated and every point is at distance
+             at most t from one of them
+
+    Complexity : O(n log(n)) radius queries, returning O(n log(n)) points in total for points of bounded spread
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if spatial_index is None:
+        spatial_index = build_spatial_index(points)
+    order = np.zeros(n, dtype=int)
+    insertion_radii = np.full(n, np.inf)
+    distances = np.sqrt(np.sum((points - points[0])**2, axis=1))
+    chosen = np.zeros(n, dtype=bool)
+    chosen[0] = True
+    heap = [(-distance, i) for i, distance in enumerate(distances.tolist()) if i != 0]
+    heapq.heapify(heap)
+    for k in range(1, n):
+        # Entries whose distance decreased since they were pushed are outdated
+        while True:
+            distance, i = heapq.heappop(heap)
+            if not chosen[i] and -distance == distances[i]:
+                break
+        order[k] = i
+        insertion_radii[k] = distances[i]
+        chosen[i] = True
+        # Only the points closer to the new point than to the previous ones get a smaller distance,
+        # and they are all at distance at most insertion_radii[k] from it
+        nearby = spatial_index.query_radius(points[i], distances[i])
+        new_distances = np.sqrt(np.sum((points[nearby] - points[i])**2, axis=1))
+        closer = new_distances < distances[nearby]
+        for j, distance in zip(nearby[closer].tolist(), new_distances[closer].tolist()):
+            distances[j] = distance
+            if not chosen[j]:
+                heapq.heappush(heap, (-distance, j))
+    return order, insertion_radii
+
+# Relative accuracy of the filtration values found by regula falsi in SparseCechFiltrationValue
+SPARSE_CECH_TOLERANCE = 1e-10
+
+class SparseCechFiltrationValue(CechFiltrationValue):
+    """
+    Filtration value calculator of the sparse cech complex for complex, with the weights of Sheehy's sparse filtrations
+
+    A point p of insertion radius lambda has the weight w_p(alpha) = min(max(alpha - lambda / epsilon, 0), epsilon * alpha)
+    at scale alpha, and the ball of radius sqrt(alpha^2 - w_p(alpha)^2) around it, which stops growing like alpha once
+    alpha is bigger than lambda / epsilon. The point is deleted after the scale lambda / (epsilon * (1 - epsilon)).
+    The value of a simplex is the smallest scale at which the balls of its vertices intersect, if its vertices are
+    still there, and infinity otherwise. It is at least the MEB radius r of the simplex, and at most r / sqrt(1 - epsilon^2).
+    The balls intersect at alpha if and only if the MEB of the points (p, w_p(alpha)) and (p, -w_p(alpha)) of dimension
+    d+1 has a radius of at most alpha, its center being in the hyperplane of the points by symmetry, so the value is
+    the root of the excess of this radius over alpha, found with the MEB solver by regula falsi. The points are sorted
+    by increasing insertion radius
+    """
+
+    def __init__(self, meb, filtration_limit, insertion_radii, epsilon):
+        super().__init__(meb, filtration_limit)
+        self.epsilon = epsilon
+        self.caps = insertion_radii / epsilon
+        self.deletion_times = insertion_radii / (epsilon * (1 - epsilon))
+        # values[size] maps the simplexes of that size which are in the complex to their value,
+        # only the sizes of the current and previous levels are kept
+        self.values = {}
+
+    def excess(self, points, simplex, space_dim, alpha):
+        # Radius of the MEB of the lifted points minus alpha, which is at most 0 when the balls intersect at alpha
+        weights = np.minimum(np.maximum(alpha - self.caps[list(simplex)], 0), self.epsilon * alpha)
+        lifted = [np.append(points[vertex], weight) for vertex, weight in zip(simplex, weights.tolist())]
+        lifted += [np.append(points[vertex], -weight) for vertex, weight in zip(simplex, weights.tolist()) if weight > 0]
+        _,radius = self.meb(lifted, space_dim + 1)
+        return radius - alpha
+
+    def __call__(self, points, simplex, space_dim):
+        value = super().__call__(points, simplex, space_dim)
+        deletion_time = np.min(self.deletion_times[list(simplex)])
+        if len(simplex) > 1 and value > np.min(self.caps[list(simplex)]):
+            # The value of a face is at most the one of the simplex, which keeps the result a filtration despite the rounding
+            lower = max([value] + [self.values.get(len(simplex) - 1, {}).get(simplex[:j] + simplex[j+1:], np.inf) for j in range(len(simplex))])
+            upper = min(value / np.sqrt(1 - self.epsilon**2), deletion_time)
+            if lower > upper:
+                return np.inf
+            lower_excess = self.excess(points, simplex, space_dim, lower)
+            if lower_excess <= 0:
+                upper, upper_excess = lower, lower_excess
+            else:
+                upper_excess = self.excess(points, simplex, space_dim, upper)
+                if upper_excess > 0:
+                    return np.inf
+            # Illinois variant of the regula falsi, keeping lower outside of the balls intersection and upper inside
+            side = 0
+            while upper - lower > SPARSE_CECH_TOLERANCE * upper:
+                middle = (lower * upper_excess - upper * lower_excess) / (upper_excess - lower_excess)
+                if not lower < middle < upper:
+                    middle = (lower + upper) / 2
+                middle_excess = self.excess(points, simplex, space_dim, middle)
+                if middle_excess <= 0:
+                    upper, upper_excess = middle, middle_excess
+                    lower_excess = lower_excess / 2 if side == 1 else lower_excess
+                    side = 1
+                else:
+                    lower, lower_excess = middle, middle_excess
+                    upper_excess = upper_excess / 2 if side == -1 else upper_excess
+                    side = -1
+            value = upper
+        if value > deletion_time or value >= self.filtration_limit:
+            return np.inf
+        self.values.setdefault(len(simplex), {})[simplex] = value
+        self.values.pop(len(simplex) - 2, None)
+        return value
+
+def sparse_cech_complex(points, space_dim, max_simplex_dim, epsilon, filtration_limit=np.inf, meb=backend_meb):
+    """
+    Finds the simplexes of the sparse cech filtration of Sheehy, a (1 / (1 - epsilon))-approximation of the cech complex
+    of linear size
+
+    The points are ordered by farthest point sampling (see greedy_permutation), and their insertion radii give the
+    weights and deletion times of SparseCechFiltrationValue. At every scale alpha, the points which aren't deleted are
+    an (epsilon * (1 - epsilon) * alpha)-net of the points, and the union of their weighted balls contains the union of
+    the balls of radius (1 - epsilon) * alpha around all the points, while being contained in the one of radius alpha.
+    A deleted point is covered by the ball of the point of the net closest to it, so that the complex of the weighted
+    balls of the net is the nerve of this union (Cavanna, Jahanseir and Sheehy) : the persistence diagrams of the result
+    and of the cech complex are within a factor 1 / (1 - epsilon) = 1 + O(epsilon) of each other, in log scale.
+    Every simplex kept has a value between its cech value r and r / sqrt(1 - epsilon^2)
+
+    Input :
+        - non-empty list of points of length n
+        - the dimension d
+        - the maximum dimension for simplexes (k in the problem statement)
+        - the approximation parameter 0 < epsilon < 1
+        - an optional limit on filtration values (infinity by default)
+        - an MEB problem solver (backend_meb by default, which is lp_type_meb without numba)
+
+    Output : (simplex_list, approximation_factor) where simplex_list is a list of (simplex, filtration_value) couples
+             sorted as in cech_complex, and approximation_factor is 1 / (1 - epsilon)
+
+    Complexity : O(n * (1 / epsilon)^{d * (k-1)}) simplexes for a fixed dimension, since the vertices of a simplex
+                 kept with a first vertex of insertion radius lambda are lambda-separated points at distance at most
+                 2 * lambda / (epsilon * (1 - epsilon)) from it, and O(log(1 / SPARSE_CECH_TOLERANCE)) calls to meb in
+                 dimension d+1 at worst for the simplexes whose balls stopped growing
+    """
+    assert(0 < epsilon < 1)
+    approximation_factor = 1 / (1 - epsilon)
+    if len(points) == 0:
+        return [], approximation_factor
+    points = np.asarray(points, dtype=float)
+    spatial_index = build_spatial_index(points)
+    order, insertion_radii = greedy_permutation(points, spatial_index)
+    # Reversed so that the first vertex of a simplex is the one with the smallest insertion radius
+    order = order[::-1]
+    filtration_value = SparseCechFiltrationValue(meb, filtration_limit, insertion_radii[::-1], epsilon)
+    neighbor_radius = 2 * np.minimum(filtration_value.deletion_times, filtration_limit)
+    res = [(tuple(sorted(order[list(simplex)].tolist())), value)
+           for simplex, value in iter_complex(points[order], space_dim, max_simplex_dim, filtration_limit, filtration_value, neighbor_radius)]
+    res.sort(key=lambda couple: (len(couple[0]), couple[0]))
+    return res, approximation_factor
+
+def _alpha_outside_points(points, simplex, spatial_index, filtration_limit):
+    """
+    Finds the points which could be inside the empty ball of simplex, and whether they were restricted with the spatial index
+    """
+    simplex = list(simplex)
+    if spatial_index is not None and filtration_limit < np.inf:
+        # A ball of radius less than the limit going through the first vertex only contains points
+        # at distance less than twice the limit from it
+        nearby = spatial_index.query_radius(points[simplex[0]], 2 * filtration_limit)
+        return points[np.setdiff1d(nearby, simplex, assume_unique=True)], True
+    is_outside = np.ones(len(points), dtype=bool)
+    is_outside[simplex] = False
+    return points[is_outside], False
+
+def _alpha_support(points, simplex, dim):
+    """
+    Finds affinely independent vertices of simplex such that the spheres through them are the spheres through all its vertices
+
+    The vertices are kept in order when they are independent of the ones kept before, and the others must be on the
+    smallest circumsphere of the kept vertices, hence on all their circumspheres since they are in their affine hull.
+    Coincident vertices are thus kept once, and a simplex of more than d+1 vertices only has a sphere when they are cospherical
+
+    Output : array of at most d+1 vertices, None if no sphere goes through all the vertices of simplex
+    """
+    vertices = points[list(simplex)]
+    if len(vertices) <= dim + 1 and affinely_independent(vertices):
+        return vertices
+    kept = []
+    others = []
+    for i in range(len(vertices)):
+        if len(kept) <= dim and affinely_independent(vertices[kept + [i]]):
+            kept.append(i)
+        else:
+            others.append(i)
+    if np.any(in_sphere(vertices[kept], vertices[others]) != 0):
+        return None
+    return vertices[kept]
+
+def lp_type_alpha_complex_filtration_value(points, simplex, dim=3, spatial_index=None, filtration_limit=np.inf):
+    """
+    Finds filtration value of simplex in the alpha complex using an LP-type solver
+
+    When a spatial index and a finite filtration limit are given, only the points at distance less than
+    twice the limit from the simplex are considered, and values at or above the limit are reported as infinity
+
+    Input : non-empty list (or (n, d) array) of points of length n, a simplex given as a tuple of indices into points, the dimension d,
+            an optional spatial index over the points and an optional limit on filtration values
+
+    Output : infinity if the simplex isn't in the alpha complex, its filtration value otherwise
+
+    Complexity : O(d^3 * d! * m) where m is the number of points considered (at most n)
+    """
+
+    support_set = SupportSet(dim)
+    def violation_test(boundary_points, new_point):
+        if len(boundary_points) == 0:
+            return True
+        ball = support_set.sphere(boundary_points)
+        return in_ball(new_point, ball, epsilon = -1e-10, support=support_set.points[:support_set.size])
+    
+    points = np.asarray(points, dtype=float)
+    simplex = list(simplex)
+    support = _alpha_support(points, simplex, dim)
+    if support is None:
+        return np.inf
+    if len(support) == 1:
+        # Copies of a single point, no point is strictly inside their ball of radius 0
+        return 0.0
+    outside_points, restricted = _alpha_outside_points(points, simplex, spatial_index, filtration_limit)
+    try:
+        basis = lp_type_solver(outside_points, violation_test, list(support), dim+1)
+        # The last point of a basis of d+1 points is returned without being pushed on support_set
+        if not affinely_independent(basis):
+            raise np.linalg.LinAlgError("affinely dependent points")
+    except np.linalg.LinAlgError:
+        # A violator in the affine hull of a basis has the same power with respect to all the spheres through the basis,
+        # so it is strictly inside all of them and no sphere through the simplex is empty
+        return np.inf
+    ball = _basis_sphere(basis, dim)
+    _, filtration_value = ball
+    if restricted and filtration_value >= filtration_limit:
+        return np.inf
+    center, radius = ball
+    if first_point_in_ball(outside_points, center, radius, epsilon=-1e-10, support=basis[:dim+1]) >= 0:
+        filtration_value = np.inf
+    return filtration_value
+
+def backend_alpha_complex_filtration_value(points, simplex, dim=3, spatial_index=None, filtration_limit=np.inf):
+    """
+    Finds filtration value of simplex in the alpha complex with the calculator of the selected backend (see backends.get_backend) :
+    the compiled kernels when numba is installed, lp_type_alpha_complex_filtration_value otherwise
+
+    Input : same as lp_type_alpha_complex_filtration_value
+
+    Output : infinity if the simplex isn't in the alpha complex, its filtration value otherwise
+    """
+    return get_backend().alpha_complex_filtration_value(points, simplex, dim, spatial_index, filtration_limit)
+
+class AlphaFiltrationValue:
+    """
+    Filtration value calculator of the alpha complex for complex, which gives a spatial index and the filtration
+    limit to alpha_complex_filtration_value
+
+    The spatial index is built on the first call when it isn't given, and isn't pickled : each worker process
+    builds its own from the shared points
+    """
+
+    def __init__(self, alpha_complex_filtration_value, filtration_limit, spatial_index=None):
+        self.alpha_complex_filtration_value = alpha_complex_filtration_value
+        self.filtration_limit = filtration_limit
+        self.spatial_index = spatial_index
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["spatial_index"] = None
+        return state
+
+    def __call__(self, points, simplex, space_dim):
+        if self.spatial_index is None:
+            self.spatial_index = build_spatial_index(points)
+        return self.alpha_complex_filtration_value(points, simplex, space_dim, spatial_index=self.spatial_index, filtration_limit=self.filtration_limit)
+
+def alpha_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, alpha_complex_filtration_value=backend_alpha_complex_filtration_value, workers=None):
+    """
+    Finds all simplexes in the alpha complex
+
+    Input :
+        - non-empty list of points of length n
+        - the dimension d
+        - the maximum dimension for simplexes (k in the problem statement)
+        - an optional limit on filtration values (infinity by default)
+        - a filtration_value calculator (backend_alpha_complex_filtration_value by default), which also accepts
+          the spatial_index and filtration_limit keyword arguments of lp_type_alpha_complex_filtration_value
+        - an optional number of worker processes (see complex), which requires alpha_complex_filtration_value to be picklable
+
+    Output : list of (simplex, filtration_value) couples, where each simplex is a sorted tuple of indices into points
+
+    Complexity : O(size_of_alpha_complex * n) calls to alpha_complex_filtration_value, so O(size_of_alpha_complex * d^3 * d! * n^2) by default
+    """
+    return list(iter_alpha_complex(points, space_dim, max_simplex_dim, filtration_limit, alpha_complex_filtration_value, workers))
+
+def iter_alpha_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, alpha_complex_filtration_value=backend_alpha_complex_filtration_value, workers=None):
+    """
+    Generates the simplexes of the alpha complex with their filtration value as soon as they are found (see iter_complex)
+
+    Input : same as alpha_complex
+
+    Output : generator of (simplex, filtration_value) couples, in the order of alpha_complex
+    """
+    if len(points) == 0:
+        return
+    points = np.asarray(points, dtype=float)
+    spatial_index = build_spatial_index(points)
+    filtration_value = AlphaFiltrationValue(alpha_complex_filtration_value, filtration_limit, spatial_index)
+    # The empty ball of an edge with filtration value below the limit has a diameter smaller than twice the limit
+    yield from iter_complex(points, space_dim, max_simplex_dim, filtration_limit, filtration_value, 2 * filtration_limit, spatial_index, workers=workers)
+
+#%% Alpha complex from the Delaunay triangulation
+
+def bowyer_watson(points):
+    """
+    Finds the Delaunay triangulation of a set of points with the Bowyer-Watson algorithm
+
+    Input : (n, d) array of points whose affine hull has dimension d, with d >= 1
+
+    Output : list of the Delaunay simplexes, as sorted tuples of d+1 indices into points
+
+    Complexity : O(n^2 * d^3), since every insertion scans all the current simplexes
+    """
+    points = np.asarray(points, dtype=float)
+    n, dim = points.shape
+    center = np.mean(points, axis=0)
+    span = max(np.max(np.abs(points - center)), 1.0)
+    # Vertices of a simplex containing the cube of side 2 * margin around center, far enough not to hide any Delaunay simplex
+    margin = 1000 * dim * span
+    super_vertices = center - margin + margin * (dim + 1) * np.vstack([np.eye(dim), np.zeros((1, dim))])
+    all_points = np.vstack([points, super_vertices])
+    tolerance = 1e-10 * span
+
+    simplices = [tuple(range(n, n + dim + 1))]
+    center, radius = sphere_from_points(list(super_vertices), dim)
+    centers = [center]
+    radii = [radius]
+    for i in range(n):
+        point = all_points[i]
+        distances = np.sqrt(np.sum((np.array(centers) - point)**2, axis=1))
+        bad = distances < np.array(radii) - tolerance
+        # The boundary of the cavity is made of the facets which belong to exactly one bad simplex
+        facet_count = {}
+        for simplex in itertools.compress(simplices, bad):
+            for j in range(dim + 1):
+                facet = simplex[:j] + simplex[j+1:]
+                facet_count[facet] = facet_count.get(facet, 0) + 1
+        kept = [k for k in range(len(simplices)) if not bad[k]]
+        simplices = [simplices[k] for k in kept]
+        centers = [centers[k] for k in kept]
+        radii = [radii[k] for k in kept]
+        for facet, count in facet_count.items():
+            if count == 1:
+                new_simplex = tuple(sorted((*facet, i)))
+                try:
+                    center, radius = sphere_from_points(list(all_points[list(new_simplex)]), dim)
+                except np.linalg.LinAlgError:
+                    # The new point is on the hyperplane of the facet, the flat simplex is left out
+                    continue
+                simplices.append(new_simplex)
+                centers.append(center)
+                radii.append(radius)
+    return [simplex for simplex in simplices if simplex[-1] < n]
+
+def delaunay_triangulation(points):
+    """
+    Finds the Delaunay triangulation of a set of points, with scipy.spatial.Delaunay when scipy is available
+    and bowyer_watson otherwise
+
+    Input : (n, d) array of points whose affine hull has dimension d, with d >= 1
+
+    Output : list of the Delaunay simplexes, as sorted tuples of d+1 indices into points. scipy returns flat simplexes
+             for cospherical points (on a grid for instance), they are left out like in bowyer_watson
+    """
+    try:
+        from scipy.spatial import Delaunay
+    except ImportError:
+        return bowyer_watson(points)
+    if np.shape(points)[1] == 1:
+        return bowyer_watson(points)
+    points = np.asarray(points, dtype=float)
+    return [tuple(sorted(simplex)) for simplex in Delaunay(points).simplices.tolist() if orientation(points[simplex]) != 0]
+
+def _with_coincident_points(simplex_list, classes, max_simplex_dim):
+    """
+    Expands a complex built on distinct points to the points they stand for : every simplex gives the simplexes made of
+    at least one copy of each of its vertices, with the same filtration value
+
+    Input : list of (simplex, filtration_value) couples on the distinct points, array giving the distinct point of every
+            point and the maximum dimension for simplexes
+
+    Output : list of (simplex, filtration_value) couples on the points, sorted by size then lexicographically
+    """
+    copies = [[] for _ in range(classes.max() + 1)]
+    for i, distinct in enumerate(classes.tolist()):
+        copies[distinct].append(i)
+    res = []
+    for simplex, value in simplex_list:
+        choices = [[subset for size in range(1, len(copies[vertex]) + 1) for subset in itertools.combinations(copies[vertex], size)] for vertex in simplex]
+        for choice in itertools.product(*choices):
+            if sum(len(subset) for subset in choice) <= max_simplex_dim:
+                res.append((tuple(sorted(itertools.chain(*choice))), value))
+    res.sort(key=lambda couple: (len(couple[0]), couple[0]))
+    return res
+
+def delaunay_alpha_complex(points, space_dim, max_simplex_dim, filtration_limit=np.inf, triangulation=delaunay_triangulation):
+    """
+    Finds all simplexes in the alpha complex from the Delaunay triangulation, without testing the other subsets of points
+
+    Coincident points are merged first, and their copies are added back to the simplexes of the complex of the distinct
+    points. The points are then expressed in coordinates of their affine hull. The Delaunay simplexes with no other point
+    near their circumsphere are the cells. The floating point triangulation can't be trusted around the other ones
+    (nearly cospherical points), so the subsets of at most max(k, d)+1 vertices of such a simplex and of the points near
+    its circumsphere are all candidates, whose values are computed exactly by backend_alpha_complex_filtration_value.
+    The other filtration values are assigned from the biggest simplexes down : a cell gets the radius of its circumsphere,
+    a face whose smallest circumsphere is empty (a Gabriel face) gets the radius of that sphere, and any other face
+    gets the smallest value of its cofacets
+
+    Input :
+        - non-empty list of points of length n
+        - the dimension d
+        - the maximum dimension for simplexes (k in the problem statement)
+        - an optional limit on filtration values (infinity by default)
+        - a Delaunay triangulation function (delaunay_triangulation by default)
+
+    Output : list of (simplex, filtration_value) couples, where each simplex is a sorted tuple of indices into points,
+             sorted by size then lexicographically as in alpha_complex
+
+    Complexity : the triangulation, plus O(number_of_faces_of_the_delaunay_cells * (d^3 + m)) where m is the number of
+                 points returned by a radius query of the spatial index, plus O(c^{max(k, d)+1}) exact filtration values
+                 for every group of c nearly cospherical points
+    """
+    if len(points) == 0:
+        return []
+    points = np.asarray(points, dtype=float)
+    distinct_points, classes = np.unique(points, axis=0, return_inverse=True)
+    if len(distinct_points) < len(points):
+        # Coincident points have the same spheres, and are on the spheres of each other
+        res = delaunay_alpha_complex(distinct_points, space_dim, max_simplex_dim, filtration_limit, triangulation)
+        return _with_coincident_points(res, classes.reshape(-1), max_simplex_dim)
+    n = len(points)
+    spatial_index = build_spatial_index(points)
+
+    # Coordinates of the points in an orthonormal basis of their affine hull
+    _, singular_values, directions = np.linalg.svd(points - points[0], full_matrices=False)
+    rank = int(np.sum(singular_values > 1e-10 * max(singular_values[0], 1e-300))) if len(singular_values) > 0 else 0
+    if rank == 0 or n <= rank + 1:
+        delaunay_simplices = [tuple(range(n))]
+    elif rank == points.shape[1]:
+        # No projection, so that the flat simplexes of the triangulation are exactly flat
+        delaunay_simplices = triangulation(points)
+    else:
+        delaunay_simplices = triangulation((points - points[0]) @ directions[:rank].T)
+
+    def near_sphere(center, radius):
+        # The centers are at relative distance at most CIRCUMSPHERE_TOLERANCE from the exact ones, so this finds all
+        # the points on or inside the exact sphere
+        return spatial_index.query_radius(center, radius * (1 + 4 * CIRCUMSPHERE_TOLERANCE))
+
+    # Cells are the Delaunay simplexes with no other point near their circumsphere, with the radius of that sphere.
+    # Around the other ones the floating point triangulation can't be trusted, so the subsets of the simplex and of
+    # the points near its sphere are all candidates, evaluated exactly
+    cells = {}
+    exact_candidates = set()
+    largest_size = max(max_simplex_dim, space_dim) + 1
+    candidates = {}
+    for simplex in delaunay_simplices:
+        vertices = points[list(simplex)]
+        try:
+            center, radius = _basis_sphere(vertices, space_dim)
+        except np.linalg.LinAlgError:
+            # Flat up to the rounding errors of the projection, its points are on the spheres of the cells around it
+            continue
+        nearby = np.setdiff1d(near_sphere(center, radius), simplex)
+        if len(nearby) == 0:
+            cells[simplex] = radius
+            group = simplex
+        else:
+            group = tuple(sorted(set(simplex) | set(nearby.tolist())))
+        for size in range(1, min(len(group), largest_size) + 1):
+            subsets = set(itertools.combinations(group, size))
+            candidates.setdefault(size, set()).update(subsets)
+            if len(nearby) > 0 and size > 1:
+                exact_candidates.update(subsets)
+
+    values = {}
+    smallest_coface_value = {}
+    for size in sorted(candidates, reverse=True):
+        for simplex in candidates[size]:
+            if simplex in cells:
+                value = cells[simplex]
+            elif simplex in exact_candidates:
+                value = backend_alpha_complex_filtration_value(points, simplex, space_dim, spatial_index, filtration_limit)
+            else:
+                value = smallest_coface_value[simplex]
+                # Cospherical faces have more vertices than a support, the spheres through them go through a support
+                support = _alpha_support(points, simplex, space_dim)
+                if support is None:
+                    radius = np.inf
+                elif len(support) == 1:
+                    center, radius = support[0], 0.0
+                else:
+                    center, radius = _basis_sphere(support, space_dim)
+                if radius < value:
+                    nearby = np.setdiff1d(near_sphere(center, radius), simplex, assume_unique=True)
+                    if first_point_in_ball(points[nearby], center, radius, epsilon=-1e-10, support=support) < 0:
+                        value = radius
+            values[simplex] = value
+            for j in range(size if size > 1 else 0):
+                facet = simplex[:j] + simplex[j+1:]
+                smallest_coface_value[facet] = min(smallest_coface_value.get(facet, np.inf), value)
+
+    res = [(simplex, value) for simplex, value in values.items() if len(simplex) <= max_simplex_dim and value < filtration_limit]
+    res.sort(key=lambda couple: (len(couple[0]), couple[0]))
+    return res
+
+#%% Sessions over a point cloud
+
+class CachedFiltrationValue:
+    """
+    Filtration value calculator for complex which looks the simplexes up in an LRU cache before calling filtration_value
+
+    Every entry stores the filtration limit it was computed with : calculators may report values at or above
+    their limit as infinity, so an infinite value is only reused for limits that are not bigger
+    """
+
+    def __init__(self, filtration_value, filtration_limit, cache, statistics, max_cache_size):
+        self.filtration_value = filtration_value
+        self.filtration_limit = filtration_limit
+        self.cache = cache
+        self.statistics = statistics
+        self.max_cache_size = max_cache_size
+
+    def __call__(self, points, simplex, space_dim):
+        entry = self.cache.get(simplex)
+        if entry is not None and (entry[0] < np.inf or entry[1] >= self.filtration_limit):
+            self.cache.move_to_end(simplex)
+            self.statistics["hits"] += 1
+            return entry[0]
+        self.statistics["misses"] += 1
+        value = self.filtration_value(points, simplex, space_dim)
+        self.cache[simplex] = (value, self.filtration_limit)
+        self.cache.move_to_end(simplex)
+        while len(self.cache) > self.max_cache_size:
+            self.cache.popitem(last=False)
+            self.statistics["evictions"] += 1
+        return value
+
+class ComplexSession:
+    """
+    Builds the cech and alpha complexes of one point cloud several times, with different filtration limits or
+    maximum dimensions, and keeps the filtration values already computed so that only new simplexes are evaluated
+
+    The values are cached by simplex (a sorted tuple of indices) in one cache for each kind of complex and calculator,
+    and the least recently used ones are evicted once a cache holds more than max_cache_size of them
+
+    Input : non-empty list (or (n, d) array) of points, the dimension d and the maximum number of cached values (10^6 by default)
+    """
+
+    def __init__(self, points, space_dim, max_cache_size=10**6):
+        self.points = np.asarray(points, dtype=float)
+        self.space_dim = space_dim
+        self.max_cache_size = max_cache_size
+        self.spatial_index = build_spatial_index(self.points)
+        # caches maps (kind of complex, calculator) to the LRU cache of its values
+        self.caches = {}
+        self.statistics = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def _cached(self, key, filtration_value, filtration_limit):
+        cache = self.caches.setdefault(key, OrderedDict())
+        return CachedFiltrationValue(filtration_value, filtration_limit, cache, self.statistics, self.max_cache_size)
+
+    def cech_complex(self, max_simplex_dim, filtration_limit=np.inf, meb=backend_meb):
+        """
+        Same as cech_complex on the points of the session, with cached filtration values
+        """
+        filtration_value = self._cached(("cech", meb), CechFiltrationValue(meb, filtration_limit), filtration_limit)
+        return complex(self.points, self.space_dim, max_simplex_dim, filtration_limit, filtration_value, 2 * filtration_limit, self.spatial_index)
+
+    def alpha_complex(self, max_simplex_dim, filtration_limit=np.inf, alpha_complex_filtration_value=backend_alpha_complex_filtration_value):
+        """
+        Same as alpha_complex on the points of the session, with cached filtration values
+        """
+        filtration_value = AlphaFiltrationValue(alpha_complex_filtration_value, filtration_limit, self.spatial_index)
+        filtration_value = self._cached(("alpha", alpha_complex_filtration_value), filtration_value, filtration_limit)
+        return complex(self.points, self.space_dim, max_simplex_dim, filtration_limit, filtration_value, 2 * filtration_limit, self.spatial_index)
+
+    def cache_info(self):
+        """
+        Output : dictionary with the numbers of hits, misses and evictions since the session was created, the hit rate
+                 and the number of cached values
+        """
+        lookups = self.statistics["hits"] + self.statistics["misses"]
+        return {**self.statistics, "hit_rate": self.statistics["hits"] / lookups if lookups > 0 else 0.0,
+                "size": sum(len(cache) for cache in self.caches.values()), "max_size": self.max_cache_size}
+
+    def clear_cache(self):
+        self.caches.clear()
+
+#%% Dynamic complexes
+
+class DynamicComplex:
+    """
+    Cech or alpha complex of a point cloud which changes by insertions and removals of points, where an update only
+    computes the filtration values that it can change
+
+    The points get identifiers : 0 to n-1 for the initial ones, then the next integers for the inserted ones, and the
+    simplexes are sorted tuples of identifiers. With a finite filtration limit L, the simplexes of the complex have a
+    MEB (for the cech complex) or an empty ball (for the alpha complex) of radius less than L, so an update at point p
+    only concerns :
+        - for the cech complex, the simplexes containing p, whose vertices are at distance less than 2L from p.
+          They are built again from the points around p on insertion, and dropped on removal
+        - for the alpha complex, the simplexes whose empty ball contains p, before or after the update, whose
+          vertices are also at distance less than 2L from p. Their empty balls only depend on the points at distance
+          less than 2L from their vertices, so their values are computed again with the points at distance at most 4L from p
+    The points around p are found with a DynamicGridIndex whose cells have side 2L, and only the simplexes whose vertices
+    are at distance at most 2L from p are evaluated (with the values of the cech simplexes not containing p reused)
+
+    Input :
+        - list (or (n, d) array) of points
+        - the dimension d
+        - the maximum dimension for simplexes
+        - a finite limit on filtration values
+        - the kind of complex, "cech" or "alpha" ("alpha" by default)
+        - the calculator given to cech_complex (meb) or to alpha_complex (alpha_complex_filtration_value), the backend one by default
+    """
+
+    def __init__(self, points, space_dim, max_simplex_dim, filtration_limit, kind="alpha", calculator=None):
+        assert(kind in ("cech", "alpha"))
+        assert(0 < filtration_limit < np.inf)
+        self.space_dim = space_dim
+        self.max_simplex_dim = max_simplex_dim
+        self.filtration_limit = filtration_limit
+        self.kind = kind
+        if calculator is None:
+            calculator = backend_meb if kind == "cech" else backend_alpha_complex_filtration_value
+        self.calculator = calculator
+        self.index = DynamicGridIndex(space_dim, 2 * filtration_limit)
+        for identifier, point in enumerate(points):
+            self.index.insert(identifier, point)
+        self.next_identifier = len(self.index)
+        # values maps every simplex to its filtration value, and cofaces every vertex to the simplexes containing it
+        self.values = {}
+        self.cofaces = {identifier: set() for identifier in self.index.points}
+        for simplex, value in self._local_complex(list(self.index.points)).items():
+            self._add(simplex, value)
+
+    def _local_complex(self, identifiers, region=None, vertex=None):
+        """
+        Builds the complex of the points of identifiers, restricted to the simplexes whose vertices are in the set region
+        (all of them by default). When vertex is given, the values of the simplexes which don't contain it are taken
+        from the current complex instead of being computed
+
+        Output : dictionary mapping every simplex, as a sorted tuple of identifiers, to its filtration value
+        """
+        identifiers = sorted(identifiers)
+        if len(identifiers) == 0:
+            return {}
+        points = np.array([self.index.points[identifier] for identifier in identifiers])
+        spatial_index = build_spatial_index(points)
+        if self.kind == "cech":
+            filtration_value = CechFiltrationValue(self.calculator, self.filtration_limit)
+        else:
+            filtration_value = AlphaFiltrationValue(self.calculator, self.filtration_limit, spatial_index)
+        def local_filtration_value(points, simplex, space_dim):
+            vertices = tuple(identifiers[i] for i in simplex)
+            if region is not None and not region.issuperset(vertices):
+                return np.inf
+            if vertex is not None and vertex not in vertices:
+                return self.values.get(vertices, np.inf)
+            return filtration_value(points, simplex, space_dim)
+        res = complex(points, self.space_dim, self.max_simplex_dim, self.filtration_limit, local_filtration_value, 2 * self.filtration_limit, spatial_index)
+        return {tuple(identifiers[i] for i in simplex): value for simplex, value in res}
+
+    def _add(self, simplex, value):
+        self.values[simplex] = value
+        for vertex in simplex:
+            self.cofaces[vertex].add(simplex)
+
+    def _discard(self, simplex):
+        del self.values[simplex]
+        for vertex in simplex:
+            self.cofaces[vertex].discard(simplex)
+
+    def _simplexes_within(self, vertices):
+        """
+        Output : dictionary mapping the simplexes of the complex whose vertices are all in the set vertices to their values
+        """
+        return {simplex: self.values[simplex] for vertex in vertices for simplex in self.cofaces[vertex] if vertices.issuperset(simplex)}
+
+    def _apply(self, old, new):
+        """
+        Replaces the simplexes of old by those of new, both dictionaries mapping simplexes to values
+
+        Output : the diff, a dictionary with the sorted lists "added" and "removed" of (simplex, filtration_value)
+                 couples and "changed" of (simplex, old_value, new_value) triples
+        """
+        diff = {"added": [], "removed": [], "changed": []}
+        for simplex, value in old.items():
+            if simplex not in new:
+                diff["removed"].append((simplex, value))
+                self._discard(simplex)
+        for simplex, value in new.items():
+            if simplex not in old:
+                diff["added"].append((simplex, value))
+                self._add(simplex, value)
+            elif value != old[simplex] and abs(value - old[simplex]) > 1e-9 * max(1.0, abs(old[simplex])):
+                # Values computed again up to rounding errors are kept as they were
+                diff["changed"].append((simplex, old[simplex], value))
+                self.values[simplex] = value
+        for key in diff:
+            diff[key].sort(key=lambda entry: (len(entry[0]), entry[0]))
+        return diff
+
+    def insert(self, point):
+        """
+        Adds a point to the cloud
+
+        Output : (identifier of the point, diff of the complex, see _apply)
+
+        Complexity : one construction of the complex of the points at distance at most 2L (cech) or 4L (alpha) from point
+        """
+        point = np.asarray(point, dtype=float)
+        identifier = self.next_identifier
+        self.next_identifier += 1
+        neighbors = set(self.index.query_radius(point, 2 * self.filtration_limit).tolist())
+        if self.kind == "alpha":
+            surroundings = set(self.index.query_radius(point, 4 * self.filtration_limit).tolist())
+        self.index.insert(identifier, point)
+        self.cofaces[identifier] = set()
+        if self.kind == "cech":
+            old = {}
+            new = {simplex: value for simplex, value in self._local_complex(neighbors | {identifier}, vertex=identifier).items() if identifier in simplex}
+        else:
+            old = self._simplexes_within(neighbors)
+            region = neighbors | {identifier}
+            new = self._local_complex(surroundings | {identifier}, region)
+        return identifier, self._apply(old, new)
+
+    def remove(self, identifier):
+        """
+        Removes the point of that identifier from the cloud
+
+        Output : diff of the complex, see _apply
+
+        Complexity : O(number of simplexes containing the point) for the cech complex, one construction of the complex
+                     of the points at distance at most 4L from the point for the alpha complex
+        """
+        assert(identifier in self.index.points)
+        point = self.index.points[identifier]
+        self.index.remove(identifier)
+        if self.kind == "cech":
+            old = {simplex: self.values[simplex] for simplex in self.cofaces[identifier]}
+            new = {}
+        else:
+            neighbors = set(self.index.query_radius(point, 2 * self.filtration_limit).tolist())
+            surroundings = self.index.query_radius(point, 4 * self.filtration_limit).tolist()
+            old = self._simplexes_within(neighbors | {identifier})
+            new = self._local_complex(surroundings, neighbors)
+        diff = self._apply(old, new)
+        del self.cofaces[identifier]
+        return diff
+
+    def points(self):
+        """
+        Output : dictionary mapping the identifiers of the points of the cloud to their coordinates
+        """
+        return self.index.points
+
+    def to_list(self):
+        """
+        Output : list of (simplex, filtration_value) couples sorted by size then lexicographically, as returned by complex
+        """
+        return sorted(self.values.items(), key=lambda entry: (len(entry[0]), entry[0]))
+
+#%% Instrumentation
+
+if os.environ.get("SIMPLICIAL_COMPLEX_INSTRUMENTATION"):
+    # Imported last since the instrumentation wraps the functions defined above
+    from .instrumentation import enable_from_environment
+    enable_from_environment()
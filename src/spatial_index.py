@@ -0,0 +1,229 @@
+#%% Importing modules
+
+import abc
+import numpy as np
+import itertools
+
+#%% Spatial indexes
+
+class SpatialIndex(abc.ABC):
+    """
+    Abstract base class for the spatial indexes built once over an (n, d) array of points
+
+    Subclasses implement query_radius, the k nearest neighbors query is derived from it
+    """
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=float)
+
+    @abc.abstractmethod
+    def query_radius(self, x, radius):
+        """
+        Input : a point x and a radius
+
+        Output : sorted array of the indices of the points at distance at most radius from x
+        """
+
+    def query_knn(self, x, k):
+        """
+        Input : a point x and a number of neighbors k
+
+        Output : array of the indices of the k points closest to x (or all points if there are less than k),
+                 sorted by distance to x then by index
+        """
+        k = min(k, len(self.points))
+        if k <= 0:
+            return np.zeros(0, dtype=int)
+        radius = self._initial_knn_radius()
+        candidates = self.query_radius(x, radius)
+        while len(candidates) < k:
+            radius *= 2
+            candidates = self.query_radius(x, radius)
+        distances = np.sqrt(np.sum((self.points[candidates] - x)**2, axis=1))
+        order = np.lexsort((candidates, distances))
+        return candidates[order[:k]]
+
+    def _initial_knn_radius(self):
+        return 1.0
+
+
+class GridIndex(SpatialIndex):
+    """
+    Uniform grid whose cells are hypercubes of side cell_size, meant for low dimensions
+
+    By default the cell size is chosen so that there is about one point per cell
+    """
+
+    def __init__(self, points, cell_size=None):
+        super().__init__(points)
+        n, dim = self.points.shape
+        self.origin = np.min(self.points, axis=0) if n > 0 else np.zeros(dim)
+        if cell_size is None:
+            extent = np.max(self.points, axis=0) - self.origin if n > 0 else np.zeros(dim)
+            cell_size = np.max(extent) / max(1, np.ceil(n ** (1 / dim))) if dim > 0 else 1.0
+            if cell_size <= 0:
+                cell_size = 1.0
+        self.cell_size = cell_size
+        self.cells = {}
+        if n > 0:
+            coordinates = self._cell_coordinates(self.points)
+            unique_coordinates, cell_of_point = np.unique(coordinates, axis=0, return_inverse=True)
+            order = np.argsort(cell_of_point.ravel(), kind="stable")
+            bounds = np.searchsorted(cell_of_point.ravel()[order], np.arange(len(unique_coordinates) + 1))
+            for i, cell in enumerate(unique_coordinates):
+                self.cells[tuple(cell.tolist())] = order[bounds[i]:bounds[i+1]]
+
+    def _cell_coordinates(self, x):
+        return np.floor((x - self.origin) / self.cell_size).astype(int)
+
+    def _initial_knn_radius(self):
+        return self.cell_size
+
+    def query_radius(self, x, radius):
+        x = np.asarray(x, dtype=float)
+        low = self._cell_coordinates(x - radius) if radius < np.inf else None
+        high = self._cell_coordinates(x + radius) if radius < np.inf else None
+        if low is None or np.prod(high - low + 1, dtype=float) > len(self.cells):
+            # Scanning every point is cheaper than visiting every cell in range
+            candidates = np.arange(len(self.points))
+        else:
+            in_range = [self.cells[cell] for cell in itertools.product(*[range(l, h+1) for l, h in zip(low, high)]) if cell in self.cells]
+            if len(in_range) == 0:
+                return np.zeros(0, dtype=int)
+            candidates = np.concatenate(in_range)
+        distances = np.sqrt(np.sum((self.points[candidates] - x)**2, axis=1))
+        return np.sort(candidates[distances <= radius])
+
+
+class KDTree(SpatialIndex):
+    """
+    KD-tree splitting the widest coordinate at its median, meant for higher dimensions
+
+    Every node stores the bounding box of its points so that queries skip nodes that are too far away
+    """
+
+    def __init__(self, points, leaf_size=16):
+        super().__init__(points)
+        self.leaf_size = leaf_size
+        self.order = np.arange(len(self.points))
+        # Each node is (start, end, low, high, left_child, right_child) where order[start:end] are its points
+        self.nodes = []
+        if len(self.points) > 0:
+            self._build(0, len(self.points))
+
+    def _build(self, start, end):
+        indices = self.order[start:end]
+        node_points = self.points[indices]
+        low = np.min(node_points, axis=0)
+        high = np.max(node_points, axis=0)
+        node = len(self.nodes)
+        self.nodes.append([start, end, low, high, -1, -1])
+        if end - start > self.leaf_size:
+            split_dim = np.argmax(high - low)
+            middle = (end - start) // 2
+            partition = np.argpartition(node_points[:, split_dim], middle)
+            self.order[start:end] = indices[partition]
+            self.nodes[node][4] = self._build(start, start + middle)
+            self.nodes[node][5] = self._build(start + middle, end)
+        return node
+
+    def _initial_knn_radius(self):
+        low, high = self.nodes[0][2], self.nodes[0][3]
+        return max(np.max(high - low) / max(1, np.ceil(len(self.points) ** (1 / len(low)))), 1e-12)
+
+    def query_radius(self, x, radius):
+        x = np.asarray(x, dtype=float)
+        if len(self.nodes) == 0:
+            return np.zeros(0, dtype=int)
+        res = []
+        stack = [0]
+        while stack:
+            start, end, low, high, left, right = self.nodes[stack.pop()]
+            # Distance from x to the bounding box of the node
+            if np.sqrt(np.sum(np.maximum(np.maximum(low - x, x - high), 0)**2)) > radius:
+                continue
+            if left == -1:
+                indices = self.order[start:end]
+                distances = np.sqrt(np.sum((self.points[indices] - x)**2, axis=1))
+                res.append(indices[distances <= radius])
+            else:
+                stack.append(left)
+                stack.append(right)
+        if len(res) == 0:
+            return np.zeros(0, dtype=int)
+        return np.sort(np.concatenate(res))
+
+
+class DynamicGridIndex:
+    """
+    Uniform grid over a set of points which changes by insertions and removals, every point having an integer identifier
+
+    Meant for radius queries with a radius of the order of cell_size, which visit the cells intersecting the cube
+    around the ball, or every non-empty cell when there are fewer of them
+
+    Input : the dimension d and the side of the cells
+    """
+
+    def __init__(self, dim, cell_size):
+        assert(cell_size > 0)
+        self.dim = dim
+        self.cell_size = cell_size
+        self.points = {}
+        # cells maps the coordinates of every non-empty cell to the set of the identifiers of its points
+        self.cells = {}
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell_coordinates(self, x):
+        return np.floor(np.asarray(x, dtype=float) / self.cell_size).astype(int)
+
+    def insert(self, identifier, x):
+        assert(identifier not in self.points)
+        x = np.asarray(x, dtype=float)
+        self.points[identifier] = x
+        self.cells.setdefault(tuple(self._cell_coordinates(x).tolist()), set()).add(identifier)
+
+    def remove(self, identifier):
+        cell = tuple(self._cell_coordinates(self.points.pop(identifier)).tolist())
+        self.cells[cell].discard(identifier)
+        if len(self.cells[cell]) == 0:
+            del self.cells[cell]
+
+    def query_radius(self, x, radius):
+        """
+        Input : a point x and a finite radius
+
+        Output : sorted array of the identifiers of the points at distance at most radius from x
+
+        Complexity : O(min((2 * radius / cell_size + 2)^d, number of non-empty cells) + number of points in the visited cells)
+        """
+        assert(radius < np.inf)
+        x = np.asarray(x, dtype=float)
+        low = self._cell_coordinates(x - radius)
+        high = self._cell_coordinates(x + radius)
+        if np.prod(high - low + 1, dtype=float) > len(self.cells):
+            in_range = [identifiers for cell, identifiers in self.cells.items() if np.all(low <= cell) and np.all(np.asarray(cell) <= high)]
+        else:
+            in_range = [self.cells[cell] for cell in itertools.product(*[range(l, h+1) for l, h in zip(low, high)]) if cell in self.cells]
+        candidates = np.array(sorted(identifier for identifiers in in_range for identifier in identifiers), dtype=int)
+        if len(candidates) == 0:
+            return candidates
+        distances = np.sqrt(np.sum((np.array([self.points[identifier] for identifier in candidates]) - x)**2, axis=1))
+        return candidates[distances <= radius]
+
+
+def build_spatial_index(points, max_grid_dim=3):
+    """
+    Builds the spatial index best suited to the dimension of the points
+
+    Input : non-empty list (or (n, d) array) of points and the biggest dimension for which a grid is used (3 by default)
+
+    Output : a GridIndex in low dimension, a KDTree otherwise
+
+    Complexity : O(n log(n)) expected for the grid, O(n log(n)^2) for the KD-tree
+    """
+    points = np.asarray(points, dtype=float)
+    if points.shape[1] <= max_grid_dim:
+        return GridIndex(points)
+    return KDTree(points)
@@ -1,121 +1,239 @@
-#%% Module imports
-import pytest
-import numpy as np
-from math import isclose
-from ..src.project import in_ball, lp_type_alpha_complex_filtration_value, alpha_complex
-from .helper import random_dimension, random_point_in_cube, random_point_in_space, random_point_on_sphere, diameter, compare_to_expected_result, distance
-
-@pytest.fixture(params=[lp_type_alpha_complex_filtration_value])
-def alpha_complex_filtration(request):
-    return request.param
-
-
-def test_two_points(alpha_complex_filtration):
-    a = np.array([0,0])
-    b = np.array([1,0])
-    points = [a,b]
-    dim = 2
-    simplex = set()
-    simplex.add(tuple(a))
-    filtration_value = alpha_complex_filtration(points, simplex, dim)
-    assert(isclose(filtration_value, 0))
-
-def test_three_points(alpha_complex_filtration):
-    a = np.array([4,0])
-    b = np.array([-4,0])
-    c  = np.array([0,2])
-    points = [a,b,c]
-    dim = 2
-    simplex = {tuple(p) for p in [a,b]}
-    filtration_value = alpha_complex_filtration(points, simplex, dim)
-    assert(isclose(filtration_value, 5))
-
-def test_triangle(alpha_complex_filtration):
-    dim = 3
-    a = np.array([0,5,0])
-    b = np.array([3,4,0])
-    c = np.array([-3,4,0])
-    points = [a,b,c]
-    simplex = {tuple(p) for p in points}
-    filtration_value = alpha_complex_filtration(points, simplex, dim)
-    assert(isclose(filtration_value, 5))
-
-def test_triangle2(alpha_complex_filtration):
-    dim = 3
-    a = np.array([0,5,0])
-    b = np.array([3,4,0])
-    c = np.array([-3,4,0])
-    d = np.array([0,0,4])
-    points = [a,b,c]
-    simplex = {tuple(p) for p in points}
-    points.append(d)
-    filtration_value = alpha_complex_filtration(points, simplex, dim)
-    assert(filtration_value > 5)
-
-def test_triangle_not_in_simplex(alpha_complex_filtration):
-    dim = 3
-    a = np.array([0,5,0])
-    b = np.array([3,4,0])
-    c = np.array([-3,4,0])
-    d = np.array([0,0,4])
-    e = np.array([0,0,-4])
-    points = [a,b,c,d,e]
-    simplex = {tuple(p) for p in [a,b,c]}
-    filtration_value = alpha_complex_filtration(points, simplex, dim)
-    assert(filtration_value == np.inf)
-
-def test_segment_not_in_complex(alpha_complex_filtration):
-    a = np.array([4,0])
-    b = np.array([-4,0])
-    c  = np.array([0,2])
-    d = np.array([0,-2])
-    points = [a,b,c,d]
-    dim = 2
-    simplex = {tuple(p) for p in [a,b]}
-    filtration_value = alpha_complex_filtration(points, simplex, dim)
-    assert(filtration_value == np.inf)
-
-def test_cube_minus_ball_random(alpha_complex_filtration, number_of_points=1000, number_of_tests=10, max_dimension=100):
-    for _ in range(number_of_tests):
-        dim = random_dimension(max_dim=max_dimension)
-        center = random_point_in_space(dim)
-        points = [random_point_on_sphere(center, 1, dim) for i in range(dim+1)]
-        simplex = {tuple(p) for p in points}
-        while len(points) < number_of_points:
-            point = random_point_in_cube(center=center, bound=2, dim=dim)
-            if not in_ball(point, (center, 1), epsilon=-1e-14):
-                points.append(point)
-        filtration_value = alpha_complex_filtration(points, simplex, dim)
-        assert(isclose(filtration_value, 1))
-
-def test_one_point(alpha_complex_filtration,max_dim=5, space_bound=1):
-    dim = random_dimension(max_dim)
-    expected_point = random_point_in_cube(np.zeros(dim), space_bound, dim)
-    res = alpha_complex([expected_point], dim, 1, np.inf, alpha_complex_filtration)
-    assert(len(res) == 1)
-    simplex, filtration_value = res[0]
-    point = list(simplex)[0]
-    compare_to_expected_result(point, filtration_value, expected_point, 0)
-
-def test_two_points2(alpha_complex_filtration,max_dim=5, space_bound=1):
-    dim = random_dimension(max_dim)
-    a = random_point_in_cube(np.zeros(dim), space_bound, dim)
-    b = random_point_in_cube(np.zeros(dim), space_bound, dim)
-    res = alpha_complex([a,b], dim, 2, np.inf, alpha_complex_filtration)
-    assert(len(res) == 3)
-    for simplex, value in res:
-        if len(simplex) == 1:
-            assert(isclose(value, 0, abs_tol=1e-7))
-        elif len(simplex) == 2:
-            assert(isclose(value, distance(a,b)/2))
-
-def test_square(alpha_complex_filtration):
-    a = np.array([1,0])
-    b = np.array([0,1])
-    c = np.array([0,-1])
-    d = np.array([-1,0])
-    points = [a,b,c,d]
-    complex = alpha_complex(points, 2, 4,2,alpha_complex_filtration)
-    assert(len(complex) == pow(2,4)-1)
-    for simplex, value in complex:
-        assert(value == diameter(simplex)/2)
\ No newline at end of file
+#%% Module imports
+import pytest
+import itertools
+import numpy as np
+from math import isclose
+from ..src.project import in_ball, lp_type_alpha_complex_filtration_value, alpha_complex, iter_alpha_complex, delaunay_alpha_complex, delaunay_triangulation, bowyer_watson
+from ..src.project import ComplexSession, DynamicComplex
+from ..src.predicates import orientation
+from .helper import random_dimension, random_point_in_cube, random_point_in_space, random_point_on_sphere, diameter, compare_to_expected_result, distance
+
+@pytest.fixture(params=[lp_type_alpha_complex_filtration_value])
+def alpha_complex_filtration(request):
+    return request.param
+
+
+def test_two_points(alpha_complex_filtration):
+    a = np.array([0,0])
+    b = np.array([1,0])
+    points = [a,b]
+    dim = 2
+    simplex = (0,)
+    filtration_value = alpha_complex_filtration(points, simplex, dim)
+    assert(isclose(filtration_value, 0))
+
+def test_three_points(alpha_complex_filtration):
+    a = np.array([4,0])
+    b = np.array([-4,0])
+    c  = np.array([0,2])
+    points = [a,b,c]
+    dim = 2
+    simplex = (0,1)
+    filtration_value = alpha_complex_filtration(points, simplex, dim)
+    assert(isclose(filtration_value, 5))
+
+def test_triangle(alpha_complex_filtration):
+    dim = 3
+    a = np.array([0,5,0])
+    b = np.array([3,4,0])
+    c = np.array([-3,4,0])
+    points = [a,b,c]
+    simplex = (0,1,2)
+    filtration_value = alpha_complex_filtration(points, simplex, dim)
+    assert(isclose(filtration_value, 5))
+
+def test_triangle2(alpha_complex_filtration):
+    dim = 3
+    a = np.array([0,5,0])
+    b = np.array([3,4,0])
+    c = np.array([-3,4,0])
+    d = np.array([0,0,4])
+    points = [a,b,c]
+    simplex = (0,1,2)
+    points.append(d)
+    filtration_value = alpha_complex_filtration(points, simplex, dim)
+    assert(filtration_value > 5)
+
+def test_triangle_not_in_simplex(alpha_complex_filtration):
+    dim = 3
+    a = np.array([0,5,0])
+    b = np.array([3,4,0])
+    c = np.array([-3,4,0])
+    d = np.array([0,0,4])
+    e = np.array([0,0,-4])
+    points = [a,b,c,d,e]
+    simplex = (0,1,2)
+    filtration_value = alpha_complex_filtration(points, simplex, dim)
+    assert(filtration_value == np.inf)
+
+def test_segment_not_in_complex(alpha_complex_filtration):
+    a = np.array([4,0])
+    b = np.array([-4,0])
+    c  = np.array([0,2])
+    d = np.array([0,-2])
+    points = [a,b,c,d]
+    dim = 2
+    simplex = (0,1)
+    filtration_value = alpha_complex_filtration(points, simplex, dim)
+    assert(filtration_value == np.inf)
+
+def test_cube_minus_ball_random(alpha_complex_filtration, number_of_points=1000, number_of_tests=10, max_dimension=100):
+    for _ in range(number_of_tests):
+        dim = random_dimension(max_dim=max_dimension)
+        center = random_point_in_space(dim)
+        points = [random_point_on_sphere(center, 1, dim) for i in range(dim+1)]
+        simplex = tuple(range(len(points)))
+        while len(points) < number_of_points:
+            point = random_point_in_cube(center=center, bound=2, dim=dim)
+            if not in_ball(point, (center, 1), epsilon=-1e-14):
+                points.append(point)
+        filtration_value = alpha_complex_filtration(points, simplex, dim)
+        assert(isclose(filtration_value, 1))
+
+def test_one_point(alpha_complex_filtration,max_dim=5, space_bound=1):
+    dim = random_dimension(max_dim)
+    expected_point = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    res = alpha_complex([expected_point], dim, 1, np.inf, alpha_complex_filtration)
+    assert(len(res) == 1)
+    simplex, filtration_value = res[0]
+    assert(simplex == (0,))
+    compare_to_expected_result([expected_point][simplex[0]], filtration_value, expected_point, 0)
+
+def test_two_points2(alpha_complex_filtration,max_dim=5, space_bound=1):
+    dim = random_dimension(max_dim)
+    a = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    b = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    res = alpha_complex([a,b], dim, 2, np.inf, alpha_complex_filtration)
+    assert(len(res) == 3)
+    for simplex, value in res:
+        if len(simplex) == 1:
+            assert(isclose(value, 0, abs_tol=1e-7))
+        elif len(simplex) == 2:
+            assert(isclose(value, distance(a,b)/2))
+
+def test_square(alpha_complex_filtration):
+    a = np.array([1,0])
+    b = np.array([0,1])
+    c = np.array([0,-1])
+    d = np.array([-1,0])
+    points = [a,b,c,d]
+    complex = alpha_complex(points, 2, 4,2,alpha_complex_filtration)
+    assert(len(complex) == pow(2,4)-1)
+    for simplex, value in complex:
+        assert(value == diameter([points[i] for i in simplex])/2)
+
+def test_workers_match_serial(alpha_complex_filtration, dim=2, number_of_points=30, max_simplex_dim=3, limit=0.5):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = alpha_complex(points, dim, max_simplex_dim, limit, alpha_complex_filtration)
+    res = alpha_complex(points, dim, max_simplex_dim, limit, alpha_complex_filtration, workers=2)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+
+@pytest.mark.parametrize("triangulation", [delaunay_triangulation, bowyer_watson])
+@pytest.mark.parametrize("dim, limit", [(2, 0.3), (2, np.inf), (3, 0.5)])
+def test_delaunay_matches_alpha_complex(triangulation, dim, limit, number_of_points=25):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = alpha_complex(points, dim, dim+1, limit)
+    res = delaunay_alpha_complex(points, dim, dim+1, limit, triangulation)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-7))
+
+@pytest.mark.parametrize("triangulation", [delaunay_triangulation, bowyer_watson])
+def test_delaunay_square(triangulation):
+    points = [np.array([1,0]), np.array([0,1]), np.array([0,-1]), np.array([-1,0])]
+    complex = delaunay_alpha_complex(points, 2, 4, 2, triangulation)
+    assert(len(complex) == pow(2,4)-1)
+    for simplex, value in complex:
+        assert(isclose(value, diameter([points[i] for i in simplex])/2))
+
+@pytest.mark.parametrize("triangulation", [delaunay_triangulation, bowyer_watson])
+@pytest.mark.parametrize("shape", [(3, 3, 2), (3, 3, 3), (4, 4)])
+def test_delaunay_lattice(triangulation, shape):
+    # scipy gives flat simplexes for the cospherical points of a lattice
+    points = np.array(list(itertools.product(*[range(size) for size in shape])), dtype=float)
+    dim = len(shape)
+    assert(all(orientation(points[list(simplex)]) != 0 for simplex in triangulation(points)))
+    expected = alpha_complex(points, dim, dim+1, np.inf)
+    res = delaunay_alpha_complex(points, dim, dim+1, np.inf, triangulation)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-7))
+
+@pytest.mark.parametrize("triangulation", [delaunay_triangulation, bowyer_watson])
+@pytest.mark.parametrize("number_of_points", [8, 12, 24])
+def test_delaunay_cospherical_points(triangulation, number_of_points):
+    # The triangulations of nearly cospherical points aren't exactly Delaunay, and they used to take exponential time
+    angles = 2 * np.pi * np.arange(number_of_points) / number_of_points
+    points = np.c_[np.cos(angles), np.sin(angles)]
+    expected = alpha_complex(points, 2, 3, np.inf)
+    res = delaunay_alpha_complex(points, 2, 3, np.inf, triangulation)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-7))
+
+def test_delaunay_small_inputs(max_dim=5, space_bound=1):
+    dim = random_dimension(max_dim)
+    a = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    b = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    assert(delaunay_alpha_complex([a], dim, 1) == [((0,), 0)])
+    res = delaunay_alpha_complex([a,b], dim, 2)
+    assert([simplex for simplex, _ in res] == [(0,), (1,), (0,1)])
+    assert(isclose(res[2][1], distance(a,b)/2))
+
+def test_delaunay_aligned_points(number_of_points=6):
+    points = [np.array([i, 4, 6]) for i in range(number_of_points)]
+    res = delaunay_alpha_complex(points, 3, 3)
+    assert([simplex for simplex, _ in res] == [(i,) for i in range(number_of_points)] + [(i, i+1) for i in range(number_of_points-1)])
+    for simplex, value in res:
+        assert(isclose(value, (len(simplex)-1)/2))
+
+def test_iter_matches_list(alpha_complex_filtration, dim=2, number_of_points=20, max_simplex_dim=3, limit=0.4):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = alpha_complex(points, dim, max_simplex_dim, limit, alpha_complex_filtration)
+    res = list(iter_alpha_complex(points, dim, max_simplex_dim, limit, alpha_complex_filtration))
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_grid(alpha_complex_filtration, dim):
+    # Aligned and cospherical points everywhere : the simplexes of the complex are the ones in a cell of the grid,
+    # including the squares in dimension 3 where their vertices have a common sphere
+    points = [np.array([x, y] + [0] * (dim - 2)) for x in range(3) for y in range(3)]
+    res = alpha_complex(points, dim, dim+1, np.inf, alpha_complex_filtration)
+    in_cell = lambda simplex: np.all(np.ptp([points[i] for i in simplex], axis=0) <= 1)
+    expected = [simplex for size in range(1, dim+2) for simplex in itertools.combinations(range(len(points)), size) if in_cell(simplex)]
+    assert([simplex for simplex, _ in res] == expected)
+    for simplex, value in res:
+        assert(isclose(value, diameter([points[i] for i in simplex])/2))
+    assert(alpha_complex_filtration(points, (0, 1, 2), dim) == np.inf)
+
+@pytest.mark.parametrize("builder", ["alpha_complex", "iter_alpha_complex", "delaunay_triangulation", "bowyer_watson", "session", "dynamic"])
+def test_coincident_points(alpha_complex_filtration, builder, dim=2, number_of_points=12, max_simplex_dim=4, limit=0.6):
+    # A simplex with coincident vertices has the value of the simplex of its distinct vertices, 0 for copies of a point
+    distinct_points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    copied = [0, 0, 3, 5, 5]
+    points = distinct_points + [distinct_points[i] for i in copied]
+    distinct = list(range(number_of_points)) + copied
+    builders = {
+        "alpha_complex": lambda: alpha_complex(points, dim, max_simplex_dim, limit, alpha_complex_filtration),
+        "iter_alpha_complex": lambda: list(iter_alpha_complex(points, dim, max_simplex_dim, limit, alpha_complex_filtration)),
+        "delaunay_triangulation": lambda: delaunay_alpha_complex(points, dim, max_simplex_dim, limit, delaunay_triangulation),
+        "bowyer_watson": lambda: delaunay_alpha_complex(points, dim, max_simplex_dim, limit, bowyer_watson),
+        "session": lambda: ComplexSession(points, dim).alpha_complex(max_simplex_dim, limit, alpha_complex_filtration),
+        "dynamic": lambda: DynamicComplex(points, dim, max_simplex_dim, limit, "alpha").to_list(),
+    }
+    res = builders[builder]()
+    values = dict(alpha_complex(distinct_points, dim, max_simplex_dim, limit, alpha_complex_filtration))
+    expected = []
+    for size in range(1, max_simplex_dim+1):
+        for simplex in itertools.combinations(range(len(points)), size):
+            distinct_simplex = tuple(sorted(set(distinct[i] for i in simplex)))
+            if distinct_simplex in values:
+                expected.append((simplex, values[distinct_simplex]))
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+    assert(dict(res)[(0, number_of_points)] == 0)
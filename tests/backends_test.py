@@ -0,0 +1,105 @@
+#%% Module imports
+import pytest
+import numpy as np
+from math import isclose
+from ..src import backends
+from ..src.project import sphere_from_points, lp_type_meb, alpha_complex, backend_meb, lp_type_alpha_complex_filtration_value
+from ..src.kernels import circumsphere_kernel, kernel_meb, kernel_alpha_complex_filtration_value, NUMBA_AVAILABLE
+from .helper import random_dimension, random_point_in_cube, compare_to_expected_result
+
+def test_circumsphere_kernel(max_dim=6, number_of_tests=20):
+    for _ in range(number_of_tests):
+        dim = random_dimension(max_dim, 2)
+        size = np.random.randint(1, dim+2)
+        support = np.zeros((dim+1, dim))
+        support[:size] = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(size)]
+        center = np.zeros(dim)
+        radius, success = circumsphere_kernel(support, size, center)
+        assert(success)
+        expected_center, expected_radius = sphere_from_points(list(support[:size]), dim)
+        compare_to_expected_result(center, radius, expected_center, expected_radius)
+
+def test_circumsphere_kernel_affinely_dependent():
+    support = np.array([[0., 0.], [1., 1.], [2., 2.]])
+    radius, success = circumsphere_kernel(support, 3, np.zeros(2))
+    assert(not success)
+
+@pytest.mark.parametrize("dim", [2, 3, 4])
+def test_kernel_meb_matches_lp_type(dim, number_of_points=200, number_of_tests=10):
+    for _ in range(number_of_tests):
+        points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+        # A point outside of the MEB of the others is on the boundary of the MEB of all of them
+        boundary_points = [np.full(dim, 3.)]
+        for boundary in [(), boundary_points]:
+            center, radius = kernel_meb(points, dim, boundary)
+            expected_center, expected_radius = lp_type_meb(points, dim, boundary)
+            compare_to_expected_result(center, radius, expected_center, expected_radius)
+
+def test_kernel_meb_aligned_points():
+    points = [np.array([i, 2*i, 0.]) for i in range(5)]
+    center, radius = kernel_meb(points, 3)
+    compare_to_expected_result(center, radius, np.array([2, 4, 0]), np.sqrt(20))
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_kernel_alpha_matches_lp_type(dim, number_of_points=25):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = alpha_complex(points, dim, dim+1, 0.5, lp_type_alpha_complex_filtration_value)
+    res = alpha_complex(points, dim, dim+1, 0.5, kernel_alpha_complex_filtration_value)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-7))
+
+@pytest.mark.parametrize("dim", [2, 3])
+def test_kernel_alpha_degenerate_input(dim):
+    # Grid points are aligned and cospherical, the copies of points are coincident, and the simplexes of 4 vertices
+    # are bigger than a support in dimension 2
+    grid = [np.array([x, y] + [0.] * (dim - 2)) for x in range(3) for y in range(3)]
+    for points in [grid, grid[:4] + grid[:2], [np.array([0., 0.] + [0.] * (dim - 2))] * 3]:
+        expected = alpha_complex(points, dim, 4, np.inf, lp_type_alpha_complex_filtration_value)
+        res = alpha_complex(points, dim, 4, np.inf, kernel_alpha_complex_filtration_value)
+        assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+        for (_, value), (_, expected_value) in zip(res, expected):
+            assert(isclose(value, expected_value, abs_tol=1e-7))
+    square = [np.array([0., 0.]), np.array([1., 0.]), np.array([0., 1.]), np.array([1., 1.])]
+    assert(isclose(kernel_alpha_complex_filtration_value(square, (0, 1, 2, 3), 2), np.sqrt(2)/2))
+    square[3] = np.array([1., 1.1])
+    assert(kernel_alpha_complex_filtration_value(square, (0, 1, 2, 3), 2) == np.inf)
+    assert(lp_type_alpha_complex_filtration_value(square, (0, 1, 2, 3), 2) == np.inf)
+
+@pytest.mark.parametrize("number_of_points", [8, 12])
+def test_kernel_alpha_cospherical_input(number_of_points):
+    # The points are on the unit circle up to rounding, so the kernel can't decide in floating point which ones are inside a ball
+    angles = 2 * np.pi * np.arange(number_of_points) / number_of_points
+    points = np.column_stack([np.cos(angles), np.sin(angles)])
+    expected = alpha_complex(points, 2, 4, np.inf, lp_type_alpha_complex_filtration_value)
+    res = alpha_complex(points, 2, 4, np.inf, kernel_alpha_complex_filtration_value)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+    center, radius = kernel_meb(points, 2)
+    expected_center, expected_radius = lp_type_meb(points, 2)
+    compare_to_expected_result(center, radius, expected_center, expected_radius)
+
+def test_registry():
+    names = backends.available_backends()
+    assert("numpy" in names)
+    assert(("numba" in names) == NUMBA_AVAILABLE)
+    assert(backends.get_backend().name == names[0])
+    calls = []
+    def counting_meb(points, dim=3, boundary_points=()):
+        calls.append(len(points))
+        return lp_type_meb(points, dim, boundary_points)
+    backends.register_backend("counting", lambda: backends.Backend("counting", counting_meb, lp_type_alpha_complex_filtration_value), priority=-1)
+    backends.register_backend("missing", lambda: __import__("a_module_which_does_not_exist"), priority=100)
+    try:
+        assert("missing" not in backends.available_backends())
+        assert(backends.available_backends()[-1] == "counting")
+        backends.set_backend("counting")
+        backend_meb([np.zeros(2), np.ones(2)], 2)
+        assert(calls == [2])
+    finally:
+        backends.set_backend(None)
+        for name in ["counting", "missing"]:
+            backends._loaders.pop(name)
+            backends._backends.pop(name)
+    assert(backends.get_backend().name == names[0])
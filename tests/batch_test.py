@@ -0,0 +1,41 @@
+import numpy as np
+from ..src.project import cech_complex, alpha_complex, rips_complex
+from ..src.batch import batch_complex, vectorized_cech_complex
+from .helper import random_point_in_cube
+
+def random_clouds(dim, sizes):
+    clouds = [np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(size)]).reshape(-1, dim) for size in sizes]
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    return clouds, np.concatenate(clouds), offsets
+
+def test_matches_loop(dim=2, max_simplex_dim=3, limit=0.5):
+    clouds, points, offsets = random_clouds(dim, [5, 12, 1, 8, 20])
+    batch = batch_complex(points, offsets, dim, max_simplex_dim, limit, clouds_per_task=2)
+    assert(batch.number_of_clouds() == len(clouds))
+    assert(len(batch) == sum(len(vectorized_cech_complex(cloud, dim, max_simplex_dim, limit)) for cloud in clouds))
+    for i, cloud in enumerate(clouds):
+        expected = vectorized_cech_complex(cloud, dim, max_simplex_dim, limit)
+        found = batch.cloud(i).to_list()
+        assert([simplex for simplex, _ in found] == [simplex for simplex, _ in expected])
+        assert(np.allclose([value for _, value in found], [value for _, value in expected], atol=1e-7))
+        assert(np.all(batch.cloud_ids[batch.simplex_offsets[i]:batch.simplex_offsets[i+1]] == i))
+
+def test_empty_clouds(dim=3):
+    clouds, points, offsets = random_clouds(dim, [0, 4, 0])
+    batch = batch_complex(points, offsets, dim, 2)
+    assert([len(batch.cloud(i)) for i in range(3)] == [0, 10, 0])
+    assert(len(batch_complex(np.zeros((0, dim)), [0], dim, 2)) == 0)
+
+def test_other_builders(dim=2, max_simplex_dim=3, limit=0.4):
+    clouds, points, offsets = random_clouds(dim, [10, 15])
+    for builder in [cech_complex, alpha_complex, rips_complex]:
+        batch = batch_complex(points, offsets, dim, max_simplex_dim, limit, builder)
+        for i, cloud in enumerate(clouds):
+            assert([simplex for simplex, _ in batch.cloud(i)] == [simplex for simplex, _ in builder(cloud, dim, max_simplex_dim, limit)])
+
+def test_workers_match_serial(dim=2, max_simplex_dim=3, limit=0.5):
+    clouds, points, offsets = random_clouds(dim, [10, 15, 3, 7, 12, 9])
+    serial = batch_complex(points, offsets, dim, max_simplex_dim, limit, rips_complex)
+    parallel = batch_complex(points, offsets, dim, max_simplex_dim, limit, rips_complex, workers=2, clouds_per_task=2)
+    for name in ["vertices", "values", "sizes", "cloud_ids", "simplex_offsets", "vertex_offsets"]:
+        assert(np.array_equal(getattr(serial, name), getattr(parallel, name)))
@@ -1,42 +1,169 @@
-import pytest
-import numpy as np
-from math import isclose
-from ..src.project import cech_complex, distance
-from .helper import random_dimension, random_point_in_cube, diameter, compare_to_expected_result
-
-def test_one_point(max_dim=5, space_bound=1):
-    dim = random_dimension(max_dim)
-    expected_point = random_point_in_cube(np.zeros(dim), space_bound, dim)
-    res = cech_complex([expected_point], dim, 1)
-    assert(len(res) == 1)
-    simplex, filtration_value = res[0]
-    point = list(simplex)[0]
-    compare_to_expected_result(point, filtration_value, expected_point, 0)
-
-def test_two_points(max_dim=5, space_bound=1):
-    dim = random_dimension(max_dim)
-    a = random_point_in_cube(np.zeros(dim), space_bound, dim)
-    b = random_point_in_cube(np.zeros(dim), space_bound, dim)
-    res = cech_complex([a,b], dim, 2)
-    assert(len(res) == 3)
-    for simplex, value in res:
-        if len(simplex) == 1:
-            assert(isclose(value, 0, abs_tol=1e-7))
-        elif len(simplex) == 2:
-            assert(isclose(value, distance(a,b)/2))
-
-def test_aligned_points_no_limit(max_dim=5, space_bound=1, number_of_points=10):
-    dim = random_dimension(max_dim, 3)
-    points = [np.pad([i], (0, dim-1), 'constant', constant_values=(4, 6)) for i in range(number_of_points)]
-    complex = cech_complex(points, dim, number_of_points)
-    assert(len(complex) == pow(2, number_of_points)-1)
-    for simplex, value in complex:
-        assert(isclose(value, diameter(simplex)/2, abs_tol=1e-6))
-
-def test_aligned_points_with_limit(max_dim=5, space_bound=1, number_of_points=10, limit = 5):
-    dim = random_dimension(max_dim, 3)
-    points = [np.pad([i], (0, dim-1), 'constant', constant_values=(4, 6)) for i in range(number_of_points)]
-    complex = cech_complex(points, dim, number_of_points)
-    for simplex, value in complex:
-        assert(isclose(value, diameter(simplex)/2, abs_tol=1e-6))
-        assert(value < limit)
\ No newline at end of file
+import pytest
+import numpy as np
+from math import isclose
+from itertools import combinations
+from ..src.project import cech_complex, iter_cech_complex, sparse_cech_complex, greedy_permutation, lp_type_meb, welzl_meb, naive_meb, distance
+from ..src.project import complex, CechFiltrationValue
+from ..src.spatial_index import GridIndex
+from .helper import random_dimension, random_point_in_cube, diameter, compare_to_expected_result
+
+def test_one_point(max_dim=5, space_bound=1):
+    dim = random_dimension(max_dim)
+    expected_point = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    res = cech_complex([expected_point], dim, 1)
+    assert(len(res) == 1)
+    simplex, filtration_value = res[0]
+    assert(simplex == (0,))
+    compare_to_expected_result([expected_point][simplex[0]], filtration_value, expected_point, 0)
+
+def test_two_points(max_dim=5, space_bound=1):
+    dim = random_dimension(max_dim)
+    a = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    b = random_point_in_cube(np.zeros(dim), space_bound, dim)
+    res = cech_complex([a,b], dim, 2)
+    assert(len(res) == 3)
+    for simplex, value in res:
+        if len(simplex) == 1:
+            assert(isclose(value, 0, abs_tol=1e-7))
+        elif len(simplex) == 2:
+            assert(isclose(value, distance(a,b)/2))
+
+def test_aligned_points_no_limit(max_dim=5, space_bound=1, number_of_points=10):
+    dim = random_dimension(max_dim, 3)
+    points = [np.pad([i], (0, dim-1), 'constant', constant_values=(4, 6)) for i in range(number_of_points)]
+    complex = cech_complex(points, dim, number_of_points)
+    assert(len(complex) == pow(2, number_of_points)-1)
+    for simplex, value in complex:
+        assert(isclose(value, diameter([points[i] for i in simplex])/2, abs_tol=1e-6))
+
+def test_aligned_points_with_limit(max_dim=5, space_bound=1, number_of_points=10, limit = 5):
+    dim = random_dimension(max_dim, 3)
+    points = [np.pad([i], (0, dim-1), 'constant', constant_values=(4, 6)) for i in range(number_of_points)]
+    complex = cech_complex(points, dim, number_of_points)
+    for simplex, value in complex:
+        assert(isclose(value, diameter([points[i] for i in simplex])/2, abs_tol=1e-6))
+        assert(value < limit)
+
+def test_random_points_with_limit(dim=3, number_of_points=15, max_simplex_dim=4, limit=0.6):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    complex = cech_complex(points, dim, max_simplex_dim, limit)
+    expected = set()
+    for size in range(1, max_simplex_dim+1):
+        for simplex in combinations(range(number_of_points), size):
+            _, radius = lp_type_meb([points[i] for i in simplex], dim)
+            if radius < limit - 1e-9:
+                expected.add(simplex)
+    found = {simplex for simplex, value in complex}
+    assert(expected <= found)
+    for simplex, value in complex:
+        assert(value < limit)
+
+@pytest.mark.parametrize("meb", [welzl_meb, naive_meb])
+def test_warm_start_matches_solver(meb, dim=2, number_of_points=12, max_simplex_dim=4, limit=0.8):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    for simplex, value in cech_complex(points, dim, max_simplex_dim, limit, meb):
+        _, expected_value = naive_meb([points[i] for i in simplex], dim)
+        assert(isclose(value, expected_value, abs_tol=1e-6))
+
+def test_batch_matches_serial(dim=3, number_of_points=15, max_simplex_dim=5, limit=0.9):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = cech_complex(points, dim, max_simplex_dim, limit)
+    res = cech_complex(points, dim, max_simplex_dim, limit, batch=True)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-6))
+
+def test_batch_aligned_points(max_dim=5, number_of_points=8):
+    dim = random_dimension(max_dim, 3)
+    points = [np.pad([i], (0, dim-1), 'constant', constant_values=(4, 6)) for i in range(number_of_points)]
+    complex = cech_complex(points, dim, number_of_points, batch=True)
+    assert(len(complex) == pow(2, number_of_points)-1)
+    for simplex, value in complex:
+        assert(isclose(value, diameter([points[i] for i in simplex])/2, abs_tol=1e-6))
+
+def test_workers_match_serial(dim=3, number_of_points=30, max_simplex_dim=4, limit=0.8):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = cech_complex(points, dim, max_simplex_dim, limit)
+    res = cech_complex(points, dim, max_simplex_dim, limit, workers=2)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+
+class EvenIndex(GridIndex):
+    # Only finds the points of even index, so that the complex depends on the spatial index
+    def query_radius(self, x, radius):
+        res = super().query_radius(x, radius)
+        return res[res % 2 == 0]
+
+def test_workers_use_spatial_index(dim=2, number_of_points=20, max_simplex_dim=3, limit=0.5):
+    points = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)])
+    spatial_index = EvenIndex(points)
+    expected = complex(points, dim, max_simplex_dim, limit, CechFiltrationValue(lp_type_meb, limit), 2 * limit, spatial_index)
+    res = complex(points, dim, max_simplex_dim, limit, CechFiltrationValue(lp_type_meb, limit), 2 * limit, spatial_index, workers=2)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    assert(all(simplex[1] % 2 == 0 for simplex, _ in res if len(simplex) == 2))
+
+def test_iter_matches_list(dim=3, number_of_points=15, max_simplex_dim=4, limit=0.6):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = cech_complex(points, dim, max_simplex_dim, limit)
+    res = list(iter_cech_complex(points, dim, max_simplex_dim, limit))
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+
+def test_no_simplex_dim(dim=3, number_of_points=10):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    assert(cech_complex(points, dim, 0) == [])
+    assert(cech_complex(points, dim, 0, workers=2) == [])
+    assert(list(iter_cech_complex(points, dim, 0)) == [])
+
+def test_iter_is_lazy(dim=3, number_of_points=20, max_simplex_dim=5):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    calls = []
+    def counting_meb(points, dim=3, boundary_points=()):
+        calls.append(len(points))
+        return lp_type_meb(points, dim, boundary_points)
+    counting_meb.supports_boundary_points = True
+    simplices = iter_cech_complex(points, dim, max_simplex_dim, meb=counting_meb)
+    assert(next(simplices)[0] == (0,))
+    assert(len(calls) == 1)
+
+def test_greedy_permutation(dim=2, number_of_points=100):
+    points = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)])
+    order, insertion_radii = greedy_permutation(points)
+    assert(sorted(order.tolist()) == list(range(number_of_points)))
+    assert(order[0] == 0 and insertion_radii[0] == np.inf)
+    for k in range(1, number_of_points):
+        distances = [min(distance(points[i], points[j]) for j in order[:k]) for i in order[k:]]
+        assert(isclose(insertion_radii[k], distances[0]))
+        assert(isclose(insertion_radii[k], max(distances)))
+
+def test_sparse_small_epsilon_is_exact(dim=2, number_of_points=30, max_simplex_dim=3, limit=0.4):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    res, approximation_factor = sparse_cech_complex(points, dim, max_simplex_dim, 1e-9, limit)
+    expected = cech_complex(points, dim, max_simplex_dim, limit)
+    assert(isclose(approximation_factor, 1, abs_tol=1e-6))
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+
+@pytest.mark.parametrize("epsilon", [0.2, 0.5])
+def test_sparse_values_within_factor(epsilon, dim=2, number_of_points=20, max_simplex_dim=3):
+    points = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)])
+    res, approximation_factor = sparse_cech_complex(points, dim, max_simplex_dim, epsilon)
+    assert(approximation_factor == 1 / (1 - epsilon))
+    order, insertion_radii = greedy_permutation(points)
+    deletion_times = np.empty(number_of_points)
+    deletion_times[order] = insertion_radii / (epsilon * (1 - epsilon))
+    values = dict(res)
+    assert(all((i,) in values for i in range(number_of_points)))
+    expected = dict(cech_complex(points, dim, max_simplex_dim))
+    for simplex, value in res:
+        assert(expected[simplex] <= value * (1 + 1e-9))
+        assert(value <= approximation_factor * expected[simplex] * (1 + 1e-9))
+        assert(value <= min(deletion_times[list(simplex)]))
+        # The result is a filtration
+        assert(all(values[simplex[:j] + simplex[j+1:]] <= value for j in range(len(simplex)) if len(simplex) > 1))
+    # Every simplex of the cech complex whose vertices are still there at the approximated value is kept
+    for simplex, value in expected.items():
+        if approximation_factor * value < 0.99 * min(deletion_times[list(simplex)]):
+            assert(simplex in values)
+    assert(len(res) < len(expected))
@@ -0,0 +1,44 @@
+#%% Module imports
+import numpy as np
+from ..src.project import cech_complex, iter_cech_complex
+from ..src.columnar import ColumnarComplex
+from .helper import random_point_in_cube
+
+def test_round_trip(dim=2, number_of_points=20, max_simplex_dim=4, limit=0.5):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = cech_complex(points, dim, max_simplex_dim, limit)
+    columnar = ColumnarComplex.from_iter(expected, chunk_size=7)
+    assert(len(columnar) == len(expected))
+    assert(columnar.to_list() == expected)
+    assert(columnar.vertices.dtype == np.int32 and columnar.values.dtype == np.float64)
+    triangles = [simplex for simplex, _ in expected if len(simplex) == 3]
+    assert(columnar.simplices_of_size(3).tolist() == [list(simplex) for simplex in triangles])
+    assert(len(columnar.values_of_size(3)) == len(triangles))
+
+def test_from_generator(dim=2, number_of_points=15, max_simplex_dim=3, limit=0.5):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    columnar = ColumnarComplex.from_iter(iter_cech_complex(points, dim, max_simplex_dim, limit))
+    assert([simplex for simplex, _ in columnar] == [simplex for simplex, _ in cech_complex(points, dim, max_simplex_dim, limit)])
+
+def test_missing_sizes():
+    simplex_list = [((0,), 0.0), ((1,), 0.0), ((0, 1, 2), 3.0)]
+    columnar = ColumnarComplex.from_iter(simplex_list)
+    assert(columnar.offsets.tolist() == [0, 2, 2, 3])
+    assert(columnar.simplices_of_size(2).shape == (0, 2))
+    assert(columnar.to_list() == simplex_list)
+
+def test_save_and_load(tmp_path, dim=3, number_of_points=20, max_simplex_dim=4, limit=0.6):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = cech_complex(points, dim, max_simplex_dim, limit)
+    path = tmp_path / "complex.bin"
+    ColumnarComplex.from_iter(expected).save(path)
+    loaded = ColumnarComplex.load(path)
+    assert(isinstance(loaded.vertices, np.memmap) and isinstance(loaded.values, np.memmap))
+    assert(loaded.to_list() == expected)
+    assert(ColumnarComplex.load(path, mmap=False).to_list() == expected)
+
+def test_empty(tmp_path):
+    columnar = ColumnarComplex.from_iter([])
+    assert(len(columnar) == 0 and columnar.to_list() == [])
+    columnar.save(tmp_path / "empty.bin")
+    assert(ColumnarComplex.load(tmp_path / "empty.bin").to_list() == [])
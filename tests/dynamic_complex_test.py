@@ -0,0 +1,89 @@
+#%% Module imports
+import pytest
+import numpy as np
+from math import isclose
+from ..src.project import DynamicComplex, cech_complex, alpha_complex
+from ..src.spatial_index import DynamicGridIndex
+from .helper import random_point_in_cube
+
+@pytest.fixture(params=["cech", "alpha"])
+def kind(request):
+    return request.param
+
+def rebuild(dynamic):
+    # Complex of the current points, with the simplexes written with identifiers
+    identifiers = sorted(dynamic.points())
+    points = [dynamic.points()[identifier] for identifier in identifiers]
+    builder = cech_complex if dynamic.kind == "cech" else alpha_complex
+    res = builder(points, dynamic.space_dim, dynamic.max_simplex_dim, dynamic.filtration_limit)
+    return sorted(((tuple(identifiers[i] for i in simplex), value) for simplex, value in res), key=lambda entry: (len(entry[0]), entry[0]))
+
+def assert_same_complex(res, expected):
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+
+def apply_diff(simplex_list, diff):
+    values = dict(simplex_list)
+    for simplex, _ in diff["removed"]:
+        del values[simplex]
+    for simplex, value in diff["added"]:
+        assert(simplex not in values)
+        values[simplex] = value
+    for simplex, old_value, new_value in diff["changed"]:
+        assert(values[simplex] == old_value)
+        values[simplex] = new_value
+    return sorted(values.items(), key=lambda entry: (len(entry[0]), entry[0]))
+
+def test_dynamic_grid_index(dim=2, number_of_points=200, number_of_tests=20):
+    index = DynamicGridIndex(dim, 0.3)
+    points = {identifier: random_point_in_cube(np.zeros(dim), 1, dim) for identifier in range(number_of_points)}
+    for identifier, point in points.items():
+        index.insert(identifier, point)
+    for identifier in range(0, number_of_points, 3):
+        index.remove(identifier)
+        del points[identifier]
+    for radius in [0.1, 0.6, 3]:
+        for _ in range(number_of_tests):
+            x = random_point_in_cube(np.zeros(dim), 1.5, dim)
+            expected = [identifier for identifier, point in sorted(points.items()) if np.sqrt(np.sum((point - x)**2)) <= radius]
+            assert(index.query_radius(x, radius).tolist() == expected)
+
+def test_updates_match_rebuild(kind, dim=2, number_of_points=30, max_simplex_dim=3, limit=0.3, number_of_updates=10):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    dynamic = DynamicComplex(points, dim, max_simplex_dim, limit, kind)
+    assert_same_complex(dynamic.to_list(), rebuild(dynamic))
+    for step in range(number_of_updates):
+        before = dynamic.to_list()
+        if step % 2 == 0:
+            identifier, diff = dynamic.insert(random_point_in_cube(np.zeros(dim), 1, dim))
+            assert(identifier == number_of_points + step // 2)
+        else:
+            diff = dynamic.remove(np.random.choice(sorted(dynamic.points())))
+        after = dynamic.to_list()
+        assert(apply_diff(before, diff) == after)
+        assert_same_complex(after, rebuild(dynamic))
+
+def test_alpha_insertion_changes_values(dim=2, max_simplex_dim=3, limit=2):
+    # The point inserted in the circumcircle of the triangle removes it from the alpha complex and splits it
+    dynamic = DynamicComplex([[0, 0], [2, 0], [1, 1.5]], dim, max_simplex_dim, limit)
+    assert((0, 1, 2) in dict(dynamic.to_list()))
+    identifier, diff = dynamic.insert([1, 0.6])
+    assert((0, 1, 2) in dict(diff["removed"]))
+    assert(all(identifier in simplex for simplex, _ in diff["added"]))
+    assert((identifier,) in dict(diff["added"]))
+    diff = dynamic.remove(identifier)
+    assert((0, 1, 2) in dict(diff["added"]))
+    assert(all(identifier in simplex for simplex, _ in diff["removed"]))
+
+def test_update_is_local(kind, dim=2, max_simplex_dim=3, limit=0.1):
+    # Two far apart clusters : an update in one doesn't touch the simplexes of the other
+    points = [random_point_in_cube(np.zeros(dim), 0.2, dim) for _ in range(15)] + [random_point_in_cube(np.full(dim, 10.0), 0.2, dim) for _ in range(15)]
+    dynamic = DynamicComplex(points, dim, max_simplex_dim, limit, kind)
+    far = {simplex: value for simplex, value in dynamic.to_list() if simplex[0] >= 15}
+    identifier, diff = dynamic.insert(random_point_in_cube(np.zeros(dim), 0.2, dim))
+    for key in ["added", "removed", "changed"]:
+        assert(all(entry[0][0] < 15 or entry[0][0] == identifier for entry in diff[key]))
+    assert({simplex: value for simplex, value in dynamic.to_list() if simplex[0] >= 15 and identifier not in simplex} == far)
+    isolated, diff = dynamic.insert([-5.0, -5.0])
+    assert(diff == {"added": [((isolated,), 0)], "removed": [], "changed": []})
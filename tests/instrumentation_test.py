@@ -0,0 +1,76 @@
+#%% Module imports
+import os
+import sys
+import subprocess
+import numpy as np
+from pathlib import Path
+from ..src import project
+from ..src.project import cech_complex, alpha_complex, welzl_meb, lp_type_meb
+from ..src.instrumentation import Instrumentation, ENVIRONMENT_VARIABLE
+from .helper import random_point_in_cube
+
+def test_functions_restored():
+    originals = (project.sphere_from_points, project.in_ball, project.lp_type_solver, project.welzl_aux, project._evaluate_level, project.SupportSet.push, project.SupportSet.sphere)
+    with Instrumentation():
+        assert(project.sphere_from_points is not originals[0])
+        assert(project.SupportSet.sphere is not originals[-1])
+    assert((project.sphere_from_points, project.in_ball, project.lp_type_solver, project.welzl_aux, project._evaluate_level, project.SupportSet.push, project.SupportSet.sphere) == originals)
+
+def test_filtration_evaluations_per_size():
+    points = [np.array([0, 0]), np.array([1, 0]), np.array([0, 1]), np.array([1, 1])]
+    with Instrumentation() as instrumentation:
+        cech_complex(points, 2, 4)
+    assert(instrumentation.filtration_evaluations == {1: 4, 2: 6, 3: 4, 4: 1})
+    counters = instrumentation.as_dict()
+    assert(counters["lp_type_solver"]["calls"] > 0)
+    assert(counters["lp_type_solver"]["max_depth"] >= 2)
+    assert(counters["sphere_from_points"]["calls"] > 0)
+
+def test_batch_filtration_evaluations():
+    points = [np.array([0, 0]), np.array([1, 0]), np.array([0, 1]), np.array([1, 1])]
+    with Instrumentation() as instrumentation:
+        cech_complex(points, 2, 4, batch=True)
+    assert(instrumentation.filtration_evaluations == {1: 4, 2: 6, 3: 4, 4: 1})
+
+def test_violation_tests_and_emptiness_scan(dim=2, number_of_points=20):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    with Instrumentation() as instrumentation:
+        alpha_complex(points, dim, 3)
+    counters = instrumentation.as_dict()
+    assert(counters["violation_test"]["hits"] > 0 and counters["violation_test"]["misses"] > 0)
+    # Vertices get the value 0 without any scan
+    assert(counters["first_point_in_ball"]["calls"] == sum(count for size, count in instrumentation.filtration_evaluations.items() if size > 1))
+    assert("first_point_in_ball" in instrumentation.report())
+
+def test_welzl_depth(dim=2, number_of_points=30):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    with Instrumentation() as instrumentation:
+        welzl_meb(points, dim)
+    assert(instrumentation.counters["welzl_aux"]["max_depth"] > number_of_points)
+    assert(instrumentation.counters["in_ball"]["calls"] > 0)
+
+def test_support_set_solves(dim=2, number_of_points=20):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    with Instrumentation() as instrumentation:
+        lp_type_meb(points, dim)
+    counters = instrumentation.as_dict()
+    assert(counters["SupportSet.sphere"]["solves"] > 1)
+    assert(counters["SupportSet.sphere"]["calls"] >= counters["SupportSet.sphere"]["solves"])
+    assert(counters["SupportSet.push"]["calls"] > 0)
+    assert("SupportSet.sphere" in instrumentation.report())
+
+def test_progress_callback(dim=2, number_of_points=15):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    reports = []
+    with Instrumentation(progress=lambda instrumentation: reports.append(sum(instrumentation.filtration_evaluations.values())), progress_interval=10) as instrumentation:
+        cech_complex(points, dim, 3)
+    assert(len(reports) == sum(instrumentation.filtration_evaluations.values()) // 10)
+    assert(reports == sorted(reports))
+
+def test_environment_variable():
+    root = Path(__file__).resolve().parents[1]
+    code = f"import numpy as np\nfrom {root.name}.src.project import cech_complex\ncech_complex([np.array([0, 0]), np.array([1, 0])], 2, 2)"
+    environment = {**os.environ, ENVIRONMENT_VARIABLE: "1"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=root.parent, env=environment, capture_output=True, text=True)
+    assert(result.returncode == 0)
+    assert("filtration evaluations of size 2: 1" in result.stderr)
@@ -0,0 +1,87 @@
+#%% Module imports
+import sys
+import subprocess
+from pathlib import Path
+import numpy as np
+from .. import src
+from ..src import backends, project
+from ..src.kernels import NUMBA_AVAILABLE
+from ..src.project import lp_type_meb, lp_type_alpha_complex_filtration_value
+
+ROOT = Path(__file__).resolve().parents[1]
+
+def run_in_new_interpreter(code):
+    # The package is imported from the parent folder of the project, like the tests do
+    return subprocess.run([sys.executable, "-c", code], cwd=ROOT.parent, capture_output=True, text=True, check=True).stdout.split()
+
+def test_import_is_lazy():
+    code = f"""
+import sys
+import {ROOT.name}.src as src
+print("numpy" in sys.modules, "{ROOT.name}.src.project" in sys.modules)
+src.cech_complex([[0., 0.], [1., 0.]], 2, 2, 1)
+print("{ROOT.name}.src.project" in sys.modules, "{ROOT.name}.src.persistence" in sys.modules, "concurrent.futures.process" in sys.modules)
+"""
+    assert(run_in_new_interpreter(code) == ["False", "False", "True", "False", "False"])
+
+def test_exports():
+    for name in src.__all__:
+        assert(getattr(src, name) is getattr(getattr(src, src._exports[name]), name))
+    assert(src.cech_complex is project.cech_complex)
+    assert(set(src.__all__) <= set(dir(src)))
+    try:
+        src.not_a_name
+        assert(False)
+    except AttributeError:
+        pass
+
+class FakeEntryPoint:
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+
+    def load(self):
+        return self.loader
+
+def test_discover_backends(monkeypatch):
+    loaded = []
+    def loader():
+        loaded.append("discovered")
+        return backends.Backend("discovered", lp_type_meb, lp_type_alpha_complex_filtration_value)
+    monkeypatch.setattr(backends, "_entry_points", lambda: [FakeEntryPoint("discovered", loader), FakeEntryPoint("numpy", None)])
+    monkeypatch.setattr(backends, "_discovered", False)
+    try:
+        backends.discover_backends()
+        # Registering doesn't load the backend, and the built-in numpy backend isn't replaced
+        assert(loaded == [])
+        assert(backends._loaders["discovered"][0] == backends.DISCOVERED_PRIORITY)
+        assert(backends.load_backend("numpy").meb is lp_type_meb)
+        assert("discovered" in backends.available_backends())
+        assert(loaded == ["discovered"])
+        backends.set_backend("discovered")
+        center, radius = project.backend_meb([np.zeros(2), np.ones(2)], 2)
+        assert(np.isclose(radius, np.sqrt(2) / 2))
+    finally:
+        backends.set_backend(None)
+        backends._loaders.pop("discovered")
+        backends._backends.pop("discovered", None)
+
+def test_get_backend_stops_at_first_loaded(monkeypatch):
+    loaded = []
+    def loader(name):
+        loaded.append(name)
+        return backends.Backend(name, lp_type_meb, lp_type_alpha_complex_filtration_value)
+    monkeypatch.setattr(backends, "_entry_points", lambda: [FakeEntryPoint("discovered", lambda: loader("discovered"))])
+    monkeypatch.setattr(backends, "_discovered", False)
+    monkeypatch.delenv(backends.ENVIRONMENT_VARIABLE, raising=False)
+    backends.register_backend("fallback", lambda: loader("fallback"), priority=-1)
+    try:
+        backends.set_backend(None)
+        # The numba backend comes first when it is installed, then the discovered one
+        assert(backends.get_backend().name == ("numba" if NUMBA_AVAILABLE else "discovered"))
+        assert(loaded == ([] if NUMBA_AVAILABLE else ["discovered"]))
+    finally:
+        backends.set_backend(None)
+        for name in ["discovered", "fallback"]:
+            backends._loaders.pop(name)
+            backends._backends.pop(name, None)
@@ -0,0 +1,74 @@
+#%% Module imports
+import pytest
+import numpy as np
+from math import isclose
+from ..src.project import cech_complex, alpha_complex
+from ..src.persistence import filtration_order, boundary_matrix, coboundary_matrix, persistence_pairs
+from .helper import random_point_in_cube
+
+def naive_persistence_pairs(simplex_list):
+    # Standard reduction of the dense boundary matrix, without any optimization
+    filtration = filtration_order(simplex_list)
+    m = len(filtration)
+    position = {simplex: i for i, (simplex, _) in enumerate(filtration)}
+    matrix = np.zeros((m, m), dtype=bool)
+    for j, (simplex, _) in enumerate(filtration):
+        for k in range(len(simplex) if len(simplex) > 1 else 0):
+            matrix[position[simplex[:k] + simplex[k+1:]], j] = True
+    pivots = {}
+    for j in range(m):
+        while matrix[:, j].any() and np.flatnonzero(matrix[:, j])[-1] in pivots:
+            matrix[:, j] ^= matrix[:, pivots[np.flatnonzero(matrix[:, j])[-1]]]
+        if matrix[:, j].any():
+            pivots[np.flatnonzero(matrix[:, j])[-1]] = j
+    res = [[] for _ in range(max(len(simplex) for simplex, _ in filtration))]
+    paired = set(pivots) | set(pivots.values())
+    for birth, death in pivots.items():
+        if filtration[death][1] > filtration[birth][1]:
+            res[len(filtration[birth][0]) - 1].append((filtration[birth][1], filtration[death][1]))
+    for i, (simplex, value) in enumerate(filtration):
+        if i not in paired:
+            res[len(simplex) - 1].append((value, np.inf))
+    return [sorted(diagram) for diagram in res]
+
+def test_hollow_triangle():
+    simplex_list = [((0,), 0), ((1,), 0), ((2,), 0), ((0,1), 1), ((1,2), 1), ((0,2), 2), ((0,1,2), 3)]
+    for cohomology in [False, True]:
+        assert(persistence_pairs(simplex_list, cohomology) == [[(0, 1), (0, 1), (0, np.inf)], [(2, 3)], []])
+
+def test_zero_persistence_pairs():
+    simplex_list = [((0,), 0), ((1,), 0), ((0,1), 0)]
+    assert(persistence_pairs(simplex_list) == [[(0, np.inf)], []])
+    assert(persistence_pairs(simplex_list, min_persistence=-1) == [[(0, 0), (0, np.inf)], []])
+
+def test_boundary_matrix():
+    filtration = [((0,), 0), ((1,), 0), ((2,), 0), ((0,1), 1), ((0,2), 1), ((1,2), 1), ((0,1,2), 2)]
+    indptr, indices = boundary_matrix(filtration)
+    assert(indptr.tolist() == [0, 0, 0, 0, 2, 4, 6, 9])
+    assert(indices.tolist() == [0, 1, 0, 2, 1, 2, 3, 4, 5])
+    co_indptr, co_indices = coboundary_matrix(indptr, indices)
+    # The coboundary of the vertex 0, in column 6, is made of the edges (0,1) and (0,2) in rows 3 and 2
+    assert(co_indices[co_indptr[6]:co_indptr[7]].tolist() == [2, 3])
+    assert(co_indptr[-1] == indptr[-1])
+
+def test_filtration_order_rounding_errors():
+    simplex_list = [((0,), 0), ((1,), 0), ((0,1), 0.5 - 1e-16), ((2,), 0), ((0,2), 0.5), ((1,2), 0.5), ((0,1,2), 0.5 - 2e-16)]
+    filtration = filtration_order(simplex_list)
+    assert([len(simplex) for simplex, _ in filtration] == [1, 1, 1, 2, 2, 2, 3])
+    assert(filtration[-1][1] == 0.5)
+
+def test_circle(number_of_points=12):
+    angles = np.linspace(0, 2*np.pi, number_of_points, endpoint=False)
+    points = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    diagrams = persistence_pairs(cech_complex(points, 2, 3))
+    assert(len(diagrams[1]) == 1)
+    birth, death = diagrams[1][0]
+    assert(isclose(birth, np.sin(np.pi/number_of_points)))
+    assert(isclose(death, 1))
+    assert(len([death for _, death in diagrams[0] if death == np.inf]) == 1)
+
+@pytest.mark.parametrize("cohomology", [False, True])
+def test_random_matches_naive(cohomology, dim=2, number_of_points=15, max_simplex_dim=4, limit=0.5):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    for simplex_list in [cech_complex(points, dim, max_simplex_dim, limit), alpha_complex(points, dim, dim+1, limit)]:
+        assert(persistence_pairs(simplex_list, cohomology) == naive_persistence_pairs(simplex_list))
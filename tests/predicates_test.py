@@ -0,0 +1,107 @@
+import pytest
+import numpy as np
+from ..src.project import sphere_from_points, lp_type_meb, welzl_meb, move_to_front_meb, lp_type_alpha_complex_filtration_value, alpha_complex
+from ..src.predicates import in_sphere, in_sphere_point, exact_in_sphere, orientation, exact_orientation, affinely_independent, exact_affinely_independent, circumsphere
+from .helper import random_dimension, random_point_in_cube, random_point_on_sphere
+
+def test_in_sphere_random(number_of_tests=50, number_of_points=20):
+    for _ in range(number_of_tests):
+        dim = random_dimension(6, 2)
+        support = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(np.random.randint(2, dim + 2))])
+        points = np.array([random_point_in_cube(np.zeros(dim), 2, dim) for _ in range(number_of_points)])
+        center, radius = sphere_from_points(list(support), dim)
+        expected = np.sign(np.sqrt(np.sum((points - center)**2, axis=1)) - radius)
+        assert(in_sphere(support, points).tolist() == expected.tolist())
+        assert([in_sphere_point(support, point, (center, radius)) for point in points] == expected.tolist())
+        assert([exact_in_sphere(support, point) for point in points] == expected.tolist())
+
+def test_support_points_are_on_the_sphere(dim=3):
+    support = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(dim + 1)])
+    assert(in_sphere(support, support).tolist() == [0] * (dim + 1))
+    assert(in_sphere(support[:1], support).tolist() == [0] + [1] * dim)
+
+def test_in_sphere_near_boundary():
+    support = np.array([[0., 0.], [1., 0.], [0., 1.]])
+    assert(in_sphere(support, [[1., 1.], [0.5, 0.5], [1., 1. + 2**-52], [1., 1. - 2**-53]]).tolist() == [0, -1, 1, -1])
+
+def test_filters_match_exact_in_sphere(number_of_tests=30, number_of_points=10):
+    # Points on the sphere and rounded perturbations of them, around nearly flat supports the filters can't always decide
+    for _ in range(number_of_tests):
+        dim = random_dimension(4, 2)
+        support = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(np.random.randint(2, dim + 2))])
+        support[-1] = support[0] + (support[-1] - support[0]) * 10.0**-np.random.randint(0, 8)
+        center, radius = sphere_from_points(list(support), dim)
+        points = np.array([center + radius * (1 + np.random.choice([0, 2**-50, -2**-50])) * random_point_on_sphere(np.zeros(dim), 1, dim)
+                           for _ in range(number_of_points)])
+        points = np.vstack([points, support])
+        expected = [exact_in_sphere(support, point) for point in points]
+        assert(in_sphere(support, points).tolist() == expected)
+        assert(in_sphere(support, points, (center, radius)).tolist() == expected)
+        assert([in_sphere_point(support, point, (center, radius)) for point in points] == expected)
+
+def test_affinely_dependent_support():
+    support = np.array([[0., 0.], [1., 1.], [2., 2.]])
+    with pytest.raises(np.linalg.LinAlgError):
+        exact_in_sphere(support, [0., 1.])
+
+def test_orientation(number_of_tests=50):
+    for _ in range(number_of_tests):
+        dim = random_dimension(6)
+        points = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(dim + 1)])
+        expected = int(np.sign(np.linalg.det(points[1:] - points[0])))
+        assert(orientation(points) == exact_orientation(points) == expected)
+        assert(orientation(points[[1, 0] + list(range(2, dim + 1))]) == -expected)
+    assert(orientation([[0., 0.], [1., 1.], [3., 3.]]) == 0)
+    assert(orientation([[0., 0.], [1., 1.], [3., 3. + 2**-50]]) == 1)
+
+def test_affinely_independent(number_of_tests=50):
+    for _ in range(number_of_tests):
+        dim = random_dimension(8, 2)
+        # Rounded to a multiple of 2^-20, so that the midpoint below is computed exactly
+        points = np.round(np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(np.random.randint(1, dim + 2))]) * 2**20) / 2**20
+        assert(affinely_independent(points) and exact_affinely_independent(points))
+        dependent = np.vstack([points, [(points[0] + points[-1]) / 2]])
+        assert(not affinely_independent(dependent) and not exact_affinely_independent(dependent))
+    assert(not affinely_independent([[0., 0.], [1., 1.], [0., 0.]]))
+    assert(affinely_independent([[0., 0.], [1., 1.], [3., 3. + 2**-50]]))
+    assert(not affinely_independent([[0., 0.], [1., 0.], [0., 1.], [1., 1.]]))
+
+@pytest.mark.parametrize("meb", [lp_type_meb, welzl_meb, move_to_front_meb])
+def test_cospherical_meb(meb, dim=3, number_of_points=60):
+    points = [random_point_on_sphere(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    center, radius = meb(points, dim)
+    assert(np.isclose(radius, 1) and np.allclose(center, 0, atol=1e-6))
+
+def test_alpha_cospherical_square():
+    # The four vertices of a square are on the circle of every triangle, which is still empty
+    points = np.array([[0., 0.], [1., 0.], [1., 1.], [0., 1.]])
+    for simplex in [(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)]:
+        assert(np.isclose(lp_type_alpha_complex_filtration_value(points, simplex, 2), np.sqrt(2) / 2))
+    points = np.vstack([points, [[0.5, 0.5]]])
+    assert(lp_type_alpha_complex_filtration_value(points, (0, 1, 2), 2) == np.inf)
+
+def test_nearly_collinear_points(number_of_tests=20):
+    # The Gram matrices of the supports of these points are singular in floating point, but not exactly
+    points = np.array([[-1.0210745732295459e-04, 7.1054832000027549e-04], [4.3947522321010219e-04, 2.1929895234269265e-04],
+                       [4.1555553913841530e-04, 2.4099560199061353e-04], [-1.9910498160960151e-04, 7.9853114179821846e-04],
+                       [5.4707323173142357e-04, 1.2170082827568639e-04], [3.3679221570221107e-04, 3.1243886305366175e-04],
+                       [-2.9172023243986399e-04, 8.8253896745648383e-04], [5.8035001619089908e-04, 9.1516703282352191e-05]])
+    for simplex in [(0, 1, 2), (1, 4, 7), (3, 5, 6)]:
+        support = points[list(simplex)]
+        assert(exact_affinely_independent(support))
+        assert(in_sphere(support, points).tolist() == [exact_in_sphere(support, point) for point in points])
+    # The circumsphere of a nearly flat triangle is huge, and solving its system in floating point gives any sphere
+    center, radius = circumsphere(points[[0, 1, 5]])
+    assert(radius > 1e8 and all(np.isclose(np.linalg.norm(points[i] - center), radius, rtol=1e-9) for i in [0, 1, 5]))
+    assert(lp_type_alpha_complex_filtration_value(points, (0, 1, 5), 2) == radius)
+    expected = alpha_complex(list(points), 2, 3)
+    for _ in range(number_of_tests):
+        assert(alpha_complex(list(points), 2, 3) == expected)
+
+def test_circumsphere_random(number_of_tests=50):
+    for _ in range(number_of_tests):
+        dim = random_dimension(6, 2)
+        support = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(np.random.randint(1, dim + 2))])
+        expected_center, expected_radius = sphere_from_points(list(support), dim)
+        center, radius = circumsphere(support)
+        assert(np.allclose(center, expected_center, atol=1e-9) and np.isclose(radius, expected_radius, atol=1e-7))
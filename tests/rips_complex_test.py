@@ -0,0 +1,69 @@
+import numpy as np
+from math import isclose
+from itertools import combinations
+from ..src.project import rips_complex, iter_rips_complex, cech_complex, lp_type_meb
+from .helper import random_dimension, random_point_in_cube, diameter
+
+def test_two_points(max_dim=5, space_bound=1):
+    dim = random_dimension(max_dim)
+    points = [random_point_in_cube(np.zeros(dim), space_bound, dim) for _ in range(2)]
+    res = rips_complex(points, dim, 2)
+    assert([simplex for simplex, _ in res] == [(0,), (1,), (0, 1)])
+    assert(isclose(res[2][1], diameter(points)/2))
+
+def test_matches_brute_force(dim=3, number_of_points=15, max_simplex_dim=4, limit=0.6):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    expected = []
+    for size in range(1, max_simplex_dim+1):
+        for simplex in combinations(range(number_of_points), size):
+            value = diameter([points[i] for i in simplex])/2 if size > 1 else 0
+            if value < limit:
+                expected.append((simplex, value))
+    res = rips_complex(points, dim, max_simplex_dim, limit)
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+
+def test_no_limit_is_full_complex(dim=2, number_of_points=8, max_simplex_dim=3):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    res = rips_complex(points, dim, max_simplex_dim)
+    assert(len(res) == sum(len(list(combinations(range(number_of_points), size))) for size in range(1, max_simplex_dim+1)))
+
+def test_sandwich(dim=3, number_of_points=15, max_simplex_dim=4):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    for simplex, value in rips_complex(points, dim, max_simplex_dim):
+        if len(simplex) > 2:
+            m = min(dim, len(simplex)-1)
+            _, radius = lp_type_meb([points[i] for i in simplex], dim)
+            assert(value - 1e-7 <= radius <= value * np.sqrt(2*m / (m+1)) + 1e-7)
+
+def test_exact_cech_matches_cech(dim=3, number_of_points=15, max_simplex_dim=4, limit=0.6):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    res = rips_complex(points, dim, max_simplex_dim, limit, exact_cech=True, meb=lp_type_meb)
+    expected = cech_complex(points, dim, max_simplex_dim, limit, meb=lp_type_meb)
+    # Simplexes whose value is at the limit up to the tolerance of the solvers may only be in one of them
+    found = {simplex: value for simplex, value in res}
+    expected = {simplex: value for simplex, value in expected}
+    for simplex in found.keys() ^ expected.keys():
+        assert(isclose(found.get(simplex, expected.get(simplex)), limit, abs_tol=1e-7))
+    for simplex in found.keys() & expected.keys():
+        assert(isclose(found[simplex], expected[simplex], abs_tol=1e-7))
+
+def test_exact_cech_skips_solves(dim=2, number_of_points=20, max_simplex_dim=3, limit=0.5):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    calls = []
+    def counting_meb(points, dim=3, boundary_points=()):
+        calls.append(len(points))
+        return lp_type_meb(points, dim, boundary_points)
+    res = rips_complex(points, dim, max_simplex_dim, limit, exact_cech=True, meb=counting_meb)
+    assert(len(calls) < sum(len(simplex) > 2 for simplex, _ in rips_complex(points, dim, max_simplex_dim, limit)))
+    assert(all(value < limit for _, value in res))
+
+def test_iter_matches_list(dim=3, number_of_points=12, max_simplex_dim=3, limit=0.7):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    assert(list(iter_rips_complex(points, dim, max_simplex_dim, limit)) == rips_complex(points, dim, max_simplex_dim, limit))
+
+def test_no_simplex_dim(dim=3, number_of_points=10):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    assert(rips_complex(points, dim, 0) == [])
+    assert(list(iter_rips_complex(points, dim, 0)) == [])
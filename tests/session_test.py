@@ -0,0 +1,50 @@
+#%% Module imports
+import numpy as np
+from math import isclose
+from ..src.project import ComplexSession, cech_complex, alpha_complex
+from .helper import random_point_in_cube
+
+def assert_same_complex(res, expected):
+    assert([simplex for simplex, _ in res] == [simplex for simplex, _ in expected])
+    for (_, value), (_, expected_value) in zip(res, expected):
+        assert(isclose(value, expected_value, abs_tol=1e-9))
+
+def test_repeated_build_only_hits(dim=2, number_of_points=20, max_simplex_dim=3, limit=0.4):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    session = ComplexSession(points, dim)
+    first = session.cech_complex(max_simplex_dim, limit)
+    misses = session.cache_info()["misses"]
+    assert(session.cache_info()["hits"] == 0)
+    second = session.cech_complex(max_simplex_dim, limit)
+    assert(second == first)
+    info = session.cache_info()
+    assert(info["misses"] == misses and info["hits"] == misses)
+    assert(isclose(info["hit_rate"], 0.5))
+    assert_same_complex(first, cech_complex(points, dim, max_simplex_dim, limit))
+
+def test_increasing_limit_and_dimension(dim=2, number_of_points=20):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    session = ComplexSession(points, dim)
+    for max_simplex_dim, limit in [(2, 0.2), (2, 0.4), (3, 0.4), (4, 0.6)]:
+        hits = session.cache_info()["hits"]
+        res = session.cech_complex(max_simplex_dim, limit)
+        assert_same_complex(res, cech_complex(points, dim, max_simplex_dim, limit))
+        if limit > 0.2:
+            assert(session.cache_info()["hits"] > hits)
+
+def test_alpha_values_above_previous_limit(dim=2, number_of_points=25):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    session = ComplexSession(points, dim)
+    # With a limit, values above it are reported as infinity, they must be computed again for a bigger limit
+    for limit in [0.1, 0.3, np.inf]:
+        assert_same_complex(session.alpha_complex(dim+1, limit), alpha_complex(points, dim, dim+1, limit))
+
+def test_eviction(dim=2, number_of_points=15, max_cache_size=10, limit=0.5):
+    points = [random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)]
+    session = ComplexSession(points, dim, max_cache_size=max_cache_size)
+    for _ in range(2):
+        assert_same_complex(session.cech_complex(3, limit), cech_complex(points, dim, 3, limit))
+        assert(session.cache_info()["size"] <= max_cache_size)
+    assert(session.cache_info()["evictions"] > 0)
+    session.clear_cache()
+    assert(session.cache_info()["size"] == 0)
@@ -0,0 +1,55 @@
+import pytest
+import numpy as np
+from ..src.spatial_index import SpatialIndex, GridIndex, KDTree, build_spatial_index
+from ..src.project import lp_type_alpha_complex_filtration_value, alpha_complex
+from .helper import random_point_in_cube
+
+@pytest.fixture(params=[GridIndex, KDTree])
+def spatial_index_class(request):
+    return request.param
+
+def brute_force_radius(points, x, radius):
+    return np.flatnonzero(np.sqrt(np.sum((points - x)**2, axis=1)) <= radius)
+
+def test_radius_random(spatial_index_class, number_of_tests=20, number_of_points=300):
+    for dim in [1, 2, 3, 5]:
+        points = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)])
+        index = spatial_index_class(points)
+        for _ in range(number_of_tests):
+            x = random_point_in_cube(np.zeros(dim), 1.5, dim)
+            radius = np.random.uniform(0, 1)
+            assert(np.array_equal(index.query_radius(x, radius), brute_force_radius(points, x, radius)))
+        assert(np.array_equal(index.query_radius(points[0], np.inf), np.arange(number_of_points)))
+
+def test_knn_random(spatial_index_class, number_of_tests=20, number_of_points=300, k=7):
+    for dim in [2, 4]:
+        points = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)])
+        index = spatial_index_class(points)
+        for _ in range(number_of_tests):
+            x = random_point_in_cube(np.zeros(dim), 1.5, dim)
+            expected = np.argsort(np.sum((points - x)**2, axis=1), kind="stable")[:k]
+            assert(np.array_equal(index.query_knn(x, k), expected))
+
+def test_duplicate_points(spatial_index_class):
+    points = np.zeros((5, 2))
+    index = spatial_index_class(points)
+    assert(np.array_equal(index.query_radius(np.zeros(2), 0), np.arange(5)))
+    assert(len(index.query_knn(np.ones(2), 10)) == 5)
+
+def test_build_spatial_index():
+    assert(isinstance(build_spatial_index(np.zeros((3, 2))), GridIndex))
+    assert(isinstance(build_spatial_index(np.zeros((3, 6))), KDTree))
+
+def test_query_radius_is_abstract():
+    with pytest.raises(TypeError):
+        SpatialIndex(np.zeros((3, 2)))
+
+def test_restricted_alpha_filtration(dim=2, number_of_points=40, limit=0.4):
+    points = np.array([random_point_in_cube(np.zeros(dim), 1, dim) for _ in range(number_of_points)])
+    index = build_spatial_index(points)
+    for simplex, value in alpha_complex(points, dim, 3, np.inf):
+        restricted_value = lp_type_alpha_complex_filtration_value(points, simplex, dim, spatial_index=index, filtration_limit=limit)
+        if value < limit:
+            assert(np.isclose(restricted_value, value))
+        else:
+            assert(restricted_value == np.inf)